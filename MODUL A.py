@@ -2,18 +2,20 @@ from OpenGL.GL import *
 from OpenGL.GLUT import *
 from OpenGL.GLU import *
 from math import sin, cos, pi
+import json
+import os
+import struct
+import numpy as np
 
 window_width, window_height = 800, 600
-objects = []
 clicks = []
 current_shape = 'point'
 current_color = (1.0, 0.0, 0.0)
 line_thickness = 2
 point_size = 5
-transform_translate = [0, 0]
-transform_rotate = 0
-transform_scale = 1.0
 window_rect = []
+clip_algorithm = 'cohen_sutherland'  # or 'liang_barsky'
+scene_file = 'scene.gka'
 
 def init():
     glClearColor(1.0, 1.0, 1.0, 1.0)  # White background
@@ -22,234 +24,777 @@ def init():
     gluOrtho2D(0, window_width, 0, window_height)
     glMatrixMode(GL_MODELVIEW)
 
-def apply_transform(x, y):
-    """Apply current transformations (translate, rotate, scale) to a point."""
-    # Scale
-    x_s = x * transform_scale
-    y_s = y * transform_scale
-    # Rotate
-    rad = transform_rotate * pi / 180
-    x_r = x_s * cos(rad) - y_s * sin(rad)
-    y_r = x_s * sin(rad) + y_s * cos(rad)
-    # Translate
-    x_t = x_r + transform_translate[0]
-    y_t = y_r + transform_translate[1]
-    return x_t, y_t
-
-def inverse_transform(x, y):
-    """Apply inverse transformations to a point."""
-    # Inverse translate
-    x_t = x - transform_translate[0]
-    y_t = y - transform_translate[1]
-    # Inverse rotate
-    rad = -transform_rotate * pi / 180
-    x_r = x_t * cos(rad) - y_t * sin(rad)
-    y_r = x_t * sin(rad) + y_t * cos(rad)
-    # Inverse scale
-    x_s = x_r / transform_scale if transform_scale != 0 else x_r
-    y_s = y_r / transform_scale if transform_scale != 0 else y_r
-    return x_s, y_s
-
-def point_inside_rect(x, y, rect):
-    """Check if a point is inside the clipping rectangle."""
-    return rect[0] <= x <= rect[2] and rect[1] <= y <= rect[3]
-
-def cohen_sutherland_clip(x1, y1, x2, y2, rect):
-    INSIDE, LEFT, RIGHT, BOTTOM, TOP = 0, 1, 2, 4, 8
-
-    def compute_out_code(x, y):
-        code = INSIDE
-        if x < rect[0]: code |= LEFT
-        elif x > rect[2]: code |= RIGHT
-        if y < rect[1]: code |= BOTTOM
-        elif y > rect[3]: code |= TOP
-        return code
-
-    # Handle degenerate case
-    if x1 == x2 and y1 == y2:
-        return point_inside_rect(x1, y1, rect), (x1, y1, x2, y2)
-
-    outcode1 = compute_out_code(x1, y1)
-    outcode2 = compute_out_code(x2, y2)
-    max_iterations = 100  # Prevent infinite loops
-    iteration = 0
-
-    while True:
-        if iteration >= max_iterations:
-            return False, ()
-
-        if not (outcode1 | outcode2):
-            return True, (x1, y1, x2, y2)
-        elif outcode1 & outcode2:
-            return False, ()
+class Transform2D:
+    """Translate, rotate and scale composed into one cached 3x3 matrix."""
+    def __init__(self):
+        self.translate = [0, 0]
+        self.rotate = 0
+        self.scale = 1.0
+        self.update()
+
+    def update(self):
+        """Recompose the matrix, its inverse and the GL matrix after a change."""
+        rad = self.rotate * pi / 180
+        c, s = cos(rad), sin(rad)
+        tx, ty = self.translate
+        # Same order as glTranslatef, glScalef, glRotatef: p' = T * S * R * p
+        self.matrix = np.array([[c * self.scale, -s * self.scale, tx],
+                                [s * self.scale, c * self.scale, ty],
+                                [0.0, 0.0, 1.0]])
+        inv_scale = 1 / self.scale if self.scale != 0 else 1
+        self.inverse = np.array([[c * inv_scale, s * inv_scale, 0.0],
+                                 [-s * inv_scale, c * inv_scale, 0.0],
+                                 [0.0, 0.0, 1.0]])
+        self.inverse[:2, 2] = -self.inverse[:2, :2] @ self.matrix[:2, 2]
+        gl_matrix = np.identity(4, dtype=np.float32)
+        gl_matrix[:2, :2] = self.matrix[:2, :2]
+        gl_matrix[:2, 3] = self.matrix[:2, 2]
+        self.gl_matrix = np.ascontiguousarray(gl_matrix.T)  # column-major for glLoadMatrixf
+        self.state = (tx, ty, self.rotate, self.scale)
+
+    def translate_by(self, dx, dy):
+        self.translate = [self.translate[0] + dx, self.translate[1] + dy]
+        self.update()
+
+    def rotate_by(self, degrees):
+        self.rotate += degrees
+        self.update()
+
+    def set_scale(self, scale):
+        self.scale = scale
+        self.update()
+
+    def apply(self, points):
+        """Apply the transform to an (N, 2) array of points."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return points @ self.matrix[:2, :2].T + self.matrix[:2, 2]
+
+    def apply_inverse(self, points):
+        """Apply the inverse transform to an (N, 2) array of points."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return points @ self.inverse[:2, :2].T + self.inverse[:2, 2]
+
+transform = Transform2D()
+
+INSIDE, LEFT, RIGHT, BOTTOM, TOP = 0, 1, 2, 4, 8
+
+def compute_out_codes(x, y, rect):
+    """Compute Cohen-Sutherland out codes for arrays of x and y."""
+    codes = np.zeros(np.shape(x), dtype=np.uint8)
+    codes[x < rect[0]] |= LEFT
+    codes[x > rect[2]] |= RIGHT
+    codes[y < rect[1]] |= BOTTOM
+    codes[y > rect[3]] |= TOP
+    return codes
+
+def cohen_sutherland_clip_batch(segments, rect):
+    """Clip an (N, 4) array of segments with Cohen-Sutherland in one vectorized pass.
+
+    Returns a boolean accept mask and the clipped (N, 4) endpoints. Rows that
+    are rejected keep whatever values they had when they were rejected.
+    """
+    seg = np.array(segments, dtype=np.float64).reshape(-1, 4)
+    accept = np.zeros(len(seg), dtype=bool)
+    active = np.arange(len(seg))
+    code1 = compute_out_codes(seg[:, 0], seg[:, 1], rect)
+    code2 = compute_out_codes(seg[:, 2], seg[:, 3], rect)
+
+    # Every pass moves one endpoint of each active segment onto a window edge,
+    # so a segment is settled after at most four passes.
+    while len(active):
+        c1, c2 = code1[active], code2[active]
+        inside = (c1 | c2) == 0
+        outside = (c1 & c2) != 0
+        accept[active[inside]] = True
+        keep = ~(inside | outside)
+        active, c1, c2 = active[keep], c1[keep], c2[keep]
+        if not len(active):
+            break
+
+        first = c1 != 0
+        code_out = np.where(first, c1, c2)
+        x1, y1, x2, y2 = seg[active].T
+        dx, dy = x2 - x1, y2 - y1
+        x = np.empty(len(active))
+        y = np.empty(len(active))
+        # Edge priority of the classic algorithm: top, bottom, right, left.
+        # The divisors are never zero here, because the other endpoint lies on
+        # the inner side of the edge being clipped against.
+        top = (code_out & TOP) != 0
+        bottom = ~top & ((code_out & BOTTOM) != 0)
+        right = ~top & ~bottom & ((code_out & RIGHT) != 0)
+        left = ~top & ~bottom & ~right
+        for mask, edge in ((top, rect[3]), (bottom, rect[1])):
+            x[mask] = x1[mask] + dx[mask] * (edge - y1[mask]) / dy[mask]
+            y[mask] = edge
+        for mask, edge in ((right, rect[2]), (left, rect[0])):
+            y[mask] = y1[mask] + dy[mask] * (edge - x1[mask]) / dx[mask]
+            x[mask] = edge
+
+        new_codes = compute_out_codes(x, y, rect)
+        rows = active[first]
+        seg[rows, 0] = x[first]
+        seg[rows, 1] = y[first]
+        code1[rows] = new_codes[first]
+        rows = active[~first]
+        seg[rows, 2] = x[~first]
+        seg[rows, 3] = y[~first]
+        code2[rows] = new_codes[~first]
+
+    return accept, seg
+
+def liang_barsky_clip_batch(segments, rect):
+    """Clip an (N, 4) array of segments with Liang-Barsky in one vectorized pass.
+
+    Returns a boolean accept mask and the clipped (N, 4) endpoints.
+    """
+    seg = np.array(segments, dtype=np.float64).reshape(-1, 4)
+    x1, y1, x2, y2 = seg.T
+    dx, dy = x2 - x1, y2 - y1
+    p = np.stack((-dx, dx, -dy, dy), axis=1)
+    q = np.stack((x1 - rect[0], rect[2] - x1, y1 - rect[1], rect[3] - y1), axis=1)
+
+    parallel = p == 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = q / np.where(parallel, 1.0, p)
+    t0 = np.where(p < 0, r, 0.0).max(axis=1)
+    t1 = np.where(p > 0, r, 1.0).min(axis=1)
+    accept = ~(parallel & (q < 0)).any(axis=1) & (t0 <= t1)
+
+    clipped = np.stack((x1 + t0 * dx, y1 + t0 * dy, x1 + t1 * dx, y1 + t1 * dy), axis=1)
+    return accept, clipped
+
+# Clipping work done so far, for benchmarks: calls and primitives clipped
+clip_stats = {'calls': 0, 'primitives': 0}
+
+clip_functions = {
+    'cohen_sutherland': cohen_sutherland_clip_batch,
+    'liang_barsky': liang_barsky_clip_batch,
+}
+
+def clip_segments(segments, rect, method=None):
+    """Clip an (N, 4) array of segments against rect with the selected algorithm."""
+    clip_stats['calls'] += 1
+    clip_stats['primitives'] += len(segments)
+    return clip_functions[method or clip_algorithm](segments, rect)
+
+def square_corners(x1, y1, x2, y2):
+    """Corners of the squares spanned by (x1, y1) and (x2, y2), as (N, 4, 2)."""
+    return np.stack((np.stack((x1, y1), -1), np.stack((x1, y2), -1),
+                     np.stack((x2, y2), -1), np.stack((x2, y1), -1)), axis=-2)
+
+ellipse_rx, ellipse_ry = 50, 30
+max_screen_error = 0.5  # Max distance in pixels between an ellipse and its polygon
+min_ellipse_segments, max_ellipse_segments = 8, 512
+unit_circle_tables = {}
+
+def unit_circle(n_segments):
+    """Return the shared (cos, sin) tables for an n-segment unit circle."""
+    table = unit_circle_tables.get(n_segments)
+    if table is None:
+        angles = 2 * pi * np.arange(n_segments) / n_segments
+        table = unit_circle_tables[n_segments] = (np.cos(angles), np.sin(angles))
+    return table
+
+def ellipse_segment_count(rx, ry):
+    """Choose a segment count for an ellipse with on-screen radii rx, ry.
+
+    A chord spanning an angle of 2*pi/n deviates from a circle of radius r by
+    r * (1 - cos(pi / n)), so n is the smallest count that keeps this below
+    max_screen_error. Counts are rounded up to a power of two so that only a
+    handful of unit-circle tables is ever built.
+    """
+    r = max(abs(rx), abs(ry))
+    if r <= max_screen_error:
+        return min_ellipse_segments
+    n = pi / np.arccos(1 - max_screen_error / r)
+    n = 1 << int(np.ceil(np.log2(n)))
+    return min(max(n, min_ellipse_segments), max_ellipse_segments)
+
+SHAPES = ('point', 'line', 'square', 'ellipse')
+POINT, LINE, SQUARE, ELLIPSE = range(len(SHAPES))
+
+class SceneStore:
+    """Struct-of-arrays store for the drawn objects.
+
+    Every object is one row: its kind (index into SHAPES), its clicked points
+    as x1, y1, x2, y2 (single-click shapes repeat the first point), its color,
+    line thickness and point size.
+    """
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.kind = np.zeros(capacity, dtype=np.uint8)
+        self.coords = np.zeros((capacity, 4), dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.thickness = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+
+    @classmethod
+    def from_columns(cls, kind, coords, color, thickness, size):
+        """Wrap existing column arrays (e.g. memory-mapped ones) without copying."""
+        store = cls(capacity=0)
+        store.kind, store.coords, store.color = kind, coords, color
+        store.thickness, store.size = thickness, size
+        store.count = len(kind)
+        return store
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        """Return object index as a (shape, pts, color, thickness, size) tuple."""
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        index %= self.count
+        shape = SHAPES[self.kind[index]]
+        x1, y1, x2, y2 = self.coords[index].tolist()
+        pts = [(x1, y1), (x2, y2)] if shape in ('line', 'square') else [(x1, y1)]
+        return (shape, pts, tuple(self.color[index].tolist()),
+                float(self.thickness[index]), float(self.size[index]))
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def grow(self, capacity):
+        for name in ('kind', 'coords', 'color', 'thickness', 'size'):
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            setattr(self, name, grown)
+
+    def append(self, shape, pts, color, thickness, size):
+        """Append one object and return its index."""
+        if self.count == len(self.kind):
+            self.grow(max(2 * len(self.kind), 256))
+        index = self.count
+        self.kind[index] = SHAPES.index(shape)
+        self.coords[index, :2] = pts[0]
+        self.coords[index, 2:] = pts[1] if len(pts) > 1 else pts[0]
+        self.color[index] = color
+        self.thickness[index] = thickness
+        self.size[index] = size
+        self.count += 1
+        return index
+
+    def columns(self):
+        """Return views of the used part of every column."""
+        n = self.count
+        return self.kind[:n], self.coords[:n], self.color[:n], self.thickness[:n], self.size[:n]
+
+scene = SceneStore()
+
+class SpatialGrid:
+    """Uniform grid over object bounding boxes, used to answer window queries."""
+    def __init__(self, cell_size=64, max_cells_per_object=64):
+        self.cell_size = cell_size
+        self.max_cells_per_object = max_cells_per_object
+        self.cells = {}   # (column, row) -> list or array of object indices
+        self.large = []   # objects that span too many cells to register in each
+        self.boxes = np.empty((0, 4))
+        self.count = 0
+        self.cell_range = None  # (col0, row0, col1, row1) of occupied cells
+
+    def cell_span(self, box):
+        c0, r0 = int(box[0] // self.cell_size), int(box[1] // self.cell_size)
+        c1, r1 = int(box[2] // self.cell_size), int(box[3] // self.cell_size)
+        return c0, r0, c1, r1
+
+    def insert(self, index, box):
+        """Register the object at index with bounding box (x0, y0, x1, y1)."""
+        if index >= len(self.boxes):
+            grown = np.empty((max(2 * len(self.boxes), index + 1, 256), 4))
+            grown[:self.count] = self.boxes[:self.count]
+            self.boxes = grown
+        self.boxes[index] = box
+        self.count = max(self.count, index + 1)
+
+        c0, r0, c1, r1 = self.cell_span(box)
+        if (c1 - c0 + 1) * (r1 - r0 + 1) > self.max_cells_per_object:
+            self.large.append(index)
         else:
-            outcode_out = outcode1 if outcode1 else outcode2
-            x, y = 0, 0
-            if outcode_out & TOP:
-                x = x1 + (x2 - x1) * (rect[3] - y1) / (y2 - y1 + 1e-10)
-                y = rect[3]
-            elif outcode_out & BOTTOM:
-                x = x1 + (x2 - x1) * (rect[1] - y1) / (y2 - y1 + 1e-10)
-                y = rect[1]
-            elif outcode_out & RIGHT:
-                y = y1 + (y2 - y1) * (rect[2] - x1) / (x2 - x1 + 1e-10)
-                x = rect[2]
-            elif outcode_out & LEFT:
-                y = y1 + (y2 - y1) * (rect[0] - x1) / (x2 - x1 + 1e-10)
-                x = rect[0]
-            if outcode_out == outcode1:
-                x1, y1 = x, y
-                outcode1 = compute_out_code(x1, y1)
-            else:
-                x2, y2 = x, y
-                outcode2 = compute_out_code(x2, y2)
-        iteration += 1
-
-def clip_square(pts, rect):
-    """Clip a square by treating it as four line segments."""
-    x1, y1 = pts[0]
-    x2, y2 = pts[1]
-    # Define the four corners of the square
-    corners = [
-        (x1, y1), (x1, y2),
-        (x1, y2), (x2, y2),
-        (x2, y2), (x2, y1),
-        (x2, y1), (x1, y1)
-    ]
-    clipped_lines = []
-    for i in range(0, 8, 2):
-        inside, clipped = cohen_sutherland_clip(corners[i][0], corners[i][1], corners[i+1][0], corners[i+1][1], rect)
-        if inside:
-            clipped_lines.append(clipped)
-    return clipped_lines
-
-def clip_ellipse(cx, cy, rx, ry, rect):
-    """Clip an ellipse by approximating it as line segments."""
-    segments = []
-    n_segments = 100
-    for i in range(n_segments):
-        angle1 = 2 * pi * i / n_segments
-        angle2 = 2 * pi * (i + 1) / n_segments
-        x1 = cx + cos(angle1) * rx
-        y1 = cy + sin(angle1) * ry
-        x2 = cx + cos(angle2) * rx
-        y2 = cy + sin(angle2) * ry
-        inside, clipped = cohen_sutherland_clip(x1, y1, x2, y2, rect)
-        if inside:
-            segments.append(clipped)
-    return segments
+            for col in range(c0, c1 + 1):
+                for row in range(r0, r1 + 1):
+                    cell = self.cells.setdefault((col, row), [])
+                    if isinstance(cell, np.ndarray):  # filled by build()
+                        cell = self.cells[(col, row)] = cell.tolist()
+                    cell.append(index)
+        if self.cell_range is None:
+            self.cell_range = (c0, r0, c1, r1)
+        else:
+            g = self.cell_range
+            self.cell_range = (min(g[0], c0), min(g[1], r0), max(g[2], c1), max(g[3], r1))
+
+    def build(self, boxes):
+        """Rebuild the grid from an (N, 4) array of boxes in one vectorized pass."""
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.__init__(self.cell_size, self.max_cells_per_object)
+        self.boxes = boxes.copy()
+        self.count = len(boxes)
+        if not self.count:
+            return
+        span = np.floor_divide(boxes, self.cell_size).astype(np.int64)
+        widths = span[:, 2] - span[:, 0] + 1
+        n_cells = widths * (span[:, 3] - span[:, 1] + 1)
+        large = n_cells > self.max_cells_per_object
+        self.large = np.nonzero(large)[0].tolist()
+        small = np.nonzero(~large)[0]
+
+        # One (object, cell) pair per cell an object covers, grouped by cell
+        owners = np.repeat(small, n_cells[small])
+        offset = np.arange(len(owners)) - np.repeat(np.cumsum(n_cells[small]) - n_cells[small],
+                                                    n_cells[small])
+        cols = span[owners, 0] + offset % widths[owners]
+        rows = span[owners, 1] + offset // widths[owners]
+        order = np.lexsort((rows, cols))
+        cols, rows, owners = cols[order], rows[order], owners[order]
+        starts = np.nonzero(np.r_[True, (cols[1:] != cols[:-1]) | (rows[1:] != rows[:-1])])[0]
+        self.cells = dict(zip(zip(cols[starts].tolist(), rows[starts].tolist()),
+                              np.split(owners, starts[1:])))
+        self.cell_range = (int(span[:, 0].min()), int(span[:, 1].min()),
+                           int(span[:, 2].max()), int(span[:, 3].max()))
+
+    def query(self, box):
+        """Return the sorted indices of objects whose boxes overlap box."""
+        if not self.count:
+            return np.empty(0, dtype=np.intp)
+        c0, r0, c1, r1 = self.cell_span(box)
+        g = self.cell_range
+        c0, r0, c1, r1 = max(c0, g[0]), max(r0, g[1]), min(c1, g[2]), min(r1, g[3])
+        n_cells = max(c1 - c0 + 1, 0) * max(r1 - r0 + 1, 0)
+        if n_cells > len(self.cells):
+            # The query covers most of the grid; a vectorized scan is cheaper.
+            candidates = np.arange(self.count)
+        else:
+            found = [self.cells.get((col, row), ()) for col in range(c0, c1 + 1)
+                     for row in range(r0, r1 + 1)]
+            found.append(self.large)
+            candidates = np.unique(np.concatenate([np.asarray(cell, dtype=np.intp) for cell in found]))
+        boxes = self.boxes[candidates]
+        overlap = ((boxes[:, 0] <= box[2]) & (boxes[:, 2] >= box[0]) &
+                   (boxes[:, 1] <= box[3]) & (boxes[:, 3] >= box[1]))
+        return candidates[overlap]
+
+spatial_index = SpatialGrid()
+OUTSIDE, CONTAINED, PARTIAL = 0, 1, 2
+
+def object_bounds(obj):
+    """Return the object-space bounding box (x0, y0, x1, y1) of an object."""
+    shape, pts = obj[0], obj[1]
+    if shape == 'ellipse':
+        cx, cy = pts[0]
+        return (cx - ellipse_rx, cy - ellipse_ry, cx + ellipse_rx, cy + ellipse_ry)
+    xs = [p[0] for p in pts]
+    ys = [p[1] for p in pts]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+def scene_bounds(kinds, coords):
+    """Vectorized object_bounds for the scene columns, as an (N, 4) array."""
+    bounds = np.concatenate((np.minimum(coords[:, :2], coords[:, 2:]),
+                             np.maximum(coords[:, :2], coords[:, 2:])), axis=1).astype(np.float64)
+    ellipses = kinds == ELLIPSE
+    bounds[ellipses] = coords[ellipses, :2].repeat(2, axis=0).reshape(-1, 4)
+    bounds[ellipses] += (-ellipse_rx, -ellipse_ry, ellipse_rx, ellipse_ry)
+    return bounds
+
+def add_object(obj):
+    """Append a (shape, pts, color, thickness, size) object to the scene and index it."""
+    index = scene.append(*obj)
+    if spatial_index.count == index:
+        spatial_index.insert(index, object_bounds(obj))
+    # otherwise the index is out of date and classify_objects rebuilds it
+
+def transformed_bounds(boxes):
+    """Window-space bounding boxes of the transformed object-space boxes."""
+    corners = boxes[:, [0, 1, 0, 3, 2, 1, 2, 3]].reshape(-1, 2)
+    pts = transform.apply(corners).reshape(-1, 4, 2)
+    return np.concatenate((pts.min(axis=1), pts.max(axis=1)), axis=1)
+
+def classify_objects(rect, start=0):
+    """Classify objects [start:] as OUTSIDE, CONTAINED or PARTIAL for a window.
+
+    Only PARTIAL objects need per-segment clipping. Objects the grid does not
+    return cannot touch the window and are never looked at individually. A
+    non-zero start (a few freshly appended objects) tests their boxes directly.
+    """
+    if start:
+        kinds, coords = scene.columns()[:2]
+        bounds = transformed_bounds(scene_bounds(kinds[start:], coords[start:]))
+        overlap = ((bounds[:, 0] <= rect[2]) & (bounds[:, 2] >= rect[0]) &
+                   (bounds[:, 1] <= rect[3]) & (bounds[:, 3] >= rect[1]))
+        contained = ((bounds[:, 0] >= rect[0]) & (bounds[:, 1] >= rect[1]) &
+                     (bounds[:, 2] <= rect[2]) & (bounds[:, 3] <= rect[3]))
+        return np.where(contained, CONTAINED, np.where(overlap, PARTIAL, OUTSIDE)).astype(np.uint8)
+    codes = np.full(len(scene), OUTSIDE, dtype=np.uint8)
+    if spatial_index.count != len(scene):
+        # The scene was replaced (e.g. by load_scene); index it in bulk
+        spatial_index.build(scene_bounds(*scene.columns()[:2]))
+    window_corners = np.array([(rect[0], rect[1]), (rect[0], rect[3]),
+                               (rect[2], rect[1]), (rect[2], rect[3])])
+    corners = transform.apply_inverse(window_corners)
+    query_box = (*corners.min(axis=0), *corners.max(axis=0))
+    candidates = spatial_index.query(query_box)
+    bounds = transformed_bounds(spatial_index.boxes[candidates])
+    contained = ((bounds[:, 0] >= rect[0]) & (bounds[:, 1] >= rect[1]) &
+                 (bounds[:, 2] <= rect[2]) & (bounds[:, 3] <= rect[3]))
+    codes[candidates] = np.where(contained, CONTAINED, PARTIAL)
+    return codes
+
+def current_lod():
+    """Segment count used for ellipses at the current scale."""
+    return ellipse_segment_count(ellipse_rx * transform.scale, ellipse_ry * transform.scale)
+
+def outlines(kind, coords, n_segments):
+    """Object-space outlines of objects of one kind as an (N, k, 2) vertex array.
+
+    Lines are returned as their two endpoints, squares and ellipses as closed
+    polygons.
+    """
+    if kind == LINE:
+        return coords.reshape(-1, 2, 2)
+    if kind == SQUARE:
+        return square_corners(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3])
+    unit_cos, unit_sin = unit_circle(n_segments)
+    xs = coords[:, :1] + unit_cos * ellipse_rx
+    ys = coords[:, 1:2] + unit_sin * ellipse_ry
+    return np.stack((xs, ys), axis=2)
+
+def gather_ranges(starts, counts):
+    """Indices of the ranges [start, start + count) laid out one after another."""
+    ends = np.cumsum(counts)
+    return np.arange(ends[-1] if len(ends) else 0) + np.repeat(starts - ends + counts, counts)
+
+def grown(array, size):
+    """Return array, or a copy with room for at least size rows."""
+    if size <= len(array):
+        return array
+    bigger = np.empty((max(size, 2 * len(array)),) + array.shape[1:], dtype=array.dtype)
+    bigger[:len(array)] = array
+    return bigger
+
+class DrawGroup:
+    """Growable vertex buffer for one (mode, color, width) group.
+
+    Every object added to the group owns one range of vertices, described by
+    firsts, counts and owners (the object's index in the scene).
+    """
+    def __init__(self):
+        self.vertices = np.empty((64, 2), dtype=np.float32)
+        self.firsts = np.empty(16, dtype=np.int32)
+        self.counts = np.empty(16, dtype=np.int32)
+        self.owners = np.empty(16, dtype=np.int32)
+        self.n_vertices = 0
+        self.n_ranges = 0
+
+    def extend(self, vertices, counts, owners):
+        v0, v1 = self.n_vertices, self.n_vertices + len(vertices)
+        r0, r1 = self.n_ranges, self.n_ranges + len(counts)
+        self.vertices = grown(self.vertices, v1)
+        self.firsts = grown(self.firsts, r1)
+        self.counts = grown(self.counts, r1)
+        self.owners = grown(self.owners, r1)
+        self.vertices[v0:v1] = vertices
+        self.firsts[r0:r1] = v0 + np.cumsum(counts) - counts
+        self.counts[r0:r1] = counts
+        self.owners[r0:r1] = owners
+        self.n_vertices, self.n_ranges = v1, r1
+
+    def arrays(self):
+        n = self.n_ranges
+        return self.vertices[:self.n_vertices], self.firsts[:n], self.counts[:n], self.owners[:n]
+
+def add_grouped(groups, mode, colors, widths, vertices, counts, owners):
+    """Add objects to groups ({(mode, color, width): DrawGroup}) by color and width.
+
+    vertices holds every object's vertices one after another, counts how many
+    of them belong to each object and owners the objects' scene indices.
+    """
+    if not len(counts):
+        return
+    # Pack color (8 bits per channel) and width (1/64 steps) into one integer
+    # key; sorting that is much cheaper than a row-wise unique.
+    rgb = np.rint(np.asarray(colors) * 255).astype(np.int64)
+    width = np.rint(np.asarray(widths) * 64).astype(np.int64)
+    keys = (rgb[:, 0] << 40) | (rgb[:, 1] << 32) | (rgb[:, 2] << 24) | width
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    starts = np.cumsum(counts) - counts
+    members = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+    for i, group in zip(first, members):
+        key = (mode, tuple(float(c) for c in colors[i]), float(widths[i]))
+        if key not in groups:
+            groups[key] = DrawGroup()
+        groups[key].extend(vertices[gather_ranges(starts[group], counts[group])],
+                           counts[group], owners[group])
+
+def add_outlines(groups, start, stop, lod):
+    """Add the unclipped object-space outlines of objects [start, stop) to groups."""
+    kinds, coords, colors, thickness, size = (c[start:stop] for c in scene.columns())
+    for kind in (POINT, LINE, SQUARE, ELLIPSE):
+        index = np.nonzero(kinds == kind)[0]
+        if not len(index):
+            continue
+        if kind == POINT:
+            add_grouped(groups, GL_POINTS, colors[index], size[index], coords[index, :2],
+                        np.ones(len(index), dtype=np.intp), start + index)
+            continue
+        vertices = outlines(kind, coords[index], lod)
+        n, k = vertices.shape[:2]
+        add_grouped(groups, GL_LINES if kind == LINE else GL_LINE_LOOP, colors[index],
+                    thickness[index], vertices.reshape(-1, 2), np.full(n, k), start + index)
+
+def clip_objects(groups, start, stop, regions, lod):
+    """Clip objects [start, stop) against window_rect, adding the results to groups.
+
+    regions holds the window classes of these objects. Returns two masks over
+    them: objects drawn whole in green, and objects whose outline is replaced
+    by the clipped geometry added to groups. Squares and ellipses are outlines,
+    so their edges are clipped as segments: only the part of the outline inside
+    the window is drawn, and an outline that merely surrounds the window keeps
+    its own color.
+    """
+    kinds, coords, colors, thickness, size = (c[start:stop] for c in scene.columns())
+    green = regions == CONTAINED
+    hidden = np.zeros(len(kinds), dtype=bool)
+    color = np.array([(0.0, 1.0, 0.0)])
+
+    points = np.nonzero((kinds == POINT) & (regions == PARTIAL))[0]
+    xy = transform.apply(coords[points, :2])
+    green[points] = ((xy[:, 0] >= window_rect[0]) & (xy[:, 0] <= window_rect[2]) &
+                     (xy[:, 1] >= window_rect[1]) & (xy[:, 1] <= window_rect[3]))
+
+    lines = np.nonzero((kinds == LINE) & (regions == PARTIAL))[0]
+    if len(lines):
+        segments = transform.apply(coords[lines].reshape(-1, 2)).reshape(-1, 4)
+        accept, clipped = clip_segments(segments, window_rect)
+        hidden[lines[accept]] = True
+        vertices = transform.apply_inverse(clipped[accept].reshape(-1, 2))
+        add_grouped(groups, GL_LINES, color.repeat(accept.sum(), axis=0),
+                    thickness[lines[accept]], vertices, np.full(accept.sum(), 2),
+                    start + lines[accept])
+
+    for kind in (SQUARE, ELLIPSE):
+        index = np.nonzero((kinds == kind) & (regions == PARTIAL))[0]
+        if not len(index):
+            continue
+        polygons = outlines(kind, coords[index], lod)
+        n, k = polygons.shape[:2]
+        polygons = transform.apply(polygons.reshape(-1, 2)).reshape(n, k, 2)
+        # Edge i runs from vertex i to vertex i + 1, the last one closes the loop
+        segments = np.concatenate((polygons, np.roll(polygons, -1, axis=1)), axis=2)
+        accept, clipped = clip_segments(segments.reshape(-1, 4), window_rect)
+        counts = 2 * np.bincount(np.repeat(np.arange(n), k)[accept], minlength=n)
+        drawn = counts > 0
+        hidden[index[drawn]] = True
+        add_grouped(groups, GL_LINES, color.repeat(drawn.sum(), axis=0),
+                    thickness[index[drawn]], transform.apply_inverse(clipped[accept].reshape(-1, 2)),
+                    counts[drawn], start + index[drawn])
+    return green, hidden
+
+def compose(base_groups, clip_groups=None, green=None, hidden=None):
+    """Turn the draw groups into batches (mode, color, width, vertices, firsts, counts).
+
+    Objects marked green are drawn from their unclipped outline in green,
+    hidden ones are left out because clip_groups holds their clipped
+    geometry. firsts and counts are None when a whole GL_POINTS or GL_LINES
+    buffer can be drawn with one glDrawArrays; otherwise the batch is drawn
+    with glMultiDrawArrays.
+    """
+    result = []
+    def add(mode, color, width, vertices, firsts, counts, mask=None):
+        if mask is not None and not mask.all():
+            if not mask.any():
+                return
+            firsts, counts = firsts[mask], counts[mask]
+        elif mode != GL_LINE_LOOP:
+            firsts = counts = None
+        result.append((mode, color, width, vertices, firsts, counts))
+
+    for (mode, color, width), group in base_groups.items():
+        vertices, firsts, counts, owners = group.arrays()
+        if green is None:
+            add(mode, color, width, vertices, firsts, counts)
+            continue
+        add(mode, color, width, vertices, firsts, counts, ~(green[owners] | hidden[owners]))
+        add(mode, (0.0, 1.0, 0.0), width, vertices, firsts, counts, green[owners] & ~hidden[owners])
+    for (mode, color, width), group in (clip_groups or {}).items():
+        add(mode, color, width, *group.arrays()[:3])
+    # Sort by mode and width so that state changes between batches are rare
+    return sorted(result, key=lambda batch: (batch[0], batch[2]))
+
+def build_batches(regions=None):
+    """Build the frame's draw batches from scratch; see compose for their layout.
+
+    Objects are grouped by primitive mode, color and line width (point size
+    for points), so each group is one draw call. regions overrides the
+    window classification from classify_objects.
+    """
+    lod = current_lod()
+    base_groups = {}
+    add_outlines(base_groups, 0, len(scene), lod)
+    if not window_rect:
+        return compose(base_groups)
+    if regions is None:
+        regions = classify_objects(window_rect)
+    clip_groups = {}
+    green, hidden = clip_objects(clip_groups, 0, len(scene), regions, lod)
+    return compose(base_groups, clip_groups, green, hidden)
+
+# Unclipped outlines of the first 'count' objects, valid for one ellipse LOD
+base_layer = {'lod': None, 'count': 0, 'groups': {}}
+# Clipping results of the first 'count' objects, valid for one window,
+# transform and ellipse LOD (the 'key')
+clip_layer = {'key': None, 'count': 0, 'groups': {}, 'green': None, 'hidden': None}
+# Draw batches of the last frame, reused while nothing changes
+batch_cache = {'key': None, 'batches': []}
+cache_stats = {'hits': 0, 'misses': 0}
+
+def invalidate_draw_cache():
+    """Drop all cached geometry, e.g. after the scene was replaced."""
+    base_layer.update(lod=None, count=0, groups={})
+    clip_layer.update(key=None, count=0, groups={}, green=None, hidden=None)
+    batch_cache['key'] = None
+
+def cached_batches():
+    """Return the draw batches, doing only the work that the last change requires.
+
+    Appending objects only outlines and clips the new ones. A new window,
+    transform or clipping algorithm re-clips everything, and a new ellipse LOD rebuilds the
+    outlines. A redraw with nothing changed reuses the last batches as is.
+    """
+    lod = current_lod()
+    n = len(scene)
+    if base_layer['lod'] != lod:
+        base_layer.update(lod=lod, count=0, groups={})
+    if base_layer['count'] < n:
+        add_outlines(base_layer['groups'], base_layer['count'], n, lod)
+        base_layer['count'] = n
+
+    clip_key = None
+    if window_rect:
+        clip_key = (tuple(window_rect), transform.state, lod, clip_algorithm)
+        if clip_layer['key'] != clip_key:
+            clip_layer.update(key=clip_key, count=0, groups={},
+                              green=np.zeros(0, dtype=bool), hidden=np.zeros(0, dtype=bool))
+        start = clip_layer['count']
+        if start < n:
+            regions = classify_objects(window_rect, start)
+            green, hidden = clip_objects(clip_layer['groups'], start, n, regions, lod)
+            clip_layer['green'] = np.concatenate((clip_layer['green'], green))
+            clip_layer['hidden'] = np.concatenate((clip_layer['hidden'], hidden))
+            clip_layer['count'] = n
+
+    key = (lod, n, clip_key)
+    if batch_cache['key'] == key:
+        cache_stats['hits'] += 1
+        return batch_cache['batches']
+    cache_stats['misses'] += 1
+    batch_cache['key'] = key
+    if clip_key is None:
+        batch_cache['batches'] = compose(base_layer['groups'])
+    else:
+        batch_cache['batches'] = compose(base_layer['groups'], clip_layer['groups'],
+                                         clip_layer['green'], clip_layer['hidden'])
+    return batch_cache['batches']
+
+SCENE_MAGIC = b'GKASCENE'
+SCENE_COLUMNS = ('kind', 'coords', 'color', 'thickness', 'size')
+SCENE_ALIGN = 64
+
+def aligned(offset):
+    return -(-offset // SCENE_ALIGN) * SCENE_ALIGN
+
+def save_scene(path):
+    """Save the scene columns, the transform and window_rect to a binary file.
+
+    Layout: magic, header length (uint32), JSON header, then every column as
+    raw little-endian data at a 64-byte aligned offset, so load_scene can map
+    the columns straight from the file.
+
+    The file is written to path + '.tmp' and then moved over path. The scene
+    may still be memory-mapped from path (after load_scene), and truncating
+    that file in place would pull the pages out from under those columns.
+    """
+    header = {
+        'version': 1,
+        'count': len(scene),
+        'transform': {'translate': [float(v) for v in transform.translate],
+                      'rotate': float(transform.rotate), 'scale': float(transform.scale)},
+        'window_rect': [float(v) for v in window_rect],
+        'columns': {},
+    }
+    columns = [np.ascontiguousarray(c, dtype=c.dtype.newbyteorder('<')) for c in scene.columns()]
+    offset = 0
+    for name, column in zip(SCENE_COLUMNS, columns):
+        header['columns'][name] = {'dtype': column.dtype.str, 'shape': list(column.shape),
+                                   'offset': offset}
+        offset = aligned(offset + column.nbytes)
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = aligned(len(SCENE_MAGIC) + 4 + len(header_bytes))
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(SCENE_MAGIC)
+            f.write(struct.pack('<I', len(header_bytes)))
+            f.write(header_bytes)
+            for name, column in zip(SCENE_COLUMNS, columns):
+                f.seek(data_start + header['columns'][name]['offset'])
+                f.write(column.tobytes())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def load_scene(path):
+    """Load a file written by save_scene, memory-mapping its columns.
+
+    The columns are mapped copy-on-write, so drawing more objects afterwards
+    never modifies the file. Raises ValueError if path is not a scene file.
+    """
+    global scene, spatial_index, window_rect
+    with open(path, 'rb') as f:
+        if f.read(len(SCENE_MAGIC)) != SCENE_MAGIC:
+            raise ValueError(f"{path} is not a scene file")
+        header_length, = struct.unpack('<I', f.read(4))
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    data_start = aligned(len(SCENE_MAGIC) + 4 + header_length)
+
+    columns = []
+    for name in SCENE_COLUMNS:
+        info = header['columns'][name]
+        shape = tuple(info['shape'])
+        if header['count']:
+            columns.append(np.memmap(path, dtype=info['dtype'], mode='c',
+                                     offset=data_start + info['offset'], shape=shape))
+        else:
+            columns.append(np.zeros(shape, dtype=info['dtype']))
+    scene = SceneStore.from_columns(*columns)
+    spatial_index = SpatialGrid()  # rebuilt in bulk on the first window query
+
+    transform.translate = header['transform']['translate']
+    transform.rotate = header['transform']['rotate']
+    transform.scale = header['transform']['scale']
+    transform.update()
+    window_rect = header['window_rect']
+    invalidate_draw_cache()
 
 def display():
     glClear(GL_COLOR_BUFFER_BIT)
-    glLoadIdentity()
-    glTranslatef(*transform_translate, 0)
-    glScalef(transform_scale, transform_scale, 1)
-    glRotatef(transform_rotate, 0, 0, 1)
-
-    for obj in objects:
-        shape, pts, color, thickness, size = obj
-        glLineWidth(thickness)
-        glPointSize(size if shape == 'point' else 1)
-
-        # Transform points to window coordinates for clipping
-        if shape == 'point':
-            x, y = apply_transform(*pts[0])
-            if window_rect and point_inside_rect(x, y, window_rect):
-                glColor3f(0, 1, 0)  # Green if inside
-            else:
-                glColor3f(*color)
-            glBegin(GL_POINTS)
-            glVertex2f(*pts[0])
-            glEnd()
-        elif shape == 'line':
-            x1, y1 = apply_transform(*pts[0])
-            x2, y2 = apply_transform(*pts[1])
-            if window_rect:
-                inside, clipped = cohen_sutherland_clip(x1, y1, x2, y2, window_rect)
-                if inside:
-                    # Transform clipped points back to object space (approximate)
-                    cx1, cy1 = inverse_transform(clipped[0], clipped[1])
-                    cx2, cy2 = inverse_transform(clipped[2], clipped[3])
-                    glColor3f(0, 1, 0)
-                    glBegin(GL_LINES)
-                    glVertex2f(cx1, cy1)
-                    glVertex2f(cx2, cy2)
-                    glEnd()
-                else:
-                    glColor3f(*color)
-                    glBegin(GL_LINES)
-                    glVertex2f(*pts[0])
-                    glVertex2f(*pts[1])
-                    glEnd()
-            else:
-                glColor3f(*color)
-                glBegin(GL_LINES)
-                glVertex2f(*pts[0])
-                glVertex2f(*pts[1])
-                glEnd()
-        elif shape == 'square':
-            if window_rect:
-                x1, y1 = apply_transform(*pts[0])
-                x2, y2 = apply_transform(*pts[1])
-                clipped_lines = clip_square([(x1, y1), (x2, y2)], window_rect)
-                if clipped_lines:
-                    glColor3f(0, 1, 0)
-                    glBegin(GL_LINES)
-                    for line in clipped_lines:
-                        cx1, cy1 = inverse_transform(line[0], line[1])
-                        cx2, cy2 = inverse_transform(line[2], line[3])
-                        glVertex2f(cx1, cy1)
-                        glVertex2f(cx2, cy2)
-                    glEnd()
-                else:
-                    glColor3f(*color)
-                    x1, y1 = pts[0]
-                    x2, y2 = pts[1]
-                    glBegin(GL_LINE_LOOP)
-                    glVertex2f(x1, y1)
-                    glVertex2f(x1, y2)
-                    glVertex2f(x2, y2)
-                    glVertex2f(x2, y1)
-                    glEnd()
-            else:
-                glColor3f(*color)
-                x1, y1 = pts[0]
-                x2, y2 = pts[1]
-                glBegin(GL_LINE_LOOP)
-                glVertex2f(x1, y1)
-                glVertex2f(x1, y2)
-                glVertex2f(x2, y2)
-                glVertex2f(x2, y1)
-                glEnd()
-        elif shape == 'ellipse':
-            cx, cy = pts[0]
-            rx, ry = 50, 30
-            cx_t, cy_t = apply_transform(cx, cy)
-            if window_rect:
-                clipped_segments = clip_ellipse(cx_t, cy_t, rx * transform_scale, ry * transform_scale, window_rect)
-                if clipped_segments:
-                    glColor3f(0, 1, 0)
-                    glBegin(GL_LINES)
-                    for segment in clipped_segments:
-                        cx1, cy1 = inverse_transform(segment[0], segment[1])
-                        cx2, cy2 = inverse_transform(segment[2], segment[3])
-                        glVertex2f(cx1, cy1)
-                        glVertex2f(cx2, cy2)
-                    glEnd()
-                else:
-                    glColor3f(*color)
-                    glBegin(GL_LINE_LOOP)
-                    for i in range(100):
-                        angle = 2 * pi * i / 100
-                        glVertex2f(cx + cos(angle) * rx, cy + sin(angle) * ry)
-                    glEnd()
-            else:
-                glColor3f(*color)
-                glBegin(GL_LINE_LOOP)
-                for i in range(100):
-                    angle = 2 * pi * i / 100
-                    glVertex2f(cx + cos(angle) * rx, cy + sin(angle) * ry)
-                glEnd()
+    glLoadMatrixf(transform.gl_matrix)
+
+    glEnableClientState(GL_VERTEX_ARRAY)
+    for mode, color, width, vertices, firsts, counts in cached_batches():
+        if mode == GL_POINTS:
+            glPointSize(width)
+        else:
+            glLineWidth(width)
+        glColor3f(*color)
+        glVertexPointer(2, GL_FLOAT, 0, vertices)
+        if firsts is None:
+            glDrawArrays(mode, 0, len(vertices))
+        else:
+            glMultiDrawArrays(mode, firsts, counts, len(counts))
+    glDisableClientState(GL_VERTEX_ARRAY)
 
     if len(window_rect) == 4:
         glLoadIdentity()  # Draw window_rect in window coordinates
@@ -270,13 +815,13 @@ def mouse(button, state, x, y):
     if state == GLUT_DOWN:
         clicks.append((x, y))
         if current_shape in ['line', 'square'] and len(clicks) == 2:
-            objects.append((current_shape, clicks[:2], current_color, line_thickness, point_size))
+            add_object((current_shape, clicks[:2], current_color, line_thickness, point_size))
             clicks = []
         elif current_shape == 'point' and len(clicks) == 1:
-            objects.append(('point', [clicks[0]], current_color, line_thickness, point_size))
+            add_object(('point', [clicks[0]], current_color, line_thickness, point_size))
             clicks = []
         elif current_shape == 'ellipse' and len(clicks) == 1:
-            objects.append(('ellipse', [clicks[0]], current_color, line_thickness, point_size))
+            add_object(('ellipse', [clicks[0]], current_color, line_thickness, point_size))
             clicks = []
         elif current_shape == 'window' and len(clicks) == 2:
             x1, y1 = clicks[0]
@@ -287,20 +832,38 @@ def mouse(button, state, x, y):
 
 def keyboard(key, x, y):
     global current_shape, current_color, line_thickness, point_size
-    global transform_translate, transform_rotate, transform_scale, window_rect
+    global window_rect
+    global clip_algorithm
     if key == b'1': current_shape = 'point'
     elif key == b'2': current_shape = 'line'
     elif key == b'3': current_shape = 'square'
     elif key == b'4': current_shape = 'ellipse'
     elif key == b'5': current_shape = 'window'
     elif key == b'6': window_rect = []  # Disable clipping
-    elif key == b'w': transform_translate[1] += 10
-    elif key == b's': transform_translate[1] -= 10
-    elif key == b'a': transform_translate[0] -= 10
-    elif key == b'd': transform_translate[0] += 10
-    elif key == b'r': transform_rotate += 10
-    elif key == b'e': transform_scale += 0.1
-    elif key == b'q': transform_scale = max(0.1, transform_scale - 0.1)
+    elif key == b'b':
+        clip_algorithm = 'liang_barsky' if clip_algorithm == 'cohen_sutherland' else 'cohen_sutherland'
+        print(f"Clipping algorithm: {clip_algorithm}")
+    elif key == b'k':
+        try:
+            save_scene(scene_file)
+            print(f"Scene saved to {scene_file} ({len(scene)} objects)")
+        except (OSError, ValueError) as e:
+            print(f"Cannot save {scene_file}: {e}")
+    elif key == b'o':
+        try:
+            load_scene(scene_file)
+            print(f"Scene loaded from {scene_file} ({len(scene)} objects)")
+        except (OSError, ValueError) as e:
+            print(f"Cannot load {scene_file}: {e}")
+    elif key == b'i':
+        print(f"Draw batch cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    elif key == b'w': transform.translate_by(0, 10)
+    elif key == b's': transform.translate_by(0, -10)
+    elif key == b'a': transform.translate_by(-10, 0)
+    elif key == b'd': transform.translate_by(10, 0)
+    elif key == b'r': transform.rotate_by(10)
+    elif key == b'e': transform.set_scale(transform.scale + 0.1)
+    elif key == b'q': transform.set_scale(max(0.1, transform.scale - 0.1))
     elif key == b'z': current_color = (1, 0, 0)
     elif key == b'x': current_color = (0, 1, 0)
     elif key == b'c': current_color = (0, 0, 1)
@@ -357,9 +920,17 @@ cheatsheet = """
 ✂️ WINDOWING & CLIPPING:
   - Tekan [5], klik 2 titik → Membuat window aktif (kotak biru)
   - Tekan [6] → Menonaktifkan clipping
+  - Tekan [b] → Ganti algoritma clipping (Cohen-Sutherland / Liang-Barsky)
   - Objek dalam window (Titik, Garis, Persegi, Ellipse) → Warna hijau
   - Objek di luar window → Warna asli objek
 
+📊 STATISTIK:
+  [i] Tampilkan hit/miss cache batch gambar
+
+💾 SIMPAN / BUKA SCENE:
+  [k] Simpan scene ke scene.gka
+  [o] Buka scene dari scene.gka
+
 ============================================================================
 """
 
@@ -5,8 +5,49 @@ from OpenGL.GLU import *
 import math
 import numpy as np
 import os
+import json
+import struct
+import hashlib
+import ctypes
+import sys
+import io
+import glob
+import time
+import contextlib
+import copy
+import csv
+import zlib
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from multiprocessing import shared_memory, resource_tracker
 
 class Object3D:
+    # Setiap perubahan translasi/rotasi menaikkan transform_version, jadi
+    # cache yang bergantung pada transform (mis. bounds dunia) tahu kapan basi.
+    # transform_clock naik untuk perubahan objek mana pun, sehingga Scene bisa
+    # melewati pengecekan per objek jika tidak ada yang bergerak.
+    transform_clock = 0
+
+    def transform_property(name):
+        def get(self):
+            return self.__dict__[name]
+
+        def set(self, value):
+            self.__dict__[name] = value
+            self.__dict__['transform_version'] = self.__dict__.get('transform_version', 0) + 1
+            Object3D.transform_clock += 1
+        return property(get, set)
+
+    rotation_x = transform_property('rotation_x')
+    rotation_y = transform_property('rotation_y')
+    rotation_z = transform_property('rotation_z')
+    translation_x = transform_property('translation_x')
+    translation_y = transform_property('translation_y')
+    translation_z = transform_property('translation_z')
+    orientation = transform_property('orientation')
+    del transform_property
+
     def __init__(self):
         self.rotation_x = 0
         self.rotation_y = 0
@@ -14,125 +55,1057 @@ class Object3D:
         self.translation_x = 0
         self.translation_y = 0
         self.translation_z = -5
+        # Quaternion (w, x, y, z); None berarti orientasi dari sudut Euler di atas
+        self.orientation = None
+        self.mesh = None  # TriangleMesh, dibuat sekali oleh subclass
+        self.lods = []  # (error, TriangleMesh) dari halus ke kasar, lihat build_lods
+        self.baked = None  # BakedColors untuk draw_baked, milik objek ini sendiri
         
     def rotate(self, x, y, z):
-        self.rotation_x += x
-        self.rotation_y += y
-        self.rotation_z += z
+        if self.orientation is None:
+            self.rotation_x += x
+            self.rotation_y += y
+            self.rotation_z += z
+        else:
+            # Rotasi tambahan terhadap sumbu dunia; quaternion dinormalisasi
+            # setiap kali sehingga drag yang panjang tidak menumpuk error
+            q = self.quaternion_multiply(self.quaternion_from_euler([[x, y, z]])[0],
+                                         self.orientation)
+            self.orientation = q / np.linalg.norm(q)
+    
+    def use_quaternion(self, enabled=True):
+        """Pindah antara orientasi quaternion dan sudut Euler, pose tetap sama"""
+        if enabled and self.orientation is None:
+            self.orientation = self.quaternion_from_matrix(self.rotation_matrix())
+        elif not enabled and self.orientation is not None:
+            matrix = self.rotation_matrix()
+            self.orientation = None
+            self.rotation_x, self.rotation_y, self.rotation_z = self.euler_from_matrix(matrix)
         
     def translate(self, x, y, z):
         self.translation_x += x
         self.translation_y += y
         self.translation_z += z
 
-class Cube(Object3D):
-    def __init__(self):
-        super().__init__()
-        self.vertices = [
-            [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],  # belakang
-            [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]       # depan
-        ]
-        
-        # Face indices (counter-clockwise untuk normal yang benar)
-        self.faces = [
-            [0, 1, 2, 3],  # belakang
-            [4, 7, 6, 5],  # depan
-            [0, 4, 5, 1],  # bawah
-            [2, 6, 7, 3],  # atas
-            [0, 3, 7, 4],  # kiri
-            [1, 5, 6, 2]   # kanan
-        ]
-        
-        # Normal untuk setiap face
-        self.normals = [
-            [0, 0, -1],   # belakang
-            [0, 0, 1],    # depan
-            [0, -1, 0],   # bawah
-            [0, 1, 0],    # atas
-            [-1, 0, 0],   # kiri
-            [1, 0, 0]     # kanan
-        ]
-    
-    def draw(self):
+    @staticmethod
+    def rotation_matrices(angles):
+        """Matriks rotasi (N, 3, 3) dari sudut (N, 3) dalam derajat
+
+        Sama dengan glRotatef x, lalu y, lalu z.
+        """
+        c, s = np.cos(np.radians(angles)).T, np.sin(np.radians(angles)).T
+        one, zero = np.ones_like(c[0]), np.zeros_like(c[0])
+        rx = np.stack([one, zero, zero, zero, c[0], -s[0], zero, s[0], c[0]], -1).reshape(-1, 3, 3)
+        ry = np.stack([c[1], zero, s[1], zero, one, zero, -s[1], zero, c[1]], -1).reshape(-1, 3, 3)
+        rz = np.stack([c[2], -s[2], zero, s[2], c[2], zero, zero, zero, one], -1).reshape(-1, 3, 3)
+        return rx @ ry @ rz
+
+    @staticmethod
+    def quaternion_multiply(a, b):
+        """Hasil kali quaternion (..., 4) a * b (rotasi b dulu, lalu a)"""
+        a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+        aw, ax, ay, az = np.moveaxis(a, -1, 0)
+        bw, bx, by, bz = np.moveaxis(b, -1, 0)
+        return np.stack([aw * bw - ax * bx - ay * by - az * bz,
+                         aw * bx + ax * bw + ay * bz - az * by,
+                         aw * by - ax * bz + ay * bw + az * bx,
+                         aw * bz + ax * by - ay * bx + az * bw], axis=-1)
+
+    @classmethod
+    def quaternion_from_euler(cls, angles):
+        """Quaternion (N, 4) dari sudut (N, 3) dalam derajat, sama dengan rotation_matrices"""
+        half = np.radians(np.asarray(angles, dtype=np.float64)) / 2
+        c, s = np.cos(half), np.sin(half)
+        zero = np.zeros_like(c[:, 0])
+        qx = np.stack([c[:, 0], s[:, 0], zero, zero], -1)
+        qy = np.stack([c[:, 1], zero, s[:, 1], zero], -1)
+        qz = np.stack([c[:, 2], zero, zero, s[:, 2]], -1)
+        return cls.quaternion_multiply(cls.quaternion_multiply(qx, qy), qz)
+
+    @staticmethod
+    def quaternion_matrices(quaternions):
+        """Matriks rotasi (N, 3, 3) dari quaternion (N, 4)"""
+        q = np.asarray(quaternions, dtype=np.float64)
+        q = q / np.linalg.norm(q, axis=1, keepdims=True)
+        w, x, y, z = q.T
+        return np.stack([
+            1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y),
+            2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x),
+            2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y),
+        ], -1).reshape(-1, 3, 3)
+
+    @staticmethod
+    def quaternion_from_matrix(matrix):
+        """Quaternion satuan (w, x, y, z) dari matriks rotasi 3x3"""
+        m = np.asarray(matrix, dtype=np.float64)
+        trace = np.trace(m)
+        if trace > 0:
+            s = 2 * np.sqrt(trace + 1)
+            q = [s / 4, (m[2, 1] - m[1, 2]) / s, (m[0, 2] - m[2, 0]) / s, (m[1, 0] - m[0, 1]) / s]
+        else:
+            # Mulai dari komponen diagonal terbesar supaya s tidak mendekati 0
+            i = int(np.argmax(np.diag(m)))
+            j, k = (i + 1) % 3, (i + 2) % 3
+            s = 2 * np.sqrt(1 + m[i, i] - m[j, j] - m[k, k])
+            q = np.empty(4)
+            q[0] = (m[k, j] - m[j, k]) / s
+            q[1 + i] = s / 4
+            q[1 + j] = (m[j, i] + m[i, j]) / s
+            q[1 + k] = (m[k, i] + m[i, k]) / s
+        q = np.asarray(q)
+        return q / np.linalg.norm(q)
+
+    @staticmethod
+    def euler_from_matrix(matrix):
+        """Sudut (x, y, z) dalam derajat sehingga rotation_matrices menghasilkan matrix"""
+        m = np.asarray(matrix, dtype=np.float64)
+        y = np.arcsin(np.clip(m[0, 2], -1.0, 1.0))
+        if abs(m[0, 2]) < 1 - 1e-9:
+            x = np.arctan2(-m[1, 2], m[2, 2])
+            z = np.arctan2(-m[0, 1], m[0, 0])
+        else:
+            # Gimbal lock: hanya x + z (atau x - z) yang tertentu, pilih z = 0
+            x = np.arctan2(m[2, 1], m[1, 1])
+            z = 0.0
+        return tuple(float(v) for v in np.degrees([x, y, z]))
+
+    def rotation_matrix(self):
+        """Matriks rotasi 3x3 yang sama dengan glRotatef x, lalu y, lalu z
+        (atau dari quaternion orientation jika dipakai)"""
+        return self.model_matrix()[:3, :3]
+
+    def model_matrix(self):
+        """Model matrix 4x4 (translasi lalu rotasi), disimpan sampai transform berubah"""
+        if getattr(self, 'matrix_version', None) != self.transform_version:
+            self.matrix = self.model_matrices([self])[0]
+            # Urutan kolom (column-major) untuk glMultMatrixd
+            self.gl_matrix = np.ascontiguousarray(self.matrix.T)
+            self.matrix_version = self.transform_version
+        return self.matrix
+
+    @classmethod
+    def model_matrices(cls, objects):
+        """Model matrix (N, 4, 4) untuk banyak objek sekaligus (vectorized)"""
+        values = np.array([(o.rotation_x, o.rotation_y, o.rotation_z, o.translation_x,
+                            o.translation_y, o.translation_z) for o in objects],
+                          dtype=np.float64).reshape(-1, 6)
+        matrices = np.zeros((len(values), 4, 4))
+        matrices[:, 3, 3] = 1
+        matrices[:, :3, 3] = values[:, 3:]
+        quaternion = np.array([o.orientation is not None for o in objects], dtype=bool)
+        matrices[~quaternion, :3, :3] = cls.rotation_matrices(values[~quaternion, :3])
+        if quaternion.any():
+            matrices[quaternion, :3, :3] = cls.quaternion_matrices(
+                [o.orientation for o, q in zip(objects, quaternion) if q])
+        return matrices
+
+    def world_point(self, point):
+        """Posisi dunia dari titik di koordinat objek"""
+        matrix = self.model_matrix()
+        return matrix[:3, 3] + matrix[:3, :3] @ np.asarray(point, dtype=np.float64)
+
+    def world_bounds(self):
+        """Bounding box (low, high) dan bounding sphere (center, radius) di dunia
+
+        Dihitung dari bounding box mesh, translasi dan rotasi; hasilnya
+        disimpan sampai translasi atau rotasi berubah.
+        """
+        state = (self.transform_version, id(self.mesh))
+        if getattr(self, 'bounds_state', None) != state:
+            rotation = self.rotation_matrix()
+            center = self.world_point(self.mesh.center)
+            extent = np.abs(rotation) @ ((self.mesh.high - self.mesh.low) / 2.0)
+            self.bounds = (center - extent, center + extent, center, self.mesh.radius)
+            self.bounds_state = state
+        return self.bounds
+
+    def build_lods(self, levels=4, min_triangles=256):
+        """Ambil level LOD self.mesh dari MESH_REGISTRY (lihat TriangleMesh.build_lods)
+
+        Objek dengan mesh yang sama memakai level LOD yang sama.
+        """
+        if self.mesh is None:
+            self.lods = [(0.0, None)]
+            return
+        self.lods = MESH_REGISTRY.lod_levels(self.mesh, levels, min_triangles)
+        self.mesh = self.lods[0][1]
+
+    def instance(self):
+        """Objek baru dengan mesh dan LOD yang sama, hanya transform-nya sendiri
+
+        Tidak ada geometri yang dibuat atau di-hash ulang, jadi menambah
+        instance hampir gratis.
+        """
+        obj = copy.copy(self)
+        for name in ('matrix', 'gl_matrix', 'matrix_version', 'bounds', 'bounds_state'):
+            obj.__dict__.pop(name, None)
+        Object3D.__init__(obj)
+        obj.mesh, obj.lods = self.mesh, self.lods
+        return obj
+
+    def lod_mesh(self, camera, viewport_height, max_pixel_error=1.0):
+        """Pilih level LOD paling kasar yang error-nya di layar <= max_pixel_error
+
+        Error level (ukuran cell simplifikasi) diproyeksikan ke pixel memakai
+        jarak kamera ke pusat objek dan Camera.fov.
+        """
+        if len(self.lods) < 2:
+            return self.mesh
+        eye = np.array([camera.eye_x, camera.eye_y, camera.eye_z])
+        distance = np.linalg.norm(self.world_point(self.mesh.center) - eye) - self.mesh.radius
+        pixels_per_unit = viewport_height / (2 * np.tan(np.radians(camera.fov) / 2) * max(distance, 1e-6))
+        chosen = self.mesh
+        for error, mesh in self.lods:
+            if error * pixels_per_unit <= max_pixel_error:
+                chosen = mesh
+        return chosen
+
+    def draw(self, camera=None, viewport_height=600):
         glPushMatrix()
-        glTranslatef(self.translation_x, self.translation_y, self.translation_z)
-        glRotatef(self.rotation_x, 1, 0, 0)
-        glRotatef(self.rotation_y, 0, 1, 0)
-        glRotatef(self.rotation_z, 0, 0, 1)
+        self.model_matrix()
+        glMultMatrixd(self.gl_matrix)
         
-        glBegin(GL_QUADS)
-        for i, face in enumerate(self.faces):
-            glNormal3fv(self.normals[i])
-            for vertex_idx in face:
-                glVertex3fv(self.vertices[vertex_idx])
-        glEnd()
+        mesh = self.mesh
+        if camera is not None:
+            mesh = self.lod_mesh(camera, viewport_height)
+        if mesh is not None:
+            mesh.draw()
         
         glPopMatrix()
 
-class Pyramid(Object3D):
+    def draw_baked(self, lighting, view, camera=None, viewport_height=600):
+        """Seperti draw, tetapi dengan warna lighting yang sudah di-bake per vertex
+
+        view adalah Camera.view_matrix(). Warna dihitung ulang hanya jika
+        objek, kamera, level LOD atau parameter lighting berubah (lihat
+        BakedColors). GL_LIGHTING harus dimatikan oleh pemanggil.
+        """
+        mesh = self.mesh if camera is None else self.lod_mesh(camera, viewport_height)
+        if mesh is None:
+            return
+        if self.baked is None:
+            self.baked = BakedColors()
+        self.baked.update(mesh.data, view @ self.model_matrix(), lighting, id(mesh))
+        glPushMatrix()
+        glMultMatrixd(self.gl_matrix)
+        mesh.draw(self.baked.buffer)
+        glPopMatrix()
+
+class Cube(Object3D):
+    # Geometri dipakai bersama oleh semua Cube; mesh-nya dari MESH_REGISTRY
+    vertices = [
+        [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],  # belakang
+        [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1]       # depan
+    ]
+    
+    # Face indices (counter-clockwise untuk normal yang benar)
+    faces = [
+        [0, 1, 2, 3],  # belakang
+        [4, 7, 6, 5],  # depan
+        [0, 4, 5, 1],  # bawah
+        [2, 6, 7, 3],  # atas
+        [0, 3, 7, 4],  # kiri
+        [1, 5, 6, 2]   # kanan
+    ]
+    
+    # Normal untuk setiap face
+    normals = [
+        [0, 0, -1],   # belakang
+        [0, 0, 1],    # depan
+        [0, -1, 0],   # bawah
+        [0, 1, 0],    # atas
+        [-1, 0, 0],   # kiri
+        [1, 0, 0]     # kanan
+    ]
+
     def __init__(self):
         super().__init__()
-        # Vertex koordinat untuk piramida
-        self.vertices = [
-            [0, 1, 0],      # puncak
-            [-1, -1, 1],    # base kiri depan
-            [1, -1, 1],     # base kanan depan
-            [1, -1, -1],    # base kanan belakang
-            [-1, -1, -1]    # base kiri belakang
-        ]
-        
-        # Face indices
-        self.faces = [
-            [1, 2, 3, 4],   # base
-            [0, 2, 1],      # depan
-            [0, 3, 2],      # kanan
-            [0, 4, 3],      # belakang
-            [0, 1, 4]       # kiri
-        ]
-    
-    def calculate_normal(self, p1, p2, p3):
-        # Menghitung normal dari 3 titik
-        v1 = np.array(p2) - np.array(p1)
-        v2 = np.array(p3) - np.array(p1)
-        normal = np.cross(v1, v2)
-        norm = np.linalg.norm(normal)
-        if norm > 0:
-            normal = normal / norm
-        return normal
+        # Satu normal untuk keempat vertex setiap face
+        self.mesh = MESH_REGISTRY.from_faces(self.vertices, self.faces, self.normals,
+                                             [[i] * 4 for i in range(len(self.faces))])
+
+class Pyramid(Object3D):
+    # Vertex koordinat untuk piramida
+    vertices = [
+        [0, 1, 0],      # puncak
+        [-1, -1, 1],    # base kiri depan
+        [1, -1, 1],     # base kanan depan
+        [1, -1, -1],    # base kanan belakang
+        [-1, -1, -1]    # base kiri belakang
+    ]
     
-    def draw(self):
-        glPushMatrix()
-        glTranslatef(self.translation_x, self.translation_y, self.translation_z)
-        glRotatef(self.rotation_x, 1, 0, 0)
-        glRotatef(self.rotation_y, 0, 1, 0)
-        glRotatef(self.rotation_z, 0, 0, 1)
-        
-        # Base (quad)
-        glBegin(GL_QUADS)
-        glNormal3f(0, -1, 0)  # normal menghadap ke bawah
-        for vertex_idx in self.faces[0]:
-            glVertex3fv(self.vertices[vertex_idx])
-        glEnd()
+    # Face indices
+    faces = [
+        [1, 2, 3, 4],   # base
+        [0, 2, 1],      # depan
+        [0, 3, 2],      # kanan
+        [0, 4, 3],      # belakang
+        [0, 1, 4]       # kiri
+    ]
+
+    def __init__(self):
+        super().__init__()
+        # Base memakai normal ke bawah, sisi segitiga dihitung dari vertex-nya
+        self.mesh = MESH_REGISTRY.from_faces(self.vertices, self.faces, [[0, -1, 0]],
+                                             [[0, 0, 0, 0], [], [], [], []])
+
+class FaceList:
+    """Daftar face dalam bentuk CSR: indeks semua face disambung dalam satu array.
+
+    face ke-i adalah indices[offsets[i]:offsets[i + 1]], jadi bisa dipakai
+    seperti list of list (len, indexing, iterasi) tanpa membuat list Python
+    per face.
+    """
+    def __init__(self, indices, counts, offsets=None):
+        self.indices = indices
+        self.counts = counts
+        if offsets is None:
+            offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=offsets[1:])
+        self.offsets = offsets
+
+    @classmethod
+    def from_lists(cls, faces):
+        """Buat FaceList dari list of list (hasil load_obj_lines)"""
+        counts = np.array([len(face) for face in faces], dtype=np.int32)
+        indices = np.fromiter((i for face in faces for i in face), dtype=np.int32,
+                              count=int(counts.sum()))
+        return cls(indices, counts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __getitem__(self, i):
+        return self.indices[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self.counts)):
+            yield self.indices[self.offsets[i]:self.offsets[i + 1]]
+
+class TriangleMesh:
+    """Mesh yang sudah dipecah menjadi segitiga, digambar dengan satu glDrawElements
+
+    data berisi normal dan posisi setiap vertex secara interleaved (nx ny nz
+    x y z, float32) dan indices berisi 3 indeks uint32 (atau uint16) per
+    segitiga. Keduanya diupload ke VBO pada draw pertama.
+    """
+    STRIDE = 6 * 4  # byte per vertex
+    # smooth_normals: vertex dengan face lebih dari EXACT_VALENCE memakai
+    # kelompok arah normal (langkah 1 / NORMAL_STEPS per komponen)
+    EXACT_VALENCE = 64
+    NORMAL_STEPS = 8
+    # Total draw call dan vertex (indeks) yang dikirim, dibaca FrameProfiler
+    draw_calls = 0
+    vertices_drawn = 0
+
+    def __init__(self, data, indices):
+        self.data = data
+        self.indices = indices
+        self.buffers = None
+        self.asset_key = None  # hash isi, di-set oleh MeshRegistry
+        positions = data[:, 3:]
+        if len(positions):
+            self.low, self.high = positions.min(axis=0), positions.max(axis=0)
+        else:
+            self.low = self.high = np.zeros(3, dtype=np.float32)
+        self.center = (self.low + self.high) / 2.0
+        self.radius = float(np.linalg.norm(positions - self.center, axis=1).max()) \
+            if len(positions) else 0.0
+
+    @property
+    def triangle_count(self):
+        return self.indices.size // 3
+
+    def surface_area(self):
+        p0, p1, p2 = (self.data[self.indices.reshape(-1, 3)[:, k], 3:].astype(np.float64)
+                      for k in range(3))
+        return 0.5 * float(np.linalg.norm(np.cross(p1 - p0, p2 - p0), axis=1).sum())
+
+    @staticmethod
+    def face_normals(vertices, corners, counts):
+        """Normal semua face sekaligus dengan metode Newell
+
+        corners berisi indeks vertex semua face berurutan, counts jumlah
+        vertex per face (minimal 1). Return (unit, area): normal satuan dan
+        vektor normal dengan panjang 2 x luas face, untuk bobot luas. Berlaku
+        juga untuk quad dan n-gon yang tidak planar sempurna.
+        """
+        starts = np.cumsum(counts) - counts
+        following = np.arange(1, len(corners) + 1)
+        following[starts + counts - 1] = starts  # sudut terakhir kembali ke sudut pertama
+        points = vertices[corners]
+        area = np.add.reduceat(np.cross(points, points[following]), starts, axis=0) \
+            if len(counts) else np.zeros((0, 3), dtype=np.float32)
+        length = np.linalg.norm(area, axis=1, keepdims=True)
+        unit = np.divide(area, length, out=np.zeros_like(area), where=length > 0)
+        return unit, area
+
+    @staticmethod
+    def smooth_normals(corners, corner_face, unit, area, crease_angle):
+        """Normal halus per sudut: jumlah normal berbobot luas dari face di sekitarnya
+
+        Hanya face yang sudutnya dengan face sudut itu tidak melebihi
+        crease_angle (derajat) yang ikut dijumlahkan, jadi tepi tajam tetap
+        tajam. Jumlah pasangan sudut di satu vertex kuadratik terhadap jumlah
+        face-nya, jadi vertex dengan lebih dari EXACT_VALENCE face (puncak
+        kerucut, pusat fan) memakai clustered_normals.
+        """
+        order = np.argsort(corners, kind='stable')
+        sorted_vertices = corners[order]
+        group_start = np.flatnonzero(np.r_[True, sorted_vertices[1:] != sorted_vertices[:-1]])
+        group_size = np.diff(np.r_[group_start, len(corners)])
+        start = np.repeat(group_start, group_size)
+        size = np.repeat(group_size, group_size)
+        exact = size <= TriangleMesh.EXACT_VALENCE
+        cos_limit = np.cos(np.radians(crease_angle))
+
+        # Pasangan (sudut, sudut lain di vertex yang sama), termasuk dirinya
+        small = np.flatnonzero(exact)
+        pairs = size[small]
+        pair_i = np.repeat(small, pairs)
+        pair_j = start[pair_i] + np.arange(len(pair_i)) - np.repeat(np.cumsum(pairs) - pairs, pairs)
+        face_i = corner_face[order[pair_i]]
+        face_j = corner_face[order[pair_j]]
+        near = np.einsum('ij,ij->i', unit[face_i], unit[face_j]) >= cos_limit
+
+        total = np.zeros((len(corners), 3))
+        for axis in range(3):
+            total[:, axis] = np.bincount(pair_i[near], weights=area[face_j[near], axis],
+                                         minlength=len(corners))
+        large = np.flatnonzero(~exact)
+        if len(large):
+            total[large] = TriangleMesh.clustered_normals(
+                sorted_vertices[large], corner_face[order[large]], unit, area, cos_limit)
+        length = np.linalg.norm(total, axis=1, keepdims=True)
+        result = np.empty_like(total)
+        result[order] = np.divide(total, length, out=np.zeros_like(total), where=length > 0)
+        return result
+
+    @staticmethod
+    def clustered_normals(corners, corner_face, unit, area, cos_limit):
+        """smooth_normals untuk vertex dengan banyak face, memori linear
+
+        Face di setiap vertex dikelompokkan menurut normal yang dibulatkan
+        ke kelipatan 1 / NORMAL_STEPS. Tes crease dilakukan antar kelompok
+        (arah rata-ratanya), bukan antar sudut, jadi jumlah pasangan dibatasi
+        jumlah arah yang berbeda, bukan jumlah face. Return jumlah normal
+        berbobot luas (belum dinormalisasi) per sudut.
+        """
+        steps = np.rint(unit[corner_face] * TriangleMesh.NORMAL_STEPS).astype(np.int64)
+        keys, cluster = np.unique(np.column_stack((corners, steps)), axis=0, return_inverse=True)
+        cluster = cluster.reshape(-1)
+        n = len(keys)
+        area_sum = np.empty((n, 3))
+        direction = np.empty((n, 3))
+        for axis in range(3):
+            area_sum[:, axis] = np.bincount(cluster, weights=area[corner_face, axis], minlength=n)
+            direction[:, axis] = np.bincount(cluster, weights=unit[corner_face, axis], minlength=n)
+        length = np.linalg.norm(direction, axis=1, keepdims=True)
+        direction = np.divide(direction, length, out=np.zeros_like(direction), where=length > 0)
+
+        # Kelompok sudah urut per vertex (np.unique mengurutkan kolom vertex dulu)
+        group_start = np.flatnonzero(np.r_[True, keys[1:, 0] != keys[:-1, 0]])
+        group_size = np.diff(np.r_[group_start, n])
+        start = np.repeat(group_start, group_size)
+        size = np.repeat(group_size, group_size)
+        pair_i = np.repeat(np.arange(n), size)
+        pair_j = start[pair_i] + np.arange(len(pair_i)) - np.repeat(np.cumsum(size) - size, size)
+        near = np.einsum('ij,ij->i', direction[pair_i], direction[pair_j]) >= cos_limit
+        total = np.empty((n, 3))
+        for axis in range(3):
+            total[:, axis] = np.bincount(pair_i[near], weights=area_sum[pair_j[near], axis],
+                                         minlength=n)
+        return total[cluster]
+
+    @classmethod
+    def from_faces(cls, vertices, faces, normals=None, face_normals=None,
+                   smooth=False, crease_angle=60.0):
+        """Triangulasi face (fan untuk quad dan n-gon) menjadi TriangleMesh
+
+        faces dan face_normals boleh berupa FaceList atau list of list. Face
+        tanpa normal dari file memakai normal face (flat), atau normal vertex
+        halus dengan batas crease_angle jika smooth=True. Face dengan kurang
+        dari 3 vertex atau indeks di luar jangkauan dibuang.
+        """
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, 3)
+        normals = np.asarray(normals if normals is not None else [],
+                             dtype=np.float32).reshape(-1, 3)
+        if not isinstance(faces, FaceList):
+            faces = FaceList.from_lists(faces)
+        if face_normals is None:
+            face_normals = FaceList(np.zeros(0, dtype=np.int32),
+                                    np.zeros(len(faces), dtype=np.int32))
+        elif not isinstance(face_normals, FaceList):
+            face_normals = FaceList.from_lists(face_normals)
+
+        counts = np.asarray(faces.counts, dtype=np.int64)
+        corners = np.asarray(faces.indices, dtype=np.int64)
+        face_of = np.repeat(np.arange(len(counts)), counts)
+        bad = (corners < 0) | (corners >= len(vertices))
+        valid = (counts >= 3) & (np.bincount(face_of[bad], minlength=len(counts)) == 0)
+
+        # Indeks vn per sudut, -1 jika face tidak punya indeks vn yang lengkap
+        has_normals = np.asarray(face_normals.counts) == counts
+        file_normals = np.full(len(corners), -1, dtype=np.int64)
+        file_normals[np.repeat(has_normals, counts)] = np.asarray(
+            face_normals.indices, dtype=np.int64)[np.repeat(has_normals, face_normals.counts)]
+        file_normals[file_normals >= len(normals)] = -1
+
+        keep = np.repeat(valid, counts)
+        corners, file_normals, counts = corners[keep], file_normals[keep], counts[valid]
+        corner_face = np.repeat(np.arange(len(counts)), counts)
+        unit, area = cls.face_normals(vertices.astype(np.float64), corners, counts)
+
+        # Normal per sudut: dari file, atau flat / halus dari geometri
+        missing = file_normals < 0
+        corner_normals = np.empty((len(corners), 3), dtype=np.float32)
+        corner_normals[~missing] = normals[file_normals[~missing]]
+        if smooth and missing.any():
+            corner_normals[missing] = cls.smooth_normals(
+                corners, corner_face, unit, area, crease_angle)[missing]
+        else:
+            corner_normals[missing] = unit[corner_face[missing]]
+
+        # Sudut dengan posisi dan normal yang sama memakai vertex yang sama
+        corner_data = np.concatenate((corner_normals, vertices[corners]), axis=1)
+        rows = np.ascontiguousarray(corner_data).view(np.dtype((np.void, cls.STRIDE)))
+        _, first, inverse = np.unique(rows.ravel(), return_index=True, return_inverse=True)
+        data = corner_data[first]
+
+        # Fan: segitiga (0, j, j + 1) untuk j = 1 .. n - 2 di setiap face
+        starts = np.cumsum(counts) - counts
+        n_triangles = counts - 2
+        triangle_face = np.repeat(np.arange(len(counts)), n_triangles)
+        j = np.arange(n_triangles.sum()) - np.repeat(np.cumsum(n_triangles) - n_triangles,
+                                                      n_triangles) + 1
+        first = starts[triangle_face]
+        triangles = np.stack((first, first + j, first + j + 1), axis=1)
+        indices = inverse.reshape(-1)[triangles].astype(np.uint32)
+        return cls(data, indices)
+
+    def simplify(self, cell_size):
+        """Versi mesh dengan lebih sedikit segitiga (vertex clustering + quadric)
+
+        Vertex digabung per cell grid berukuran cell_size. Posisi vertex baru
+        meminimalkan jumlah error quadric (jarak kuadrat ke bidang segitiga,
+        dibobot luas) dari semua segitiga di cell itu, dibatasi di sekitar
+        cell. Segitiga yang menjadi degenerate atau kembar dibuang; normal
+        dihitung ulang (halus, crease 60 derajat).
+        """
+        positions = self.data[:, 3:].astype(np.float64)
+        triangles = self.indices.reshape(-1, 3).astype(np.int64)
+        low = positions.min(axis=0)
+        cells = np.floor((positions - low) / cell_size).astype(np.int64)
+        dims = cells.max(axis=0) + 1
+        keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+        _, first, cluster = np.unique(keys, return_index=True, return_inverse=True)
+        cluster = cluster.reshape(-1)
+        n_clusters = len(first)
+
+        # Quadric per segitiga: luas * p p^T dengan p = (n, d) bidang segitiga
+        p0, p1, p2 = (positions[triangles[:, k]] for k in range(3))
+        normal = np.cross(p1 - p0, p2 - p0)
+        area = np.linalg.norm(normal, axis=1)
+        unit = np.divide(normal, area[:, None], out=np.zeros_like(normal), where=area[:, None] > 0)
+        plane = np.column_stack((unit, -(unit * p0).sum(axis=1)))
+        owners = cluster[triangles].reshape(-1)
+        quadric = np.zeros((n_clusters, 4, 4))
+        for i in range(4):
+            for j in range(i, 4):
+                weights = np.repeat(area * plane[:, i] * plane[:, j], 3)
+                quadric[:, i, j] = quadric[:, j, i] = np.bincount(owners, weights, n_clusters)
+
+        # Minimum quadric, ditarik sedikit ke rata-rata cluster supaya cell
+        # yang datar atau berupa tepi tetap punya solusi yang stabil
+        size = np.bincount(cluster, minlength=n_clusters)[:, None]
+        mean = np.stack([np.bincount(cluster, positions[:, k], n_clusters)
+                         for k in range(3)], axis=1) / size
+        a = quadric[:, :3, :3]
+        b = quadric[:, :3, 3]
+        damping = 1e-3 * np.trace(a, axis1=1, axis2=2) / 3 + 1e-12
+        eye = np.eye(3)[None] * damping[:, None, None]
+        target = np.linalg.solve(a + eye, (damping[:, None] * mean - b)[..., None])[..., 0]
+        cell_low = low + cells[first] * cell_size
+        target = np.clip(target, cell_low - 0.5 * cell_size, cell_low + 1.5 * cell_size)
+
+        merged = cluster[triangles]
+        keep = ((merged[:, 0] != merged[:, 1]) & (merged[:, 1] != merged[:, 2]) &
+                (merged[:, 0] != merged[:, 2]))
+        merged = merged[keep]
+        _, unique = np.unique(np.sort(merged, axis=1), axis=0, return_index=True)
+        merged = merged[np.sort(unique)]
+        return TriangleMesh.from_faces(target, FaceList(merged.reshape(-1),
+                                                        np.full(len(merged), 3)),
+                                       smooth=True)
+
+    def build_lods(self, levels=4, min_triangles=256):
+        """Level LOD [(error, TriangleMesh)] dari mesh ini dengan simplify
+
+        Level pertama adalah mesh ini sendiri dengan error 0. Setiap level
+        kira-kira seperempat jumlah segitiga level sebelumnya. Mesh kecil
+        (kurang dari min_triangles segitiga) tidak diberi LOD.
+        """
+        lods = [(0.0, self)]
+        if self.triangle_count < min_triangles:
+            return lods
+        # Clustering permukaan seluas A dengan cell c menyisakan sekitar
+        # 2 * A / c^2 segitiga; pakai itu untuk menebak cell setiap level
+        area = self.surface_area()
+        cell_size = 0.0
+        for _ in range(3 * levels):
+            if len(lods) > levels:
+                break
+            previous = lods[-1][1]
+            target = previous.triangle_count / 4
+            cell_size = max(cell_size * 1.25, np.sqrt(2 * area / target))
+            mesh = self.simplify(cell_size)
+            if mesh.triangle_count <= 0.5 * previous.triangle_count:
+                lods.append((cell_size, mesh))
+                if mesh.triangle_count < min_triangles:
+                    break
+        return lods
+
+    def release(self):
+        """Hapus VBO milik mesh ini (misalnya sebelum mesh dibuat ulang)"""
+        if self.buffers is not None:
+            glDeleteBuffers(2, self.buffers)
+            self.buffers = None
+
+    def upload(self, usage=GL_STATIC_DRAW):
+        """Upload data dan indices ke VBO (dibuat saat upload pertama)"""
+        if self.buffers is None:
+            self.buffers = glGenBuffers(2)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffers[0])
+        glBufferData(GL_ARRAY_BUFFER, self.data.nbytes, self.data, usage)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.buffers[1])
+        glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.indices.nbytes, self.indices, usage)
+
+    def draw(self, colors=None):
+        """Gambar mesh; colors adalah VBO warna RGBA uint8 per vertex (BakedColors)
+
+        Dengan colors, warna vertex dipakai sebagai color array, jadi
+        GL_LIGHTING harus dimatikan supaya warna itu yang tampil.
+        """
+        if not self.indices.size:
+            return
+        if self.buffers is None:
+            self.upload()
+        else:
+            glBindBuffer(GL_ARRAY_BUFFER, self.buffers[0])
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.buffers[1])
+        if colors is not None:
+            # Warna menggantikan normal: tanpa lighting normal tidak dipakai
+            glBindBuffer(GL_ARRAY_BUFFER, colors)
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(4, GL_UNSIGNED_BYTE, 0, None)
+            glBindBuffer(GL_ARRAY_BUFFER, self.buffers[0])
+        else:
+            glEnableClientState(GL_NORMAL_ARRAY)
+            glNormalPointer(GL_FLOAT, self.STRIDE, ctypes.c_void_p(0))
         
-        # Triangular faces
-        glBegin(GL_TRIANGLES)
-        for face in self.faces[1:]:
-            p1 = self.vertices[face[0]]
-            p2 = self.vertices[face[1]]
-            p3 = self.vertices[face[2]]
-            normal = self.calculate_normal(p1, p2, p3)
-            glNormal3fv(normal)
-            for vertex_idx in face:
-                glVertex3fv(self.vertices[vertex_idx])
-        glEnd()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, self.STRIDE, ctypes.c_void_p(12))
+        index_type = GL_UNSIGNED_SHORT if self.indices.dtype == np.uint16 else GL_UNSIGNED_INT
+        glDrawElements(GL_TRIANGLES, self.indices.size, index_type, None)
+        TriangleMesh.draw_calls += 1
+        TriangleMesh.vertices_drawn += self.indices.size
+        glDisableClientState(GL_VERTEX_ARRAY)
+        if colors is not None:
+            glDisableClientState(GL_COLOR_ARRAY)
+        else:
+            glDisableClientState(GL_NORMAL_ARRAY)
         
-        glPopMatrix()
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+class InstancedMesh(TriangleMesh):
+    """Banyak instance satu TriangleMesh, digambar dengan satu glDrawElements
+
+    OpenGL fixed-function tidak punya atribut per instance, jadi vertex
+    semua instance ditransformasi sekaligus di NumPy dari array model
+    matrix (N, 4, 4) lalu diupload ke satu VBO; indeks mesh diulang per
+    instance. update() dengan key yang sama tidak menghitung ulang apa pun.
+    """
+    def __init__(self, mesh):
+        self.mesh = mesh
+        self.data = np.zeros((0, 6), dtype=np.float32)
+        self.indices = np.zeros((0, 3), dtype=np.uint32)
+        self.buffers = None
+        self.key = None
+        self.dirty = False
+        self.baked = BakedColors()
+
+    @property
+    def instance_count(self):
+        return len(self.data) // max(len(self.mesh.data), 1)
+
+    def update(self, matrices, key=None):
+        """Transformasi vertex mesh dengan setiap model matrix di matrices"""
+        if key is not None and key == self.key:
+            return
+        self.key = key
+        matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+        count, size = len(matrices), len(self.mesh.data)
+        rotation = matrices[:, :3, :3]
+        data = np.empty((count, size, 6), dtype=np.float32)
+        # Normal ditransform dengan invers-transpose bagian 3x3 matrix
+        data[..., :3] = self.mesh.data[:, :3] @ np.linalg.inv(rotation)
+        data[..., 3:] = self.mesh.data[:, 3:] @ rotation.transpose(0, 2, 1) + matrices[:, None, :3, 3]
+        if count != self.instance_count or not len(self.indices):
+            offsets = np.arange(count, dtype=np.uint32) * np.uint32(size)
+            self.indices = (self.mesh.indices[None] + offsets[:, None, None]).reshape(-1, 3)
+        self.data = data.reshape(-1, 6)
+        self.dirty = True
+
+    def draw(self, colors=None):
+        if self.dirty and self.indices.size:
+            self.upload(GL_STREAM_DRAW)
+            self.dirty = False
+        super().draw(colors)
+
+    def release(self):
+        super().release()
+        self.baked.release()
+
+class BakedColors:
+    """Warna lighting per vertex (RGBA uint8) satu mesh, di VBO sendiri
+
+    Dibuat dengan Lighting.bake dan dipakai sebagai color array dengan
+    GL_LIGHTING mati, jadi lighting tidak dihitung ulang setiap frame.
+    Posisi lampu ada di koordinat mata, jadi hasilnya bergantung pada
+    modelview (kamera dan objek); update() hanya bake ulang jika modelview,
+    parameter lighting atau source (mesh / isi batch) berubah.
+    """
+    def __init__(self):
+        self.key = None
+        self.colors = None
+        self.buffer = None
+        self.bakes = 0
+
+    def update(self, data, modelview, lighting, source):
+        key = (source, modelview.tobytes(), lighting.state())
+        if key == self.key:
+            return False
+        self.key = key
+        self.colors = lighting.bake(data, modelview)
+        if self.buffer is None:
+            self.buffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.buffer)
+        glBufferData(GL_ARRAY_BUFFER, self.colors.nbytes, self.colors, GL_DYNAMIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.bakes += 1
+        return True
+
+    def release(self):
+        if self.buffer is not None:
+            glDeleteBuffers(1, [self.buffer])
+            self.buffer = None
+            self.key = None
+
+class MeshSource:
+    """Array sumber satu model (vertices, faces, normals, face_normals)
+
+    Dibuat oleh MeshRegistry.source, jadi objek dari file yang sama (atau
+    file lain dengan isi sama) memakai satu salinan array sumber. meshes
+    menyimpan hasil triangulasinya per opsi normal (smooth, crease_angle).
+    """
+    def __init__(self, key, vertices, faces, normals, face_normals):
+        self.key = key
+        self.vertices = vertices
+        self.faces = faces
+        self.normals = normals
+        self.face_normals = face_normals
+        self.meshes = {}
+
+class MeshRegistry:
+    """Satu salinan geometri untuk setiap mesh yang isinya sama
+
+    Mesh dikenali dari hash isinya (blake2b dari data dan indices), jadi
+    model yang ditempatkan berkali-kali, atau dua file dengan isi sama,
+    hanya punya satu TriangleMesh, satu set LOD dan satu VBO. Array mesh
+    yang terdaftar dibuat read-only karena dipakai bersama, dan indices
+    disimpan sebagai uint16 jika jumlah vertex muat. Object3D hanya
+    menyimpan referensi ke mesh ditambah transform-nya sendiri.
+    """
+    def __init__(self):
+        self.meshes = {}   # hash isi mesh -> TriangleMesh
+        self.sources = {}  # hash vertex/face sumber -> MeshSource
+        self.lods = {}     # (hash isi mesh, levels, min_triangles) -> level LOD
+
+    @staticmethod
+    def content_hash(arrays, options=()):
+        digest = hashlib.blake2b(repr(options).encode('utf-8'), digest_size=16)
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            digest.update(f"{array.dtype.str}{array.shape}".encode('utf-8'))
+            digest.update(array.view(np.uint8).reshape(-1))
+        return digest.hexdigest()
+
+    def add(self, mesh):
+        """Return mesh terdaftar dengan isi yang sama, atau daftarkan mesh ini"""
+        if mesh.asset_key is not None and self.meshes.get(mesh.asset_key) is mesh:
+            return mesh
+        key = self.content_hash((mesh.data, mesh.indices.astype(np.uint32, copy=False)))
+        shared = self.meshes.get(key)
+        if shared is not None:
+            if shared is not mesh:
+                mesh.release()
+            return shared
+        if len(mesh.data) <= 1 << 16 and mesh.indices.dtype != np.uint16:
+            mesh.release()
+            mesh.indices = mesh.indices.astype(np.uint16)
+        mesh.data.setflags(write=False)
+        mesh.indices.setflags(write=False)
+        mesh.asset_key = key
+        self.meshes[key] = mesh
+        return mesh
+
+    def source(self, vertices, faces, normals=None, face_normals=None):
+        """MeshSource untuk array sumber ini; sumber yang isinya sama (dari
+        load terpisah sekalipun) mendapat entry yang sama"""
+        if not isinstance(faces, FaceList):
+            faces = FaceList.from_lists(faces)
+        if face_normals is not None and not isinstance(face_normals, FaceList):
+            face_normals = FaceList.from_lists(face_normals)
+        arrays = [np.asarray(vertices, dtype=np.float32).reshape(-1, 3),
+                  np.asarray(normals if normals is not None else [], dtype=np.float32).reshape(-1, 3),
+                  np.asarray(faces.indices, dtype=np.int32), np.asarray(faces.counts, dtype=np.int32)]
+        if face_normals is not None:
+            arrays += [np.asarray(face_normals.indices, dtype=np.int32),
+                       np.asarray(face_normals.counts, dtype=np.int32)]
+        key = self.content_hash(arrays, (face_normals is not None,))
+        source = self.sources.get(key)
+        if source is None:
+            source = MeshSource(key, arrays[0], faces, normals, face_normals)
+            self.sources[key] = source
+        return source
+
+    def from_source(self, source, smooth=False, crease_angle=60.0, mesh=None):
+        """Mesh source dengan opsi normal ini, ditriangulasi sekali
+
+        mesh adalah hasil triangulasi yang sudah ada (misalnya dari worker
+        ParallelOBJLoader) dan dipakai jika source belum punya mesh itu.
+        """
+        options = (bool(smooth), float(crease_angle))
+        shared = source.meshes.get(options)
+        if shared is None:
+            if mesh is None:
+                mesh = TriangleMesh.from_faces(source.vertices, source.faces, source.normals,
+                                               source.face_normals, smooth, crease_angle)
+            shared = source.meshes[options] = self.add(mesh)
+        elif mesh is not None and mesh is not shared:
+            mesh.release()
+        return shared
+
+    def from_faces(self, vertices, faces, normals=None, face_normals=None,
+                   smooth=False, crease_angle=60.0):
+        """TriangleMesh.from_faces lewat registry
+
+        Sumber (vertices, faces, normals, face_normals dan opsi normal) yang
+        sudah pernah ditriangulasi langsung mendapat mesh yang sama.
+        """
+        return self.from_source(self.source(vertices, faces, normals, face_normals),
+                                smooth, crease_angle)
+
+    def lod_levels(self, mesh, levels=4, min_triangles=256):
+        """Level LOD mesh (lihat TriangleMesh.build_lods), dibuat sekali per mesh"""
+        mesh = self.add(mesh)
+        key = (mesh.asset_key, levels, min_triangles)
+        if key not in self.lods:
+            self.lods[key] = [(error, self.add(lod))
+                              for error, lod in mesh.build_lods(levels, min_triangles)]
+        return self.lods[key]
+
+    @property
+    def nbytes(self):
+        """Total byte data dan indices semua mesh terdaftar"""
+        return sum(mesh.data.nbytes + mesh.indices.nbytes for mesh in self.meshes.values())
+
+# Registry bersama untuk semua Object3D dalam proses ini
+MESH_REGISTRY = MeshRegistry()
 
 class OBJLoader:
     """Class untuk membaca file .obj"""
     @staticmethod
     def load_obj(filename):
-        """Load file .obj dan return vertices, faces, normals"""
+        """Load file .obj dan return vertices, faces, normals
+
+        Parser cepat berbasis NumPy: vertices dan normals menjadi array
+        float32 (N, 3), faces dan face_normals menjadi FaceList int32. File
+        dengan format face campuran dibaca ulang dengan load_obj_lines.
+        """
+        try:
+            with open(filename, 'rb') as file:
+                data = file.read()
+            records = OBJLoader.split_records(data)
+            vertices = OBJLoader.parse_vectors(*records[1])
+            normals = OBJLoader.parse_vectors(*records[2])
+            faces, face_normals = OBJLoader.parse_faces(*records[3], *records['seen'])
+        except FileNotFoundError:
+            print(f"File {filename} tidak ditemukan!")
+            return None
+        except ValueError:
+            # Format face campuran atau baris tidak biasa: pakai parser per baris
+            return OBJLoader.load_obj_lines(filename)
+        except Exception as e:
+            print(f"Error loading {filename}: {e}")
+            return None
+
+        print(f"OBJ loaded: {len(vertices)} vertices, {len(faces)} faces")
+        return {
+            'vertices': vertices,
+            'faces': faces,
+            'normals': normals,
+            'face_normals': face_normals
+        }
+
+    @staticmethod
+    def split_records(data):
+        """Kelompokkan baris v, vn dan f tanpa loop per baris
+
+        Return {tipe: (block, jumlah baris)} untuk tipe 1 (v), 2 (vn) dan 3 (f);
+        block berisi baris-baris itu dengan awalan diganti spasi. Baris lain
+        (vt, o, g, s, usemtl, komentar) dilewati. Baris sejenis yang berurutan
+        diambil sebagai satu potongan bytes. Spasi/tab di awal baris diabaikan
+        seperti strip() pada parser per baris. Return juga 'seen': jumlah
+        baris v dan vn sebelum setiap face, untuk indeks negatif.
+        """
+        padded = np.frombuffer(bytearray(data + b'\n\n\n'), dtype=np.uint8)
+        chars = padded[:len(data)]
+        line_starts = np.flatnonzero(chars == ord('\n')) + 1
+        line_starts = np.concatenate(([0], line_starts[line_starts < len(chars)]))
+        # Awal record = karakter pertama yang bukan spasi/tab di baris itu;
+        # baris yang menjorok dimajukan satu karakter per langkah
+        starts = line_starts
+        indented = np.flatnonzero((padded[starts] == ord(' ')) | (padded[starts] == ord('\t')))
+        if len(indented):
+            starts = starts.copy()
+            while len(indented):
+                starts[indented] += 1
+                head = padded[starts[indented]]
+                indented = indented[(head == ord(' ')) | (head == ord('\t'))]
+        c0, c1, c2 = padded[starts], padded[starts + 1], padded[starts + 2]
+        blank = (c1 == ord(' ')) | (c1 == ord('\t'))
+        kinds = np.zeros(len(starts), dtype=np.int8)
+        kinds[(c0 == ord('v')) & blank] = 1
+        kinds[(c0 == ord('v')) & (c1 == ord('n')) & ((c2 == ord(' ')) | (c2 == ord('\t')))] = 2
+        kinds[(c0 == ord('f')) & blank] = 3
+
+        # Hapus awalan dengan spasi supaya isi baris bisa langsung di-parse
+        padded[starts[kinds > 0]] = ord(' ')
+        padded[starts[kinds == 2] + 1] = ord(' ')
+        data = chars.tobytes()
+
+        # Potong menjadi run baris bertipe sama
+        change = np.flatnonzero(np.diff(kinds)) + 1
+        run_starts = np.concatenate(([0], change))
+        run_ends = np.concatenate((change, [len(starts)]))
+        ends = np.concatenate((line_starts[1:], [len(data)]))
+        pieces = {1: [], 2: [], 3: []}
+        lines = {1: 0, 2: 0, 3: 0}
+        for first, last in zip(run_starts, run_ends):
+            kind = int(kinds[first])
+            if kind:
+                pieces[kind].append(data[starts[first]:ends[last - 1]])
+                lines[kind] += int(last - first)
+
+        records = {kind: (b''.join(pieces[kind]), lines[kind]) for kind in pieces}
+        records['seen'] = (np.cumsum(kinds == 1)[kinds == 3], np.cumsum(kinds == 2)[kinds == 3])
+        return records
+
+    @staticmethod
+    def parse_vectors(block, n):
+        """Ubah n record 'x y z' menjadi array float32 (N, 3)"""
+        if not n:
+            return np.zeros((0, 3), dtype=np.float32)
+        values = np.fromstring(block, dtype=np.float32, sep=' ')
+        if len(values) != 3 * n:
+            # Ada komponen tambahan (w atau warna vertex): ambil 3 yang pertama
+            values = np.array([r.split()[:3] for r in block.split(b'\n') if r.strip()],
+                              dtype=np.float32)
+        return values.reshape(-1, 3)
+
+    @staticmethod
+    def parse_faces(block, n, n_vertices, n_normals):
+        """Ubah n record face menjadi FaceList indeks vertex dan indeks normal
+
+        Format yang didukung: v, v/vt, v//vn dan v/vt/vn (satu format per file).
+        n_vertices dan n_normals adalah jumlah v dan vn yang sudah terbaca,
+        satu angka atau satu per face (lihat split_records 'seen').
+        """
+        empty = np.zeros(0, dtype=np.int32)
+        if not n:
+            return FaceList(empty, empty), FaceList(empty, empty)
+
+        # Jumlah vertex per face = jumlah token per baris
+        chars = np.frombuffer(block, dtype=np.uint8)
+        token = chars > ord(' ')
+        token_starts = np.flatnonzero(token & ~np.concatenate(([False], token[:-1])))
+        newlines = np.flatnonzero(chars == ord('\n'))
+        counts = np.bincount(np.searchsorted(newlines, token_starts),
+                             minlength=n).astype(np.int32)
+        if len(counts) != n:
+            raise ValueError("jumlah baris face tidak cocok")
+
+        # Format ditentukan dari token pertama
+        first = block.split(None, 1)[0]
+        if b'//' in first:  # v//vn
+            width, normal_column = 2, 1
+            block = block.replace(b'//', b' ')
+        else:
+            width = first.count(b'/') + 1  # v, v/vt, v/vt/vn
+            normal_column = 2 if width == 3 else None
+            block = block.replace(b'/', b' ')
+        values = np.fromstring(block, dtype=np.int64, sep=' ')
+        if width > 3 or len(values) != width * counts.sum():
+            raise ValueError("format face campuran")
+        values = values.reshape(-1, width)
+
+        # .obj memakai indeks mulai dari 1; indeks negatif relatif terhadap
+        # jumlah vertex yang sudah terbaca saat face itu muncul
+        def to_index(column, count):
+            count = np.repeat(np.broadcast_to(count, counts.shape), counts)
+            return np.where(column < 0, column + count, column - 1).astype(np.int32)
+
+        faces = FaceList(to_index(values[:, 0], n_vertices), counts)
+        if normal_column is None:
+            face_normals = FaceList(empty, np.zeros(n, dtype=np.int32))
+        else:
+            face_normals = FaceList(to_index(values[:, normal_column], n_normals), counts)
+        return faces, face_normals
+
+    @staticmethod
+    def parse_faces_lines(block, n_vertices, n_normals):
+        """Versi per baris dari parse_faces, untuk blok dengan format face campuran
+
+        n_vertices dan n_normals seperti pada parse_faces (angka atau per face).
+        """
+        indices, counts, normal_indices, normal_counts = [], [], [], []
+        for line in block.split(b'\n'):
+            parts = line.split()
+            if not parts:
+                continue
+            face = [part.split(b'/') for part in parts]
+            indices.extend(int(corner[0]) for corner in face)
+            counts.append(len(face))
+            normals = [int(corner[2]) for corner in face if len(corner) >= 3 and corner[2]]
+            normal_indices.extend(normals)
+            normal_counts.append(len(normals))
+
+        counts = np.array(counts, dtype=np.int32)
+        normal_counts = np.array(normal_counts, dtype=np.int32)
+
+        def to_index(values, count, per_face):
+            values = np.array(values, dtype=np.int64)
+            count = np.repeat(np.broadcast_to(count, per_face.shape), per_face)
+            return np.where(values < 0, values + count, values - 1).astype(np.int32)
+
+        return (FaceList(to_index(indices, n_vertices, counts), counts),
+                FaceList(to_index(normal_indices, n_normals, normal_counts), normal_counts))
+
+    @staticmethod
+    def load_obj_lines(filename):
+        """Load file .obj baris per baris (parser lama, lambat tapi toleran)"""
         vertices = []
         normals = []
         faces = []
@@ -158,12 +1131,16 @@ class OBJLoader:
                         for part in parts:
                             # Handle different .obj formats: v, v/vt, v/vt/vn, v//vn
                             indices = part.split('/')
-                            vertex_idx = int(indices[0]) - 1  # .obj uses 1-based indexing
+                            # .obj uses 1-based indexing; indeks negatif relatif
+                            # terhadap vertex yang sudah terbaca
+                            vertex_idx = int(indices[0])
+                            vertex_idx = vertex_idx + len(vertices) if vertex_idx < 0 else vertex_idx - 1
                             face.append(vertex_idx)
                             
                             # Check if normal index exists
                             if len(indices) >= 3 and indices[2]:
-                                normal_idx = int(indices[2]) - 1
+                                normal_idx = int(indices[2])
+                                normal_idx = normal_idx + len(normals) if normal_idx < 0 else normal_idx - 1
                                 face_normal_indices.append(normal_idx)
                         
                         faces.append(face)
@@ -186,65 +1163,492 @@ class OBJLoader:
             print(f"Error loading {filename}: {e}")
             return None
 
+class MeshCache:
+    """Cache biner (sidecar) untuk hasil parse file .obj
+
+    Setiap file.obj mendapat file.obj.meshcache berisi array vertices, normals
+    dan indeks face. Entry dicocokkan dengan path, ukuran, mtime dan hash isi
+    file; entry yang basi dibuat ulang otomatis. File mulai STREAM_BYTES
+    di-parse dengan OBJStreamReader supaya puncak memori tetap rendah.
+    Dengan write=False cache yang sudah ada tetap dibaca, tapi tidak ada
+    sidecar yang ditulis (misalnya untuk preview folder orang lain).
+    """
+    MAGIC = b'GKAMESH1'
+    SUFFIX = '.meshcache'
+    ALIGN = 64
+    STREAM_BYTES = 64 << 20
+    COLUMNS = ('vertices', 'normals',
+               'face_indices', 'face_counts', 'face_offsets',
+               'normal_indices', 'normal_counts', 'normal_offsets')
+
+    def __init__(self, write=True):
+        self.write = write
+
+    @staticmethod
+    def aligned(offset):
+        return -(-offset // MeshCache.ALIGN) * MeshCache.ALIGN
+
+    @staticmethod
+    def file_key(filename):
+        """Path, ukuran dan mtime file sumber"""
+        stat = os.stat(filename)
+        return {'path': os.path.abspath(filename), 'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns}
+
+    @staticmethod
+    def content_hash(filename):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(filename, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load_obj(self, filename):
+        """Load .obj lewat cache; parse ulang dan simpan cache jika perlu
+        (dan jika write)"""
+        obj_data = self.load(filename)
+        if obj_data is not None:
+            return obj_data
+        if os.path.isfile(filename) and os.path.getsize(filename) >= self.STREAM_BYTES:
+            try:
+                obj_data = OBJStreamReader(filename).read()
+            except Exception as e:
+                print(f"Error loading {filename}: {e}")
+                obj_data = None
+        else:
+            obj_data = OBJLoader.load_obj(filename)
+        if obj_data is not None and self.write:
+            try:
+                self.save(filename, obj_data)
+            except OSError as e:
+                print(f"Cache {filename} tidak bisa disimpan: {e}")
+        return obj_data
+
+    def save(self, filename, obj_data):
+        """Simpan hasil parse ke sidecar filename + SUFFIX
+
+        Layout seperti file scene MODUL A: magic, panjang header (uint32),
+        header JSON, lalu setiap kolom mentah pada offset kelipatan 64 byte.
+        """
+        faces, face_normals = obj_data['faces'], obj_data['face_normals']
+        if not isinstance(faces, FaceList):
+            faces = FaceList.from_lists(faces)
+            face_normals = FaceList.from_lists(face_normals)
+        arrays = {
+            'vertices': np.asarray(obj_data['vertices'], dtype=np.float32).reshape(-1, 3),
+            'normals': np.asarray(obj_data['normals'], dtype=np.float32).reshape(-1, 3),
+            'face_indices': faces.indices, 'face_counts': faces.counts,
+            'face_offsets': faces.offsets,
+            'normal_indices': face_normals.indices, 'normal_counts': face_normals.counts,
+            'normal_offsets': face_normals.offsets,
+        }
+        header = dict(self.file_key(filename), hash=self.content_hash(filename), columns={})
+        offset = 0
+        for name in self.COLUMNS:
+            array = np.ascontiguousarray(arrays[name], dtype=arrays[name].dtype.newbyteorder('<'))
+            arrays[name] = array
+            header['columns'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape),
+                                       'offset': offset}
+            offset = self.aligned(offset + array.nbytes)
+        header_bytes = json.dumps(header).encode('utf-8')
+        data_start = self.aligned(len(self.MAGIC) + 4 + len(header_bytes))
+
+        # Tulis ke file sementara dulu supaya cache tidak pernah setengah jadi
+        path = filename + self.SUFFIX
+        with open(path + '.tmp', 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack('<I', len(header_bytes)))
+            f.write(header_bytes)
+            for name in self.COLUMNS:
+                f.seek(data_start + header['columns'][name]['offset'])
+                f.write(arrays[name].tobytes())
+            f.truncate(data_start + offset)
+        os.replace(path + '.tmp', path)
+
+    def load(self, filename):
+        """Return obj_data dari cache, atau None jika cache tidak ada atau basi
+
+        Array dipetakan langsung dari file (read-only, tanpa copy). Jika
+        ukuran dan mtime sama, hash tidak dihitung ulang; jika hanya mtime
+        yang berubah, hash isi file menentukan apakah cache masih berlaku.
+        """
+        path = filename + self.SUFFIX
+        try:
+            key = self.file_key(filename)
+            with open(path, 'rb') as f:
+                if f.read(len(self.MAGIC)) != self.MAGIC:
+                    return None
+                header_length, = struct.unpack('<I', f.read(4))
+                header = json.loads(f.read(header_length).decode('utf-8'))
+        except (OSError, ValueError, struct.error):
+            return None
+        if header['path'] != key['path'] or header['size'] != key['size']:
+            return None
+        touched = header['mtime_ns'] != key['mtime_ns']
+        if touched and header['hash'] != self.content_hash(filename):
+            return None
+
+        data_start = self.aligned(len(self.MAGIC) + 4 + header_length)
+        buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        arrays = {}
+        for name in self.COLUMNS:
+            info = header['columns'][name]
+            dtype = np.dtype(info['dtype'])
+            start = data_start + info['offset']
+            size = int(np.prod(info['shape'])) * dtype.itemsize
+            arrays[name] = buffer[start:start + size].view(dtype).reshape(info['shape'])
+
+        obj_data = {
+            'vertices': arrays['vertices'],
+            'faces': FaceList(arrays['face_indices'], arrays['face_counts'],
+                              arrays['face_offsets']),
+            'normals': arrays['normals'],
+            'face_normals': FaceList(arrays['normal_indices'], arrays['normal_counts'],
+                                     arrays['normal_offsets'])
+        }
+        if touched:
+            # Isi file sama, hanya mtime berubah: perbarui header cache
+            try:
+                self.save(filename, obj_data)
+            except OSError:
+                pass
+        print(f"OBJ loaded dari cache: {len(obj_data['vertices'])} vertices, "
+              f"{len(obj_data['faces'])} faces")
+        return obj_data
+
+class GrowableArray:
+    """Array bertipe tetap yang bisa ditambah baris, di RAM atau di file (memmap)
+
+    Kapasitas tumbuh 1.5x. Tanpa path, array diperbesar dengan realloc jika
+    tidak ada view lain yang memakainya (sering tanpa copy); dengan path, isi
+    disimpan di file yang di-memmap sehingga hampir tidak memakai RAM.
+    """
+    def __init__(self, dtype, row_shape=(), path=None, capacity=1024):
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.path = path
+        self.count = 0
+        self.data = self.allocate(capacity)
+
+    def allocate(self, capacity):
+        shape = (capacity,) + self.row_shape
+        if self.path is None:
+            return np.empty(shape, dtype=self.dtype)
+        with open(self.path, 'ab') as f:
+            f.truncate(max(1, capacity * self.dtype.itemsize * int(np.prod(self.row_shape))))
+        return np.memmap(self.path, dtype=self.dtype, mode='r+', shape=shape)
+
+    def resize(self, capacity):
+        if self.path is None:
+            try:
+                self.data.resize((capacity,) + self.row_shape)
+                return
+            except ValueError:
+                pass  # masih ada view (misalnya snapshot preview): buat array baru
+        if self.path is not None:
+            self.data.flush()
+        old = self.data[:self.count]
+        self.data = self.allocate(capacity)
+        if self.path is None:
+            self.data[:self.count] = old
+
+    def append(self, rows):
+        end = self.count + len(rows)
+        if end > len(self.data):
+            self.resize(max(end, len(self.data) * 3 // 2))
+        self.data[self.count:end] = rows
+        self.count = end
+
+    def view(self):
+        return self.data[:self.count]
+
+    def finish(self):
+        """Potong kapasitas sisa dan return array final"""
+        self.resize(self.count)
+        return self.data
+
+class OBJStreamReader:
+    """Baca file .obj besar per chunk dengan memori terbatas
+
+    Setiap chunk (default 4 MB, dipotong di akhir baris) di-parse dengan
+    parser NumPy OBJLoader lalu ditambahkan ke GrowableArray, jadi puncak
+    memori mendekati ukuran mesh final ditambah satu chunk. Dengan
+    memmap_dir array disimpan di file di folder itu. progress(reader)
+    dipanggil setiap chunk; reader.snapshot() memberi mesh yang sudah
+    terbaca untuk preview.
+    """
+    COLUMNS = (('vertices', np.float32, (3,)), ('normals', np.float32, (3,)),
+               ('face_indices', np.int32, ()), ('face_counts', np.int32, ()),
+               ('normal_indices', np.int32, ()), ('normal_counts', np.int32, ()))
+
+    def __init__(self, filename, chunk_size=4 << 20, memmap_dir=None, progress=None):
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.total_bytes = os.path.getsize(filename)
+        self.bytes_read = 0
+        self.columns = {}
+        for name, dtype, row_shape in self.COLUMNS:
+            path = None
+            if memmap_dir is not None:
+                path = os.path.join(memmap_dir, f"{os.path.basename(filename)}.{name}.bin")
+                if os.path.exists(path):
+                    os.remove(path)
+            self.columns[name] = GrowableArray(dtype, row_shape, path)
+
+    def snapshot(self):
+        """obj_data dari bagian file yang sudah terbaca (view, tanpa copy)"""
+        c = {name: column.view() for name, column in self.columns.items()}
+        return {
+            'vertices': c['vertices'],
+            'faces': FaceList(c['face_indices'], c['face_counts']),
+            'normals': c['normals'],
+            'face_normals': FaceList(c['normal_indices'], c['normal_counts'])
+        }
+
+    def add_chunk(self, chunk):
+        records = OBJLoader.split_records(chunk)
+        # Indeks negatif relatif terhadap vertex sebelum face itu, bukan akhir chunk
+        seen_vertices, seen_normals = records['seen']
+        n_vertices = self.columns['vertices'].count + seen_vertices
+        n_normals = self.columns['normals'].count + seen_normals
+        self.columns['vertices'].append(OBJLoader.parse_vectors(*records[1]))
+        self.columns['normals'].append(OBJLoader.parse_vectors(*records[2]))
+        try:
+            faces, face_normals = OBJLoader.parse_faces(*records[3], n_vertices, n_normals)
+        except ValueError:
+            faces, face_normals = OBJLoader.parse_faces_lines(records[3][0], n_vertices, n_normals)
+        self.columns['face_indices'].append(faces.indices)
+        self.columns['face_counts'].append(faces.counts)
+        self.columns['normal_indices'].append(face_normals.indices)
+        self.columns['normal_counts'].append(face_normals.counts)
+
+    def read(self):
+        """Baca seluruh file, return obj_data seperti OBJLoader.load_obj"""
+        remainder = b''
+        with open(self.filename, 'rb') as file:
+            while True:
+                block = file.read(self.chunk_size)
+                self.bytes_read += len(block)
+                if not block:
+                    break
+                block = remainder + block
+                cut = block.rfind(b'\n') + 1  # baris terakhir mungkin belum lengkap
+                if cut:
+                    remainder = block[cut:]
+                    self.add_chunk(block[:cut])
+                else:
+                    remainder = block
+                if self.progress is not None:
+                    self.progress(self)
+            if remainder:
+                self.add_chunk(remainder)
+
+        c = {name: column.finish() for name, column in self.columns.items()}
+        print(f"OBJ loaded: {len(c['vertices'])} vertices, {len(c['face_counts'])} faces")
+        return {
+            'vertices': c['vertices'],
+            'faces': FaceList(c['face_indices'], c['face_counts']),
+            'normals': c['normals'],
+            'face_normals': FaceList(c['normal_indices'], c['normal_counts'])
+        }
+
 class OBJObject(Object3D):
-    """Object 3D yang dibuat dari file .obj"""
-    def __init__(self, obj_data):
+    """Object 3D yang dibuat dari file .obj
+
+    Array sumber disimpan di MeshSource milik MESH_REGISTRY, bukan di objek,
+    jadi model yang di-load berkali-kali hanya menyimpan satu salinan.
+    """
+    def __init__(self, obj_data, smooth=False, crease_angle=60.0, mesh=None):
         super().__init__()
-        self.vertices = obj_data['vertices']
-        self.faces = obj_data['faces']
-        self.normals = obj_data['normals']
-        self.face_normals = obj_data['face_normals']
-    
-    def calculate_normal(self, p1, p2, p3):
-        """Hitung normal dari 3 titik jika tidak ada di file"""
-        v1 = np.array(p2) - np.array(p1)
-        v2 = np.array(p3) - np.array(p1)
-        normal = np.cross(v1, v2)
-        norm = np.linalg.norm(normal)
-        if norm > 0:
-            normal = normal / norm
-        return normal
+        self.source = MESH_REGISTRY.source(obj_data['vertices'], obj_data['faces'],
+                                           obj_data['normals'], obj_data['face_normals'])
+        self.crease_angle = crease_angle
+        if mesh is None:
+            self.set_smooth(smooth)
+        else:
+            # Mesh sudah ditriangulasi (misalnya oleh ParallelOBJLoader);
+            # registry menggantinya dengan mesh yang sudah ada jika isinya sama
+            self.smooth = smooth
+            self.mesh = MESH_REGISTRY.from_source(self.source, smooth, crease_angle, mesh)
+            self.build_lods()
+
+    @property
+    def vertices(self):
+        return self.source.vertices
+
+    @property
+    def faces(self):
+        return self.source.faces
+
+    @property
+    def normals(self):
+        return self.source.normals
+
+    @property
+    def face_normals(self):
+        return self.source.face_normals
     
-    def draw(self):
-        glPushMatrix()
-        glTranslatef(self.translation_x, self.translation_y, self.translation_z)
-        glRotatef(self.rotation_x, 1, 0, 0)
-        glRotatef(self.rotation_y, 0, 1, 0)
-        glRotatef(self.rotation_z, 0, 0, 1)
-        
-        # Render faces
-        for i, face in enumerate(self.faces):
-            if len(face) == 3:  # Triangle
-                glBegin(GL_TRIANGLES)
-            elif len(face) == 4:  # Quad
-                glBegin(GL_QUADS)
-            else:  # Polygon
-                glBegin(GL_POLYGON)
-            
-            # Use normals from file if available
-            if i < len(self.face_normals) and len(self.face_normals[i]) > 0:
-                for j, vertex_idx in enumerate(face):
-                    if j < len(self.face_normals[i]):
-                        normal_idx = self.face_normals[i][j]
-                        if normal_idx < len(self.normals):
-                            glNormal3fv(self.normals[normal_idx])
-                    glVertex3fv(self.vertices[vertex_idx])
-            else:
-                # Calculate normal if not in file
-                if len(face) >= 3:
-                    p1 = self.vertices[face[0]]
-                    p2 = self.vertices[face[1]]
-                    p3 = self.vertices[face[2]]
-                    normal = self.calculate_normal(p1, p2, p3)
-                    glNormal3fv(normal)
-                
-                for vertex_idx in face:
-                    if vertex_idx < len(self.vertices):
-                        glVertex3fv(self.vertices[vertex_idx])
-            
-            glEnd()
-        
-        glPopMatrix()
+    def set_smooth(self, smooth):
+        """Pilih normal flat atau halus untuk face yang tidak punya vn di file
+
+        Mesh diambil dari MESH_REGISTRY, jadi objek lain dari obj_data yang
+        sama (dan pilihan normal yang sama) memakai mesh yang sama.
+        """
+        self.smooth = smooth
+        self.mesh = MESH_REGISTRY.from_source(self.source, smooth, self.crease_angle)
+        self.build_lods()
+
+# Kolom yang dikirim worker ParallelOBJLoader lewat shared memory
+SHARED_COLUMNS = ('vertices', 'normals', 'face_indices', 'face_counts',
+                  'normal_indices', 'normal_counts', 'mesh_data', 'mesh_indices')
+
+def load_shared_mesh(filename):
+    """Worker: parse dan triangulasi satu file .obj, hasilnya ke shared memory
+
+    Return (filename, nama shared memory, layout kolom, detik). Nama dan
+    layout None jika file gagal dibaca.
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        obj_data = MeshCache().load_obj(filename)
+    if obj_data is None:
+        return filename, None, None, time.perf_counter() - start
+    mesh = TriangleMesh.from_faces(obj_data['vertices'], obj_data['faces'],
+                                   obj_data['normals'], obj_data['face_normals'])
+    arrays = dict(zip(SHARED_COLUMNS, (
+        obj_data['vertices'], obj_data['normals'],
+        obj_data['faces'].indices, obj_data['faces'].counts,
+        obj_data['face_normals'].indices, obj_data['face_normals'].counts,
+        mesh.data, mesh.indices)))
+
+    layout = {}
+    offset = 0
+    for name in SHARED_COLUMNS:
+        array = np.ascontiguousarray(arrays[name])
+        arrays[name] = array
+        layout[name] = (array.dtype.str, array.shape, offset)
+        offset = MeshCache.aligned(offset + array.nbytes)
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for name in SHARED_COLUMNS:
+        dtype, shape, offset = layout[name]
+        np.ndarray(shape, dtype, buffer=block.buf, offset=offset)[...] = arrays[name]
+    # Block diambil alih (dan di-unlink) oleh proses utama
+    resource_tracker.unregister(block._name, 'shared_memory')
+    block.close()
+    return filename, block.name, layout, time.perf_counter() - start
+
+class SharedArray:
+    """Pemilik satu array NumPy di dalam blok shared memory
+
+    np.asarray(SharedArray(...)) menghasilkan array tanpa copy yang base-nya
+    objek ini, jadi blok tetap terpetakan selama array itu (atau view apa
+    pun darinya) masih dipakai, terlepas dari umur ParallelOBJLoader.
+    """
+    def __init__(self, block, dtype, shape, offset):
+        view = np.ndarray(shape, dtype, buffer=block.buf, offset=offset)
+        self.__array_interface__ = dict(view.__array_interface__)
+        self.block = block
+
+class ParallelOBJLoader:
+    """Load semua file .obj dalam satu folder memakai process pool
+
+    Worker mem-parse dan mentriangulasi file, array hasilnya dikirim lewat
+    shared memory. poll() mengembalikan model yang sudah selesai sehingga
+    model bisa ditambahkan ke scene satu per satu selama loading. Blok yang
+    belum di-poll hanya dilepas oleh close(), jadi panggil close() jika
+    loading dihentikan sebelum selesai.
+    """
+    def __init__(self, directory, workers=None):
+        self.files = sorted(glob.glob(os.path.join(directory, '*.obj')))
+        self.loaded = 0
+        self.start = time.perf_counter()
+        # spawn: worker tidak mewarisi window pygame / context OpenGL
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        self.filenames = {self.executor.submit(load_shared_mesh, f): f for f in self.files}
+        self.pending = set(self.filenames)
+        print(f"Loading {len(self.files)} file .obj dari {directory}")
+
+    @property
+    def finished(self):
+        return not self.pending
+
+    def attach(self, name, layout):
+        """Buat obj_data dan TriangleMesh dari shared memory
+
+        Array mesh dipakai tanpa copy dan memegang blok lewat SharedArray,
+        jadi blok baru ditutup setelah array terakhir yang memakainya dibuang.
+        """
+        block = shared_memory.SharedMemory(name=name)
+        block.unlink()  # mapping tetap ada sampai block ditutup
+        arrays = {column: np.asarray(SharedArray(block, dtype, shape, offset))
+                  for column, (dtype, shape, offset) in layout.items()}
+        # Array sumber disalin keluar: yang memegang blok hanya mesh, jadi
+        # blok dilepas jika MESH_REGISTRY sudah punya mesh dengan isi sama
+        for column in SHARED_COLUMNS[:6]:
+            arrays[column] = arrays[column].copy()
+        obj_data = {
+            'vertices': arrays['vertices'],
+            'faces': FaceList(arrays['face_indices'], arrays['face_counts']),
+            'normals': arrays['normals'],
+            'face_normals': FaceList(arrays['normal_indices'], arrays['normal_counts'])
+        }
+        return obj_data, TriangleMesh(arrays['mesh_data'], arrays['mesh_indices'])
+
+    def poll(self, block=False):
+        """Return list (filename, obj_data, mesh) model yang sudah selesai
+
+        Dengan block=True tunggu sampai minimal satu model selesai.
+        """
+        if not self.pending:
+            return []
+        done, self.pending = wait(self.pending, timeout=None if block else 0,
+                                  return_when=FIRST_COMPLETED)
+        results = []
+        for future in done:
+            self.loaded += 1
+            progress = (f"[{self.loaded}/{len(self.files)}] "
+                        f"{os.path.basename(self.filenames.pop(future))}")
+            try:
+                filename, name, layout, seconds = future.result()
+            except Exception as e:
+                # Error di worker (atau worker mati) hanya menggagalkan file ini
+                print(f"{progress}: gagal diproses ({type(e).__name__}: {e})")
+                continue
+            if name is None:
+                print(f"{progress}: gagal dibaca ({seconds:.3f} s)")
+                continue
+            obj_data, mesh = self.attach(name, layout)
+            print(f"{progress}: {len(obj_data['vertices'])} vertices, "
+                  f"{len(obj_data['faces'])} faces, {seconds:.3f} s")
+            results.append((filename, obj_data, mesh))
+        if not self.pending:
+            elapsed = time.perf_counter() - self.start
+            print(f"Selesai: {len(self.files)} file dalam {elapsed:.2f} s "
+                  f"({len(self.files) / max(elapsed, 1e-9):.1f} file/s)")
+            self.executor.shutdown()
+        return results
+
+    def close(self):
+        """Hentikan loading: file yang belum mulai dibatalkan, blok shared
+        memory dari file yang selesai tapi belum di-poll di-unlink"""
+        if not self.pending:
+            return
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        for future in self.pending:
+            if future.cancelled():
+                continue
+            try:
+                name = future.result()[1]
+            except Exception:
+                continue
+            if name is not None:
+                block = shared_memory.SharedMemory(name=name)
+                block.unlink()
+                block.close()
+        self.pending = set()
+        self.filenames.clear()
 
 class Camera:
     def __init__(self):
@@ -267,14 +1671,315 @@ class Camera:
                   self.center_x, self.center_y, self.center_z,
                   self.up_x, self.up_y, self.up_z)
     
+    def frame(self, center, radius, aspect, direction=(0.6, 0.5, 1.0)):
+        """Arahkan kamera ke bounding sphere (center, radius) dari arah
+        direction sehingga seluruh sphere terlihat; near/far disesuaikan"""
+        half = np.radians(self.fov) / 2
+        half = min(half, np.arctan(np.tan(half) * aspect))
+        radius = max(float(radius), 1e-6)
+        distance = radius / np.sin(half)
+        direction = np.asarray(direction, dtype=np.float64)
+        eye = np.asarray(center, dtype=np.float64) + direction / np.linalg.norm(direction) * distance
+        self.center_x, self.center_y, self.center_z = (float(v) for v in center)
+        self.eye_x, self.eye_y, self.eye_z = (float(v) for v in eye)
+        self.up_x, self.up_y, self.up_z = 0, 1, 0
+        self.near = float(distance - radius) * 0.9
+        self.far = float(distance + radius) * 1.1
+    
     def move(self, dx, dy, dz):
         self.eye_x += dx
         self.eye_y += dy
         self.eye_z += dz
+    
+    def view_basis(self):
+        """(eye, forward, side, up) seperti yang dihitung gluLookAt"""
+        eye = np.array([self.eye_x, self.eye_y, self.eye_z], dtype=np.float64)
+        forward = np.array([self.center_x, self.center_y, self.center_z]) - eye
+        forward /= np.linalg.norm(forward)
+        side = np.cross(forward, [self.up_x, self.up_y, self.up_z])
+        side /= np.linalg.norm(side)
+        up = np.cross(side, forward)
+        return eye, forward, side, up
+
+    def view_matrix(self):
+        """Matriks 4x4 dunia -> mata, sama dengan gluLookAt"""
+        eye, forward, side, up = self.view_basis()
+        matrix = np.eye(4)
+        matrix[:3, :3] = side, up, -forward
+        matrix[:3, 3] = -matrix[:3, :3] @ eye
+        return matrix
+
+    def projection_matrix(self, aspect):
+        """Matriks 4x4 mata -> clip, sama dengan gluPerspective"""
+        f = 1.0 / np.tan(np.radians(self.fov) / 2)
+        near, far = self.near, self.far
+        return np.array([
+            [f / aspect, 0, 0, 0],
+            [0, f, 0, 0],
+            [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+            [0, 0, -1, 0],
+        ])
+
+    def frustum_planes(self, aspect):
+        """6 bidang view frustum di koordinat dunia sebagai array (6, 4)
+
+        Setiap baris (nx, ny, nz, d) dengan normal satuan menghadap ke dalam:
+        titik x di dalam frustum jika n . x + d >= 0 untuk semua bidang.
+        Sama dengan gluPerspective(fov, aspect, near, far) + gluLookAt.
+        """
+        eye, forward, side, up = self.view_basis()
+        tan_v = np.tan(np.radians(self.fov) / 2)
+        tan_h = tan_v * aspect
+        normals = np.array([
+            forward,                      # near
+            -forward,                     # far
+            tan_h * forward + side,       # kiri
+            tan_h * forward - side,       # kanan
+            tan_v * forward + up,         # bawah
+            tan_v * forward - up,         # atas
+        ])
+        normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+        offsets = -normals @ eye
+        offsets[0] -= self.near
+        offsets[1] += self.far
+        return np.column_stack((normals, offsets))
+
+class SceneBVH:
+    """Bounding volume hierarchy dari bounding box objek di dunia
+
+    Node disimpan dalam array: left/right (-1 untuk leaf), start/count
+    (rentang di order) dan depth. order berisi indeks objek sehingga objek di
+    bawah satu node selalu berurutan. Refit dan query diproses per level
+    kedalaman secara vectorized.
+    """
+    LEAF_SIZE = 8
+
+    def __init__(self, lows, highs):
+        self.order = np.arange(len(lows))
+        centers = (lows + highs) / 2
+        nodes = []
+        if len(lows):
+            # Tanpa objek tidak ada node sama sekali, juga tidak ada root
+            self.build(nodes, centers, 0, len(lows), 0)
+        self.left, self.right, self.start, self.count, self.depth = (
+            np.array(column, dtype=np.int64).reshape(-1) for column in zip(*nodes)) \
+            if nodes else (np.zeros(0, dtype=np.int64),) * 5
+        self.refit(lows, highs)
+
+    def build(self, nodes, centers, start, stop, depth):
+        """Bagi order[start:stop] di median sumbu terpanjang, return indeks node"""
+        index = len(nodes)
+        nodes.append([-1, -1, start, stop - start, depth])
+        if stop - start <= self.LEAF_SIZE:
+            return index
+        members = self.order[start:stop]
+        points = centers[members]
+        axis = np.argmax(points.max(axis=0) - points.min(axis=0))
+        middle = (stop - start) // 2
+        self.order[start:stop] = members[np.argpartition(points[:, axis], middle)]
+        nodes[index][0] = self.build(nodes, centers, start, start + middle, depth + 1)
+        nodes[index][1] = self.build(nodes, centers, start + middle, stop, depth + 1)
+        return index
+
+    def refit(self, lows, highs):
+        """Perbarui bounding box node setelah objek bergerak (struktur tetap)"""
+        self.lows, self.highs = lows, highs
+        self.node_low = np.empty((len(self.left), 3))
+        self.node_high = np.empty((len(self.left), 3))
+        leaves = self.left < 0
+        if leaves.any():
+            starts = self.start[leaves]
+            self.node_low[leaves] = np.minimum.reduceat(lows[self.order], starts)
+            self.node_high[leaves] = np.maximum.reduceat(highs[self.order], starts)
+        # Dari level terdalam ke root: box node = gabungan box kedua anaknya
+        for depth in range(int(self.depth.max(initial=0)), -1, -1):
+            nodes = np.flatnonzero((self.depth == depth) & ~leaves)
+            a, b = self.left[nodes], self.right[nodes]
+            self.node_low[nodes] = np.minimum(self.node_low[a], self.node_low[b])
+            self.node_high[nodes] = np.maximum(self.node_high[a], self.node_high[b])
+
+    def query_frustum(self, planes, stats):
+        """Return (inside, partial): indeks objek di node yang seluruhnya di dalam
+        frustum, dan objek di leaf yang terpotong frustum (perlu dites sendiri)
+
+        Node yang seluruhnya di luar salah satu bidang dibuang bersama semua
+        objek di bawahnya.
+        """
+        if not len(self.left):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        normals, offsets = planes[:, :3], planes[:, 3]
+        inside, partial = [], []
+        frontier = np.zeros(1, dtype=np.int64)
+        while len(frontier):
+            stats['nodes'] += len(frontier)
+            center = (self.node_low[frontier] + self.node_high[frontier]) / 2
+            extent = (self.node_high[frontier] - self.node_low[frontier]) / 2
+            distance = center @ normals.T + offsets
+            reach = extent @ np.abs(normals).T
+            outside = np.any(distance < -reach, axis=1)
+            contained = np.all(distance >= reach, axis=1)
+            leaf = self.left[frontier] < 0
+            inside.append(frontier[contained])
+            partial.append(frontier[~outside & ~contained & leaf])
+            split = frontier[~outside & ~contained & ~leaf]
+            frontier = np.concatenate((self.left[split], self.right[split]))
+        return self.objects_of(np.concatenate(inside)), self.objects_of(np.concatenate(partial))
+
+    def objects_of(self, nodes):
+        """Indeks semua objek di bawah node-node ini"""
+        counts = self.count[nodes]
+        if not counts.sum():
+            return np.zeros(0, dtype=np.int64)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self.order[np.repeat(self.start[nodes], counts) + offsets]
+
+class Scene:
+    """Kumpulan Object3D yang digambar sekaligus dengan frustum culling
+
+    cull_stats menghitung per frame: node BVH yang dites, objek yang dites
+    satu per satu, objek yang di-cull dan objek yang digambar. Model matrix
+    semua objek disimpan dalam satu array (N, 4, 4); objek tanpa LOD yang
+    memakai mesh yang sama (minimal INSTANCE_MIN objek) digambar sebagai
+    satu InstancedMesh.
+    """
+    INSTANCE_MIN = 4
+
+    def __init__(self, objects=()):
+        self.objects = list(objects)
+        self.bvh = None
+        self.bvh_objects = None
+        self.versions = None
+        self.known = (None, None)
+        self.instances = {}  # id(mesh) -> InstancedMesh
+        self.cull_stats = {'nodes': 0, 'tested': 0, 'culled': 0, 'drawn': 0}
+
+    def update(self):
+        """Perbarui bounds dunia objek yang bergerak; BVH di-refit, atau
+        dibangun ulang jika daftar objek berubah"""
+        if self.bvh is not None and self.known == (Object3D.transform_clock, self.objects):
+            return
+        self.known = (Object3D.transform_clock, list(self.objects))
+        drawable = [obj for obj in self.objects if obj.mesh is not None]
+        versions = np.array([obj.transform_version for obj in drawable], dtype=np.int64)
+        if self.bvh is not None and self.bvh_objects == drawable:
+            moved = np.flatnonzero(versions != self.versions)
+            if not len(moved):
+                return
+        else:
+            moved = np.arange(len(drawable))
+            self.lows = np.zeros((len(drawable), 3))
+            self.highs = np.zeros((len(drawable), 3))
+            self.centers = np.zeros((len(drawable), 3))
+            self.radii = np.zeros(len(drawable))
+            self.matrices = np.zeros((len(drawable), 4, 4))
+        # Sama dengan Object3D.world_bounds, untuk semua objek yang bergerak sekaligus
+        objects = [drawable[i] for i in moved]
+        matrices = Object3D.model_matrices(objects)
+        self.matrices[moved] = matrices
+        boxes = np.array([(*o.mesh.low, *o.mesh.high) for o in objects]).reshape(-1, 6)
+        rotations = matrices[:, :3, :3]
+        centers = matrices[:, :3, 3] + np.einsum('nij,nj->ni', rotations,
+                                                 (boxes[:, :3] + boxes[:, 3:]) / 2)
+        extents = np.einsum('nij,nj->ni', np.abs(rotations), (boxes[:, 3:] - boxes[:, :3]) / 2)
+        self.lows[moved], self.highs[moved] = centers - extents, centers + extents
+        self.centers[moved] = centers
+        self.radii[moved] = [o.mesh.radius for o in objects]
+        self.versions = versions
+        if self.bvh is None or self.bvh_objects != drawable:
+            self.bvh = SceneBVH(self.lows, self.highs)
+            self.bvh_objects = drawable
+        else:
+            self.bvh.refit(self.lows, self.highs)
+
+    def visible_objects(self, camera, aspect):
+        """Objek yang (mungkin) terlihat kamera, cull_stats diperbarui"""
+        return [self.bvh_objects[i] for i in self.visible_indices(camera, aspect)]
+
+    def visible_indices(self, camera, aspect):
+        """Indeks (ke bvh_objects) objek yang (mungkin) terlihat kamera"""
+        self.update()
+        for key in self.cull_stats:
+            self.cull_stats[key] = 0
+        planes = camera.frustum_planes(aspect)
+        inside, partial = self.bvh.query_frustum(planes, self.cull_stats)
+        # Tes bounding sphere objek di leaf yang terpotong frustum
+        distance = self.centers[partial] @ planes[:, :3].T + planes[:, 3]
+        partial = partial[np.all(distance >= -self.radii[partial, None], axis=1)]
+        visible = np.sort(np.concatenate((inside, partial)))
+        self.cull_stats['tested'] = len(distance)
+        self.cull_stats['drawn'] = len(visible)
+        self.cull_stats['culled'] = len(self.bvh_objects) - len(visible)
+        return visible
+
+    def draw(self, camera, width, height, use_lod=True, lighting=None):
+        """Gambar objek yang terlihat
+
+        Dengan lighting, objek digambar dengan warna lighting yang di-bake
+        (Object3D.draw_baked); GL_LIGHTING harus dimatikan oleh pemanggil.
+        """
+        visible = self.visible_indices(camera, width / height)
+        view = camera.view_matrix() if lighting is not None else None
+        groups = {}
+        for i in visible:
+            obj = self.bvh_objects[i]
+            if use_lod and len(obj.lods) > 1:
+                if lighting is not None:
+                    obj.draw_baked(lighting, view, camera, height)
+                else:
+                    obj.draw(camera, height)
+            else:
+                groups.setdefault(id(obj.mesh), (obj.mesh, []))[1].append(i)
+        used = {}
+        for key, (mesh, members) in groups.items():
+            if len(members) < self.INSTANCE_MIN:
+                for i in members:
+                    if lighting is not None:
+                        self.bvh_objects[i].draw_baked(lighting, view)
+                    else:
+                        self.bvh_objects[i].draw()
+                continue
+            batch = self.instances.get(key)
+            if batch is None or batch.mesh is not mesh:
+                batch = InstancedMesh(mesh)
+            members = np.array(members)
+            # Batch hanya dibangun ulang jika anggotanya sendiri bergerak; BVH
+            # ikut di key karena indeks berganti arti saat daftar objek berubah
+            batch.update(self.matrices[members],
+                         (self.bvh, members.tobytes(), self.versions[members].tobytes()))
+            if lighting is not None:
+                # Vertex batch sudah di koordinat dunia, jadi modelview = view
+                batch.baked.update(batch.data, view, lighting, batch.key)
+                batch.draw(batch.baked.buffer)
+            else:
+                batch.draw()
+            used[key] = batch
+        # VBO batch yang tidak terpakai frame ini dilepas
+        for key, batch in self.instances.items():
+            if used.get(key) is not batch:
+                batch.release()
+        self.instances = used
 
 class Lighting:
-    def __init__(self):
-        self.setup_lighting()
+    """Parameter GL_LIGHT0 dan material
+
+    Nilainya disimpan sebagai atribut supaya backend software memakai
+    parameter yang sama; dengan apply=False OpenGL tidak dipanggil sama sekali.
+    """
+    def __init__(self, apply=True):
+        # Light (position diset saat modelview identitas, jadi di koordinat mata)
+        self.scene_ambient = [0.2, 0.2, 0.2, 1.0]  # default GL_LIGHT_MODEL_AMBIENT
+        self.ambient = [0.2, 0.2, 0.2, 1.0]
+        self.diffuse = [0.8, 0.8, 0.8, 1.0]
+        self.specular = [1.0, 1.0, 1.0, 1.0]
+        self.position = [2.0, 2.0, 2.0, 1.0]
+        
+        # Material properties
+        self.mat_ambient = [0.3, 0.3, 0.3, 1.0]
+        self.mat_diffuse = [0.7, 0.1, 0.1, 1.0]
+        self.mat_specular = [1.0, 1.0, 1.0, 1.0]
+        self.mat_shininess = [50.0]
+        if apply:
+            self.setup_lighting()
     
     def setup_lighting(self):
         # Enable lighting
@@ -282,33 +1987,508 @@ class Lighting:
         glEnable(GL_LIGHT0)
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_NORMALIZE)
+        glLightModelfv(GL_LIGHT_MODEL_AMBIENT, self.scene_ambient)
         
-        # Ambient light
-        ambient = [0.2, 0.2, 0.2, 1.0]
-        glLightfv(GL_LIGHT0, GL_AMBIENT, ambient)
-        
-        # Diffuse light
-        diffuse = [0.8, 0.8, 0.8, 1.0]
-        glLightfv(GL_LIGHT0, GL_DIFFUSE, diffuse)
-        
-        # Specular light
-        specular = [1.0, 1.0, 1.0, 1.0]
-        glLightfv(GL_LIGHT0, GL_SPECULAR, specular)
+        # Ambient, diffuse dan specular light
+        glLightfv(GL_LIGHT0, GL_AMBIENT, self.ambient)
+        glLightfv(GL_LIGHT0, GL_DIFFUSE, self.diffuse)
+        glLightfv(GL_LIGHT0, GL_SPECULAR, self.specular)
         
         # Light position
-        position = [2.0, 2.0, 2.0, 1.0]
-        glLightfv(GL_LIGHT0, GL_POSITION, position)
+        glLightfv(GL_LIGHT0, GL_POSITION, self.position)
         
         # Material properties
-        mat_ambient = [0.3, 0.3, 0.3, 1.0]
-        mat_diffuse = [0.7, 0.1, 0.1, 1.0]
-        mat_specular = [1.0, 1.0, 1.0, 1.0]
-        mat_shininess = [50.0]
-        
-        glMaterialfv(GL_FRONT, GL_AMBIENT, mat_ambient)
-        glMaterialfv(GL_FRONT, GL_DIFFUSE, mat_diffuse)
-        glMaterialfv(GL_FRONT, GL_SPECULAR, mat_specular)
-        glMaterialfv(GL_FRONT, GL_SHININESS, mat_shininess)
+        glMaterialfv(GL_FRONT, GL_AMBIENT, self.mat_ambient)
+        glMaterialfv(GL_FRONT, GL_DIFFUSE, self.mat_diffuse)
+        glMaterialfv(GL_FRONT, GL_SPECULAR, self.mat_specular)
+        glMaterialfv(GL_FRONT, GL_SHININESS, self.mat_shininess)
+    
+    def state(self):
+        """Semua parameter light dan material, untuk mendeteksi perubahan lighting"""
+        return tuple(tuple(values) for values in (
+            self.scene_ambient, self.ambient, self.diffuse, self.specular, self.position,
+            self.mat_ambient, self.mat_diffuse, self.mat_specular, self.mat_shininess))
+
+    def shade_mesh(self, data, modelview):
+        """shade untuk data mesh (nx ny nz x y z) yang digambar dengan modelview"""
+        positions = data[:, 3:].astype(np.float64) @ modelview[:3, :3].T + modelview[:3, 3]
+        # Normal ditransform dengan invers-transpose modelview
+        normals = data[:, :3].astype(np.float64) @ np.linalg.inv(modelview[:3, :3])
+        return self.shade(positions, normals)
+
+    def bake(self, data, modelview):
+        """Warna RGBA uint8 per vertex dari shade_mesh
+
+        Hasil lighting Phong fixed-function (diinterpolasi Gouraud saat
+        rasterisasi) untuk dipakai sebagai color array dengan GL_LIGHTING mati.
+        """
+        colors = np.empty((len(data), 4), dtype=np.uint8)
+        colors[:, :3] = np.rint(self.shade_mesh(data, modelview) * 255)
+        colors[:, 3] = np.rint(np.clip(self.mat_diffuse[3], 0.0, 1.0) * 255)
+        return colors
+
+    def shade(self, positions, normals):
+        """Warna RGB (N, 3) per vertex, rumus lighting fixed-function OpenGL
+
+        positions dan normals di koordinat mata. Normal dinormalisasi seperti
+        GL_NORMALIZE; viewer di tak hingga (tanpa GL_LIGHT_MODEL_LOCAL_VIEWER)
+        dan tanpa atenuasi, sama dengan state default OpenGL.
+        """
+        unit = lambda v: v / np.maximum(np.sqrt(np.einsum('ij,ij->i', v, v)), 1e-12)[:, None]
+        normals = unit(normals)
+        if self.position[3]:
+            light = unit(np.asarray(self.position[:3]) - positions)
+        else:
+            light = unit(np.tile(np.asarray(self.position[:3], dtype=np.float64), (len(positions), 1)))
+        half = unit(light + [0.0, 0.0, 1.0])
+        n_dot_l = np.einsum('ij,ij->i', normals, light)
+        n_dot_h = np.maximum(np.einsum('ij,ij->i', normals, half), 0.0)
+        specular = np.where(n_dot_l > 0, n_dot_h ** self.mat_shininess[0], 0.0)
+        rgb = lambda values: np.asarray(values[:3], dtype=np.float64)
+        color = (rgb(self.scene_ambient) + rgb(self.ambient)) * rgb(self.mat_ambient) \
+            + np.maximum(n_dot_l, 0.0)[:, None] * (rgb(self.diffuse) * rgb(self.mat_diffuse)) \
+            + specular[:, None] * (rgb(self.specular) * rgb(self.mat_specular))
+        return np.clip(color, 0.0, 1.0)
+
+class SoftwareRenderer:
+    """Rasterizer NumPy untuk render tanpa GPU dan tanpa display
+
+    Menggambar Object3D dengan Camera dan Lighting yang sama seperti jalur
+    OpenGL ke framebuffer color (H, W, 3) uint8 dan depth (H, W) float32,
+    baris 0 di atas. Lighting dihitung per vertex lalu diinterpolasi
+    perspective-correct (Gouraud, seperti GL_SMOOTH); depth test GL_LESS,
+    tanpa back-face culling. Segitiga diproses per batch secara vectorized:
+    setiap segitiga diperluas menjadi baris pixel (paling banyak CHUNK baris
+    per batch), setiap baris menjadi pixel di antara ketiga sisinya, lalu
+    pemenang depth per pixel dipilih dengan satu argsort. Warna baru
+    dihitung di resolve(), sekali untuk setiap pixel yang tertutup.
+    Warna vertex (Lighting.shade_mesh) disimpan dari frame sebelumnya, jadi
+    objek yang tidak bergerak tidak di-shade ulang.
+    """
+    CHUNK = 1 << 19  # baris (segitiga x baris pixel) per batch
+
+    def __init__(self, width, height, lighting=None, clear_color=(0.1, 0.1, 0.15)):
+        self.width, self.height = width, height
+        self.lighting = lighting if lighting is not None else Lighting(apply=False)
+        clear_color = np.round(np.asarray(clear_color) * 255).astype(np.uint8)
+        self.background = np.tile(clear_color, (width * height, 1))
+        self.stats = {'triangles': 0, 'fragments': 0, 'pixels': 0, 'bakes': 0}
+        self.baked = {}  # (id mesh, modelview, lighting) -> (mesh, warna RGB)
+        self.clear()
+
+    def clear(self):
+        pixels = self.width * self.height
+        self.depth = np.ones(pixels, dtype=np.float32)
+        self.triangle = np.full(pixels, -1, dtype=np.int64)  # pemenang depth per pixel
+        # Per segitiga (kolom): koefisien barycentric a, b, c, 1/w dan warna
+        # ketiga sudut, masing-masing 3 baris
+        self.setups = []
+        self.corner_colors = []
+        self.triangle_total = 0
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def render(self, objects, camera, use_lod=False):
+        """Gambar objects dan return framebuffer color (H, W, 3) uint8"""
+        self.clear()
+        view = camera.view_matrix()
+        projection = camera.projection_matrix(self.width / self.height)
+        # Hanya warna yang dipakai frame ini yang disimpan untuk frame berikutnya
+        previous, self.baked = self.baked, {}
+        lighting_state = self.lighting.state()
+        for obj in objects:
+            mesh = obj.lod_mesh(camera, self.height) if use_lod else obj.mesh
+            if mesh is None or not mesh.indices.size:
+                continue
+            modelview = view @ obj.model_matrix()
+            key = (id(mesh), modelview.tobytes(), lighting_state)
+            baked = previous.get(key) or self.baked.get(key)
+            if baked is None:
+                baked = (mesh, self.lighting.shade_mesh(mesh.data, modelview))
+                self.stats['bakes'] += 1
+            self.baked[key] = baked
+            self.draw_mesh(mesh, modelview, projection, baked[1])
+        return self.resolve()
+
+    def draw_mesh(self, mesh, modelview, projection, colors=None):
+        """Transform dan lighting per vertex, lalu rasterize semua segitiga mesh
+
+        colors adalah warna vertex yang sudah di-bake (Lighting.shade_mesh);
+        tanpa colors lighting dihitung di sini.
+        """
+        positions = mesh.data[:, 3:].astype(np.float64) @ modelview[:3, :3].T + modelview[:3, 3]
+        if colors is None:
+            colors = self.lighting.shade_mesh(mesh.data, modelview)
+        TriangleMesh.draw_calls += 1
+        TriangleMesh.vertices_drawn += mesh.indices.size
+        clip = positions @ projection[:, :3].T + projection[:, 3]
+        # Hanya segitiga yang memotong bidang near yang perlu dipotong
+        front = (clip[:, 2] + clip[:, 3] >= 0)[mesh.indices.T].sum(axis=0)
+        self.rasterize(clip, colors, mesh.indices[front == 3])
+        crossing = mesh.indices[(front > 0) & (front < 3)]
+        if len(crossing):
+            corners = self.clip_near(np.column_stack((clip, colors))[crossing])
+            self.rasterize(corners[..., :4].reshape(-1, 4), corners[..., 4:].reshape(-1, 3),
+                           np.arange(corners.shape[0] * 3).reshape(-1, 3))
+
+    @staticmethod
+    def clip_near(corners):
+        """Potong segitiga (T, 3, K) dengan bidang near (z + w >= 0 di clip space)
+
+        Atribut di belakang indeks 4 (warna) ikut diinterpolasi. Segitiga
+        dengan satu vertex di dalam tetap satu segitiga, dengan dua vertex
+        di dalam menjadi dua; urutan vertex (winding) dipertahankan.
+        """
+        distance = corners[..., 2] + corners[..., 3]
+        inside = distance >= 0
+        n_inside = inside.sum(axis=1)
+        parts = [corners[n_inside == 3]]
+        for n in (1, 2):
+            selected = n_inside == n
+            if not selected.any():
+                continue
+            # Putar vertex sehingga vertex yang "sendirian" ada di indeks 0
+            lone = np.argmax(inside[selected] if n == 1 else ~inside[selected], axis=1)
+            order = (lone[:, None] + np.arange(3)) % 3
+            tris = np.take_along_axis(corners[selected], order[:, :, None], axis=1)
+            d = np.take_along_axis(distance[selected], order, axis=1)
+            a, b, c = tris[:, 0], tris[:, 1], tris[:, 2]
+            ab = a + (b - a) * (d[:, :1] / (d[:, :1] - d[:, 1:2]))
+            ac = a + (c - a) * (d[:, :1] / (d[:, :1] - d[:, 2:3]))
+            if n == 1:
+                parts.append(np.stack((a, ab, ac), axis=1))
+            else:
+                parts.append(np.stack((ab, b, c), axis=1))
+                parts.append(np.stack((ab, c, ac), axis=1))
+        return np.concatenate(parts)
+
+    def rasterize(self, clip, colors, triangles):
+        """Depth test segitiga (indeks ke vertex clip space (N, 4) + warna (N, 3))"""
+        width, height = self.width, self.height
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inv_w = 1.0 / clip[:, 3]
+        x = (clip[:, 0] * inv_w + 1) * (width / 2)
+        y = (1 - clip[:, 1] * inv_w) * (height / 2)
+        z = (clip[:, 2] * inv_w + 1) / 2
+        # Array per sudut berbentuk (3, T) supaya reduksi antar sudut cepat
+        corners = np.ascontiguousarray(triangles.T)
+        tx, ty = x[corners], y[corners]
+        area = (tx[1] - tx[0]) * (ty[2] - ty[0]) - (tx[2] - tx[0]) * (ty[1] - ty[0])
+        # Baris pixel yang pusatnya (i + 0.5) ada di dalam bounding box segitiga;
+        # segitiga kecil yang tidak mengenai pusat pixel mana pun dibuang di sini
+        y_lo = np.clip(np.ceil(ty.min(axis=0) - 0.5), 0, height)
+        y_hi = np.clip(np.floor(ty.max(axis=0) - 0.5), -1, height - 1)
+        x_lo = np.clip(np.ceil(tx.min(axis=0) - 0.5), 0, width)
+        x_hi = np.clip(np.floor(tx.max(axis=0) - 0.5), -1, width - 1)
+        keep = (np.abs(area) > 1e-12) & (y_hi >= y_lo) & (x_hi >= x_lo)
+        keep &= z[corners].min(axis=0) < 1
+        if not keep.any():
+            return
+        corners, tx, ty, area = corners[:, keep], tx[:, keep], ty[:, keep], area[keep]
+        x_lo, x_hi = x_lo[keep].astype(np.int64), x_hi[keep].astype(np.int64)
+        y_lo, rows = y_lo[keep].astype(np.int64), (y_hi - y_lo)[keep].astype(np.int64) + 1
+        first_id = self.triangle_total
+        self.triangle_total += len(area)
+        self.stats['triangles'] += len(area)
+
+        # Barycentric sebagai fungsi linear pixel: l_i = a_i * px + b_i * py + c_i,
+        # dengan sisi di depan vertex i (j, k) = (i + 1, i + 2); depth juga
+        # linear di layar: z = dz_dx * px + dz_dy * py + z0
+        xj, yj = np.roll(tx, -1, axis=0), np.roll(ty, -1, axis=0)
+        xk, yk = np.roll(tx, -2, axis=0), np.roll(ty, -2, axis=0)
+        a = (yj - yk) / area
+        b = (xk - xj) / area
+        c = ((yk - yj) * xj - (xk - xj) * yj) / area
+        tz = z[corners]
+        plane = [(coef * tz).sum(axis=0) for coef in (a, b, c)]
+        self.setups.append(np.concatenate((a, b, c, inv_w[corners])))
+        self.corner_colors.append(colors[corners].transpose(0, 2, 1).reshape(9, -1))
+
+        row_ends = np.cumsum(rows)
+        chunk = max(self.CHUNK, height)
+        start = 0
+        while start < len(rows):
+            done = row_ends[start - 1] if start else 0
+            stop = max(int(np.searchsorted(row_ends, done + chunk, side='right')), start + 1)
+            part = slice(start, stop)
+            # Satu entri per (segitiga, baris): rentang x di dalam ketiga sisi
+            owner = np.repeat(np.arange(start, stop), rows[part])
+            py = y_lo[owner] + np.arange(len(owner)) - np.repeat(row_ends[part] - rows[part] - done, rows[part])
+            start = stop
+            center_y = py + 0.5
+            px_lo, px_hi = x_lo[owner].astype(np.float64), x_hi[owner].astype(np.float64)
+            for i in range(3):
+                slope, edge = a[i][owner], b[i][owner] * center_y + c[i][owner]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    bound = -edge / slope - 0.5
+                px_lo = np.maximum(px_lo, np.where(slope > 0, np.ceil(bound - 1e-7), -np.inf))
+                px_hi = np.minimum(px_hi, np.where(slope < 0, np.floor(bound + 1e-7), np.inf))
+                # Sisi horizontal: seluruh baris di dalam atau di luar sisi itu
+                px_hi[(slope == 0) & (edge < 0)] = -1
+            span = np.maximum(px_hi - px_lo + 1, 0).astype(np.int64)
+
+            # Satu entri per pixel di dalam segitiga
+            span_ends = np.cumsum(span)
+            owner, py = np.repeat(owner, span), np.repeat(py, span)
+            px = np.repeat(px_lo.astype(np.int64), span) + np.arange(len(owner)) \
+                - np.repeat(span_ends - span, span)
+            self.stats['fragments'] += len(owner)
+            depth = plane[0][owner] * (px + 0.5) + plane[1][owner] * (py + 0.5) + plane[2][owner]
+            pixel = py * width + px
+            closer = depth < self.depth[pixel]
+            owner, pixel, depth = owner[closer], pixel[closer], depth[closer]
+            if not len(pixel):
+                continue
+            # Fragment terdekat per pixel: satu sort dengan kunci pixel (32 bit
+            # atas) dan depth yang dikuantisasi (32 bit bawah)
+            key = (pixel.astype(np.uint64) << np.uint64(32)) \
+                | (np.clip(depth, 0, 1) * 0xFFFFFFFF).astype(np.uint64)
+            order = np.argsort(key)
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = pixel[order[1:]] != pixel[order[:-1]]
+            winners = order[first]
+            pixel = pixel[winners]
+            self.depth[pixel] = depth[winners]
+            self.triangle[pixel] = first_id + owner[winners]
+
+    def resolve(self):
+        """Warna pixel yang tertutup segitiga: interpolasi perspective-correct
+        warna vertex segitiga pemenang depth test"""
+        image = self.background.copy()
+        covered = np.flatnonzero(self.triangle >= 0)
+        self.stats['pixels'] = len(covered)
+        if len(covered):
+            triangle = self.triangle[covered]
+            setup = np.concatenate(self.setups, axis=1)[:, triangle]
+            colors = np.concatenate(self.corner_colors, axis=1)[:, triangle]
+            cx = covered % self.width + 0.5
+            cy = covered // self.width + 0.5
+            weights = [(setup[i] * cx + setup[3 + i] * cy + setup[6 + i]) * setup[9 + i]
+                       for i in range(3)]
+            total = weights[0] + weights[1] + weights[2]
+            rgb = sum(colors[3 * i:3 * i + 3] * (weights[i] / total) for i in range(3))
+            image[covered] = (np.clip(rgb.T, 0, 1) * 255 + 0.5).astype(np.uint8)
+        return image.reshape(self.height, self.width, 3)
+
+    @property
+    def depth_buffer(self):
+        """Depth (H, W) float32 di [0, 1] seperti GL_DEPTH_COMPONENT (baris 0 di atas)"""
+        return self.depth.reshape(self.height, self.width)
+
+def write_png(filename, image):
+    """Simpan image (H, W, 3) uint8 sebagai PNG RGB 8 bit (zlib + struct)"""
+    height, width, _ = image.shape
+    # Setiap baris diawali byte filter 0 (None)
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, -1)
+    
+    def chunk(tag, data):
+        return (struct.pack('>I', len(data)) + tag + data
+                + struct.pack('>I', zlib.crc32(tag + data) & 0xFFFFFFFF))
+    
+    with open(filename, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b'IEND', b''))
+
+def render_thumbnail(filename, output_dir, size=256):
+    """Worker: render satu file .obj dengan SoftwareRenderer ke PNG
+
+    Kamera diarahkan otomatis ke bounding sphere model. Cache yang sudah ada
+    dipakai, tapi folder input tidak ditulisi sidecar baru. Return (filename,
+    path PNG atau None jika file gagal dibaca, jumlah segitiga, detik).
+    """
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        obj_data = MeshCache(write=False).load_obj(filename)
+    if obj_data is None:
+        return filename, None, 0, time.perf_counter() - start
+    obj = Object3D()
+    obj.mesh = TriangleMesh.from_faces(obj_data['vertices'], obj_data['faces'],
+                                       obj_data['normals'], obj_data['face_normals'])
+    _, _, center, radius = obj.world_bounds()
+    camera = Camera()
+    camera.frame(center, radius, 1.0)
+    image = SoftwareRenderer(size, size).render([obj], camera)
+    name = os.path.splitext(os.path.basename(filename))[0] + '.png'
+    path = os.path.join(output_dir, name)
+    write_png(path, image)
+    return filename, path, obj.mesh.triangle_count, time.perf_counter() - start
+
+def render_thumbnails(directory, output_dir, size=256, workers=None):
+    """Render PNG untuk semua file .obj dalam satu folder, tanpa window
+
+    File dibagi ke process pool (default satu worker per core).
+    """
+    files = sorted(glob.glob(os.path.join(directory, '*.obj')))
+    os.makedirs(output_dir, exist_ok=True)
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')  # diwarisi worker
+    print(f"Render {len(files)} file .obj dari {directory} ke {output_dir}")
+    start = time.perf_counter()
+    rendered = 0
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = {executor.submit(render_thumbnail, f, output_dir, size): f for f in files}
+        for done, future in enumerate(as_completed(futures), 1):
+            progress = f"[{done}/{len(files)}] {os.path.basename(futures[future])}"
+            try:
+                filename, path, triangles, seconds = future.result()
+            except Exception as e:
+                # Error di worker hanya menggagalkan file ini
+                print(f"{progress}: gagal di-render ({type(e).__name__}: {e})")
+                continue
+            if path is None:
+                print(f"{progress}: gagal dibaca ({seconds:.3f} s)")
+                continue
+            rendered += 1
+            print(f"{progress}: {triangles} segitiga -> {path} ({seconds:.3f} s)")
+    elapsed = time.perf_counter() - start
+    print(f"Selesai: {rendered} model dalam {elapsed:.2f} s "
+          f"({rendered / max(elapsed, 1e-9):.1f} model/s)")
+    return rendered
+
+class FrameProfiler:
+    """Waktu setiap fase loop Graphics3D.run, tanpa profiler eksternal
+
+    Setiap frame mencatat durasi fase (handle_events, setup_view, draw, flip,
+    dan load / update / overlay / tick), waktu frame total, serta jumlah draw call
+    dan vertex yang dikirim (TriangleMesh.draw_calls dan vertices_drawn).
+    Riwayat window frame terakhir disimpan di ring buffer, jadi p50/p95/p99
+    selalu dari frame terbaru. Perintah OpenGL asinkron: 'draw' mengukur
+    waktu CPU untuk mengirim perintah, tunggu GPU biasanya masuk ke 'flip'.
+
+    mode 'overlay' menampilkan ringkasan di layar, 'log' mencetaknya ke
+    stdout setiap log_interval frame (cocok untuk headless), 'off' hanya
+    merekam. export() menyimpan riwayat ke .json atau .csv.
+    """
+    PHASES = ('load', 'handle_events', 'update', 'setup_view', 'draw', 'overlay', 'flip', 'tick')
+    COUNTERS = ('draw_calls', 'vertices')
+    MODES = ('off', 'overlay', 'log')
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, mode='off', window=600, log_interval=120):
+        self.mode = mode
+        self.log_interval = log_interval
+        self.columns = ('frame',) + self.PHASES + self.COUNTERS
+        self.column = {name: i for i, name in enumerate(self.columns)}
+        self.history = np.zeros((window, len(self.columns)))
+        self.current = np.zeros(len(self.columns))
+        self.count = 0  # jumlah frame yang sudah direkam
+        self.frame_start = time.perf_counter()
+        self.counter_start = (0, 0)
+        self.font = None
+        self.overlay = None  # surface teks, dibuat ulang setiap beberapa frame
+
+    def next_mode(self):
+        self.mode = self.MODES[(self.MODES.index(self.mode) + 1) % len(self.MODES)]
+        return self.mode
+
+    def begin_frame(self):
+        self.current[:] = 0
+        self.counter_start = (TriangleMesh.draw_calls, TriangleMesh.vertices_drawn)
+        self.frame_start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.current[self.column[name]] += time.perf_counter() - start
+
+    def end_frame(self):
+        self.current[0] = time.perf_counter() - self.frame_start
+        self.current[self.column['draw_calls']] = TriangleMesh.draw_calls - self.counter_start[0]
+        self.current[self.column['vertices']] = TriangleMesh.vertices_drawn - self.counter_start[1]
+        self.history[self.count % len(self.history)] = self.current
+        self.count += 1
+        if self.mode == 'log' and self.count % self.log_interval == 0:
+            print(" | ".join(self.summary_lines()))
+
+    def frames(self):
+        """Riwayat (n, len(columns)) dari frame terlama ke terbaru; waktu dalam detik"""
+        window = len(self.history)
+        if self.count <= window:
+            return self.history[:self.count]
+        return np.roll(self.history, -(self.count % window), axis=0)
+
+    def percentiles(self):
+        """{kolom: {'p50': .., 'p95': .., 'p99': ..}}; waktu dalam ms"""
+        frames = self.frames()
+        if not len(frames):
+            return {}
+        values = np.percentile(frames, self.PERCENTILES, axis=0)
+        scale = np.array([1 if name in self.COUNTERS else 1000 for name in self.columns])
+        values = values * scale
+        return {name: {f"p{q}": float(values[k, i]) for k, q in enumerate(self.PERCENTILES)}
+                for i, name in enumerate(self.columns)}
+
+    def summary_lines(self):
+        stats = self.percentiles()
+        if not stats:
+            return ["belum ada frame"]
+        frame = stats['frame']
+        lines = [f"frame {frame['p50']:.1f} / {frame['p95']:.1f} / {frame['p99']:.1f} ms "
+                 f"(p50/p95/p99, {len(self.frames())} frame)"]
+        for name in self.PHASES:
+            if stats[name]['p99'] > 0:
+                lines.append(f"{name} {stats[name]['p50']:.2f} / {stats[name]['p95']:.2f} / "
+                             f"{stats[name]['p99']:.2f}")
+        lines.append(f"draw calls {stats['draw_calls']['p50']:.0f}, "
+                     f"vertices {stats['vertices']['p50']:.0f}")
+        return lines
+
+    def draw_overlay(self, height, surface=None):
+        """Gambar ringkasan di pojok kiri atas
+
+        Dengan surface (backend software) teks di-blit ke surface itu, tanpa
+        surface digambar ke framebuffer OpenGL dengan glDrawPixels.
+        """
+        if self.overlay is None or self.count % 15 == 0:
+            if self.font is None:
+                self.font = pygame.font.Font(None, 20)
+            lines = self.summary_lines()
+            line_height = self.font.get_linesize()
+            width = max(self.font.size(line)[0] for line in lines) + 8
+            self.overlay = pygame.Surface((width, line_height * len(lines) + 8), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 160))
+            for i, line in enumerate(lines):
+                self.overlay.blit(self.font.render(line, True, (230, 230, 230)),
+                                  (4, 4 + i * line_height))
+            self.overlay_pixels = pygame.image.tostring(self.overlay, 'RGBA', True)
+        if surface is not None:
+            surface.blit(self.overlay, (0, 0))
+            return
+        width, overlay_height = self.overlay.get_size()
+        glPushAttrib(GL_ENABLE_BIT | GL_COLOR_BUFFER_BIT)
+        glDisable(GL_DEPTH_TEST)
+        glDisable(GL_LIGHTING)
+        glEnable(GL_BLEND)
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glWindowPos2i(0, height - overlay_height)
+        glDrawPixels(width, overlay_height, GL_RGBA, GL_UNSIGNED_BYTE, self.overlay_pixels)
+        glPopAttrib()
+
+    def export(self, filename):
+        """Simpan riwayat frame ke filename
+
+        .csv: satu baris per frame (waktu dalam ms). Selain itu JSON berisi
+        percentile, jumlah frame dan baris yang sama.
+        """
+        header = [name if name in self.COUNTERS else f"{name}_ms" for name in self.columns]
+        rows = [[int(value) if name in self.COUNTERS else round(value * 1000, 4)
+                 for name, value in zip(self.columns, frame)] for frame in self.frames().tolist()]
+        if filename.lower().endswith('.csv'):
+            with open(filename, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+        else:
+            with open(filename, 'w') as f:
+                json.dump({'frames_total': self.count, 'percentiles': self.percentiles(),
+                           'columns': header, 'rows': rows}, f, indent=1)
+        print(f"Profil {len(rows)} frame disimpan ke {filename}")
 
 def create_sample_obj_files():
     """Buat file .obj sample jika tidak ada"""
@@ -364,41 +2544,85 @@ f 1 2 4
         print("Created tetrahedron.obj")
     
 class Graphics3D:
-    def __init__(self):
+    # Simulasi (update) berjalan dengan langkah tetap, terpisah dari render
+    UPDATE_RATE = 120   # langkah per detik
+    MAX_UPDATES = 8     # batas langkah per frame supaya frame lambat tidak menumpuk
+    SPIN_SPEED = 90.0   # derajat per detik untuk rotasi otomatis (tombol R)
+    RENDER_MODES = ('fps', 'vsync', 'uncapped')
+
+    def __init__(self, model_dir=None, backend='opengl', profile='off',
+                 render_mode='fps', target_fps=60):
         pygame.init()
         self.width, self.height = 800, 600
-        self.screen = pygame.display.set_mode((self.width, self.height), DOUBLEBUF | OPENGL)
+        # backend 'software': tanpa konteks OpenGL, frame dari SoftwareRenderer
+        # di-blit ke window biasa (bisa juga dengan SDL_VIDEODRIVER=dummy)
+        self.software = backend == 'software'
+        # render_mode 'fps': tempo frame target_fps, 'vsync': ikut refresh
+        # monitor, 'uncapped': secepat mungkin
+        self.render_mode = render_mode
+        self.target_fps = target_fps
+        flags = 0 if self.software else DOUBLEBUF | OPENGL
+        try:
+            self.screen = pygame.display.set_mode((self.width, self.height), flags,
+                                                  vsync=int(render_mode == 'vsync'))
+        except pygame.error as e:
+            print(f"VSync tidak tersedia ({e}), render tanpa vsync")
+            self.screen = pygame.display.set_mode((self.width, self.height), flags)
         pygame.display.set_caption("3D Graphics - Modul B")
         
         # Initialize components
         self.camera = Camera()
-        self.lighting = Lighting()
+        self.lighting = Lighting(apply=not self.software)
+        self.renderer = SoftwareRenderer(self.width, self.height, self.lighting) \
+            if self.software else None
         
         # Objects manual
         self.cube = Cube()
         self.pyramid = Pyramid()
         
         # Objects dari file OBJ
+        self.smooth_shading = False
+        self.use_lod = True
+        self.baked_lighting = False  # lighting per vertex di-bake, GL_LIGHTING mati
+        self.quaternion_rotation = False  # rotasi objek lewat quaternion (tanpa gimbal lock)
+        self.show_all = False  # gambar semua objek (dengan frustum culling)
         self.obj_objects = []
-        self.load_obj_files()
-        
-        # List semua objects
-        self.all_objects = [self.cube, self.pyramid] + self.obj_objects
+        self.all_objects = [self.cube, self.pyramid]
+        self.scene = Scene()
+        self.frame_count = 0
+        self.model_loader = None
+        if model_dir:
+            # Model dari folder ditambahkan satu per satu saat selesai di-load
+            self.model_loader = ParallelOBJLoader(model_dir)
+        else:
+            self.load_obj_files()
         self.current_object_index = 0
         self.current_object = self.all_objects[0]
         
-        # Mouse control
+        # Mouse control; gerakan mouse dijumlahkan dan diterapkan sekali per frame
         self.mouse_dragging = False
         self.last_mouse_x = 0
         self.last_mouse_y = 0
+        self.mouse_dx = 0
+        self.mouse_dy = 0
         
-        # Setup initial view
-        self.camera.setup_perspective(self.width, self.height)
+        # State simulasi: sudut rotasi otomatis pada dua langkah terakhir dan
+        # sudut yang sudah diterapkan ke objek (hasil interpolasi)
+        self.spin = False
+        self.spin_angle = 0.0
+        self.spin_previous = 0.0
+        self.spin_shown = 0.0
+        self.spin_object = None  # objek yang memakai state spin di atas
         
-        # Background color
-        glClearColor(0.1, 0.1, 0.15, 1.0)
+        if not self.software:
+            # Setup initial view
+            self.camera.setup_perspective(self.width, self.height)
+            
+            # Background color
+            glClearColor(0.1, 0.1, 0.15, 1.0)
         
-        self.clock = pygame.time.Clock()
+        self.next_frame = time.perf_counter()
+        self.profiler = FrameProfiler(profile)
     
     def load_obj_files(self):
         """Load semua file .obj yang tersedia"""
@@ -406,16 +2630,33 @@ class Graphics3D:
         create_sample_obj_files()
         
         obj_files = ['cube.obj', 'tetrahedron.obj']
+        mesh_cache = MeshCache()
         
         for filename in obj_files:
             if os.path.exists(filename):
-                obj_data = OBJLoader.load_obj(filename)
+                obj_data = mesh_cache.load_obj(filename)
                 if obj_data:
-                    obj_object = OBJObject(obj_data)
-                    obj_object.translation_x = len(self.obj_objects) * 3  # Spread objects
-                    self.obj_objects.append(obj_object)
+                    self.add_obj_object(OBJObject(obj_data))
                     print(f"Loaded {filename}")
     
+    def add_obj_object(self, obj_object):
+        obj_object.translation_x = len(self.obj_objects) * 3  # Spread objects
+        obj_object.use_quaternion(self.quaternion_rotation)
+        self.obj_objects.append(obj_object)
+        self.all_objects.append(obj_object)
+    
+    def poll_model_loader(self):
+        """Tambahkan model dari ParallelOBJLoader yang sudah selesai"""
+        if self.model_loader is None:
+            return
+        for filename, obj_data, mesh in self.model_loader.poll():
+            obj_object = OBJObject(obj_data, mesh=mesh)
+            if self.smooth_shading:
+                obj_object.set_smooth(True)
+            self.add_obj_object(obj_object)
+        if self.model_loader.finished:
+            self.model_loader = None
+    
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -479,6 +2720,46 @@ class Graphics3D:
                     self.current_object.rotate(0, 5, 0)
                 elif event.key == pygame.K_z:
                     self.current_object.rotate(0, 0, 5)
+                
+                # Shading flat / halus untuk OBJ tanpa vn
+                elif event.key == pygame.K_n:
+                    self.smooth_shading = not self.smooth_shading
+                    for obj_object in self.obj_objects:
+                        obj_object.set_smooth(self.smooth_shading)
+                    print(f"Smooth shading: {'ON' if self.smooth_shading else 'OFF'}")
+                
+                # Semua objek sekaligus dengan frustum culling
+                elif event.key == pygame.K_v:
+                    self.show_all = not self.show_all
+                    if not self.show_all:
+                        pygame.display.set_caption("3D Graphics - Modul B")
+                    print(f"Tampilkan semua objek: {'ON' if self.show_all else 'OFF'}")
+                
+                # Level of detail berdasarkan jarak kamera
+                elif event.key == pygame.K_l:
+                    self.use_lod = not self.use_lod
+                    print(f"LOD: {'ON' if self.use_lod else 'OFF'}")
+                
+                # Lighting di-bake ke warna vertex (hanya backend OpenGL)
+                elif event.key == pygame.K_b and not self.software:
+                    self.baked_lighting = not self.baked_lighting
+                    print(f"Baked lighting: {'ON' if self.baked_lighting else 'OFF'}")
+                
+                # Rotasi drag/keyboard lewat quaternion atau sudut Euler
+                elif event.key == pygame.K_o:
+                    self.quaternion_rotation = not self.quaternion_rotation
+                    for obj in self.all_objects:
+                        obj.use_quaternion(self.quaternion_rotation)
+                    print(f"Rotasi quaternion: {'ON' if self.quaternion_rotation else 'OFF'}")
+                
+                # Rotasi otomatis (simulasi langkah tetap)
+                elif event.key == pygame.K_r:
+                    self.spin = not self.spin
+                    print(f"Rotasi otomatis: {'ON' if self.spin else 'OFF'}")
+                
+                # Profil waktu frame: off -> overlay -> log
+                elif event.key == pygame.K_F3:
+                    print(f"Frame profiler: {self.profiler.next_mode()}")
                     
                 elif event.key == pygame.K_ESCAPE:
                     return False
@@ -495,27 +2776,130 @@ class Graphics3D:
             elif event.type == pygame.MOUSEMOTION:
                 if self.mouse_dragging:
                     mouse_x, mouse_y = event.pos
-                    dx = mouse_x - self.last_mouse_x
-                    dy = mouse_y - self.last_mouse_y
-                    
-                    # Rotate object based on mouse movement
-                    self.current_object.rotate(dy * 0.5, dx * 0.5, 0)
-                    
+                    self.mouse_dx += mouse_x - self.last_mouse_x
+                    self.mouse_dy += mouse_y - self.last_mouse_y
                     self.last_mouse_x = mouse_x
                     self.last_mouse_y = mouse_y
+        
+        # Semua MOUSEMOTION frame ini menjadi satu rotasi, jadi drag cepat
+        # tidak membuat antrian event yang diproses satu per satu
+        if self.mouse_dx or self.mouse_dy:
+            self.current_object.rotate(self.mouse_dy * 0.5, self.mouse_dx * 0.5, 0)
+            self.mouse_dx = self.mouse_dy = 0
                     
         return True
     
+    def follow_selection(self):
+        """Mulai state spin dari nol jika objek lain dipilih, supaya rotasi
+        yang belum diterapkan tidak pindah ke objek yang baru dipilih"""
+        if self.spin_object is not self.current_object:
+            self.spin_object = self.current_object
+            self.spin_angle = self.spin_previous = self.spin_shown = 0.0
+
+    def update(self, dt):
+        """Satu langkah simulasi dengan dt tetap (1 / UPDATE_RATE detik)"""
+        self.follow_selection()
+        self.spin_previous = self.spin_angle
+        if self.spin:
+            self.spin_angle += self.SPIN_SPEED * dt
+    
+    def interpolate(self, alpha):
+        """Terapkan state simulasi ke objek, di antara dua langkah terakhir
+
+        alpha adalah sisa waktu yang belum disimulasikan dibagi dt, jadi
+        gerakan tetap halus walaupun frame rate tidak sama dengan UPDATE_RATE.
+        """
+        self.follow_selection()
+        angle = self.spin_previous + alpha * (self.spin_angle - self.spin_previous)
+        if angle != self.spin_shown:
+            self.current_object.rotate(0, angle - self.spin_shown, 0)
+            self.spin_shown = angle
+    
+    def wait_for_next_frame(self):
+        """Tunggu jadwal frame berikutnya pada render_mode 'fps'
+
+        Jadwal maju tepat 1 / target_fps setiap frame (bukan dihitung dari
+        akhir frame), jadi jarak antar frame stabil. Sleep dipakai sampai
+        sekitar 2 ms sebelum jadwal, sisanya ditunggu dengan sleep pendek
+        (0.5 ms) supaya tepat waktu tanpa memakai satu core penuh. Frame
+        yang terlambat lebih dari satu periode tidak dikejar.
+        Mode 'vsync' menunggu di flip, 'uncapped' tidak menunggu.
+        """
+        if self.render_mode != 'fps':
+            return
+        period = 1.0 / self.target_fps
+        now = time.perf_counter()
+        if now - self.next_frame > period:
+            self.next_frame = now
+        if self.next_frame - now > 0.002:
+            time.sleep(self.next_frame - now - 0.002)
+        while time.perf_counter() < self.next_frame:
+            time.sleep(0.0005)
+        self.next_frame += period
+    
     def render(self):
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        if self.software:
+            self.render_software()
+            return
+        profiler = self.profiler
         
         # Setup camera view
-        self.camera.setup_view()
+        with profiler.phase('setup_view'):
+            self.camera.setup_view()
         
-        # Draw current object
-        self.current_object.draw()
+        # Draw semua objek (frustum culling) atau hanya current object,
+        # dengan LOD sesuai jarak ke kamera
+        with profiler.phase('draw'):
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            lighting = self.lighting if self.baked_lighting else None
+            if lighting is not None:
+                glDisable(GL_LIGHTING)
+            if self.show_all:
+                self.scene.objects = self.all_objects
+                self.scene.draw(self.camera, self.width, self.height, self.use_lod, lighting)
+                self.show_cull_stats()
+            elif lighting is not None:
+                self.current_object.draw_baked(lighting, self.camera.view_matrix(),
+                                               self.camera if self.use_lod else None, self.height)
+            elif self.use_lod:
+                self.current_object.draw(self.camera, self.height)
+            else:
+                self.current_object.draw()
+            if lighting is not None:
+                glEnable(GL_LIGHTING)
         
-        pygame.display.flip()
+        if profiler.mode == 'overlay':
+            with profiler.phase('overlay'):
+                profiler.draw_overlay(self.height)
+        with profiler.phase('flip'):
+            pygame.display.flip()
+    
+    def render_software(self):
+        """Render dengan SoftwareRenderer lalu tampilkan framebuffer-nya"""
+        profiler = self.profiler
+        with profiler.phase('draw'):
+            if self.show_all:
+                self.scene.objects = self.all_objects
+                objects = self.scene.visible_objects(self.camera, self.width / self.height)
+                self.show_cull_stats()
+            else:
+                objects = [self.current_object]
+            color = self.renderer.render(objects, self.camera, self.use_lod)
+        with profiler.phase('flip'):
+            pygame.surfarray.blit_array(self.screen, color.swapaxes(0, 1))
+        if profiler.mode == 'overlay':
+            with profiler.phase('overlay'):
+                profiler.draw_overlay(self.height, self.screen)
+        with profiler.phase('flip'):
+            pygame.display.flip()
+    
+    def show_cull_stats(self):
+        self.frame_count += 1
+        if self.frame_count % 30 == 0:
+            stats = self.scene.cull_stats
+            pygame.display.set_caption(
+                f"3D Graphics - Modul B | tested {stats['tested']} "
+                f"culled {stats['culled']} drawn {stats['drawn']}")
     
     def print_controls(self):
         print("\n=== KONTROL PROGRAM ===")
@@ -528,28 +2912,93 @@ class Graphics3D:
         print("\nCONTROLS:")
         print("Mouse drag: Rotasi objek")
         print("X/Y/Z: Rotasi objek pada sumbu")
+        print("N: Toggle smooth shading (OBJ tanpa normal)")
+        print("L: Toggle LOD (detail mesh sesuai jarak)")
+        print("V: Toggle tampilkan semua objek (frustum culling)")
+        print("B: Toggle baked lighting (warna vertex, tanpa GL_LIGHTING)")
+        print("O: Toggle rotasi quaternion (tanpa gimbal lock)")
+        print("R: Toggle rotasi otomatis")
+        print("F3: Frame profiler (off / overlay / log)")
         print("Arrow keys: Translate objek")
         print("WASD: Gerakkan kamera horizontal")
         print("Q/E: Gerakkan kamera vertikal")
         print("ESC: Keluar")
         print("======================\n")
     
-    def run(self):
+    def run(self, max_frames=None, profile_out=None):
+        """Loop utama; berhenti setelah max_frames frame jika diberikan
+
+        Jika profile_out diberikan, riwayat FrameProfiler disimpan ke file
+        itu (.json atau .csv) saat loop selesai.
+        """
         self.print_controls()
         running = True
+        profiler = self.profiler
+        step = 1.0 / self.UPDATE_RATE
+        accumulator = 0.0
+        previous = time.perf_counter()
+        self.next_frame = previous
         
-        while running:
-            running = self.handle_events()
-            self.render()
-            self.clock.tick(60)  # 60 FPS
+        try:
+            while running:
+                profiler.begin_frame()
+                with profiler.phase('load'):
+                    self.poll_model_loader()
+                with profiler.phase('handle_events'):
+                    running = self.handle_events()
+                with profiler.phase('update'):
+                    now = time.perf_counter()
+                    accumulator = min(accumulator + now - previous, self.MAX_UPDATES * step)
+                    previous = now
+                    while accumulator >= step:
+                        self.update(step)
+                        accumulator -= step
+                    self.interpolate(accumulator / step)
+                self.render()
+                with profiler.phase('tick'):
+                    self.wait_for_next_frame()
+                profiler.end_frame()
+                if max_frames is not None and profiler.count >= max_frames:
+                    running = False
             
-        pygame.quit()
+            if profile_out:
+                profiler.export(profile_out)
+        finally:
+            # Keluar sebelum semua model selesai: jangan tinggalkan blok di /dev/shm
+            if self.model_loader is not None:
+                self.model_loader.close()
+                self.model_loader = None
+            pygame.quit()
 
 # Jalankan program
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="3D Graphics - Modul B")
+    parser.add_argument('model_dir', nargs='?', help="folder berisi file .obj")
+    parser.add_argument('--software', action='store_true',
+                        help="render dengan SoftwareRenderer (tanpa OpenGL)")
+    parser.add_argument('--thumbnails', metavar='OUT_DIR',
+                        help="render PNG setiap .obj di model_dir ke OUT_DIR tanpa window, lalu keluar")
+    parser.add_argument('--size', type=int, default=256, help="ukuran thumbnail dalam pixel")
+    parser.add_argument('--workers', type=int, help="jumlah proses (default semua core)")
+    parser.add_argument('--profile', choices=FrameProfiler.MODES, default='off',
+                        help="tampilkan profil waktu frame di layar (overlay) atau di stdout (log)")
+    parser.add_argument('--profile-out', metavar='FILE',
+                        help="simpan profil frame ke FILE (.json atau .csv) saat keluar")
+    parser.add_argument('--frames', type=int, help="keluar setelah sejumlah frame")
+    parser.add_argument('--render-mode', choices=Graphics3D.RENDER_MODES, default='fps',
+                        help="tempo render: target FPS, ikut vsync, atau tanpa batas")
+    parser.add_argument('--fps', type=int, default=60, help="target FPS untuk --render-mode fps")
+    args = parser.parse_args()
+    if args.thumbnails:
+        if not args.model_dir:
+            parser.error("--thumbnails butuh model_dir")
+        render_thumbnails(args.model_dir, args.thumbnails, args.size, args.workers)
+        sys.exit()
     try:
-        app = Graphics3D()
-        app.run()
+        app = Graphics3D(args.model_dir, backend='software' if args.software else 'opengl',
+                         profile=args.profile, render_mode=args.render_mode,
+                         target_fps=args.fps)
+        app.run(args.frames, args.profile_out)
     except Exception as e:
         print(f"Error: {e}")
         print("Pastikan PyOpenGL dan pygame terinstall:")
@@ -0,0 +1,222 @@
+"""Headless benchmarks for the 2D pipeline in MODUL A.py.
+
+The module is loaded without a GLUT window and its GL functions are replaced
+by a recording stub, so display() runs its whole CPU side (transform, clip,
+batching, vertex submission) without a GPU.
+
+Usage:
+    python benchmark_2d.py pipeline --objects 20000 --frames 200
+    python benchmark_2d.py spatial --objects 100000
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import time
+
+import numpy as np
+
+MODUL_A_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "MODUL A.py")
+
+def load_modul_a():
+    """Import MODUL A.py as a fresh module (its file name contains a space)."""
+    spec = importlib.util.spec_from_file_location("modul_a", MODUL_A_PATH)
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):  # hide the cheatsheet
+        spec.loader.exec_module(module)
+    return module
+
+class RecordingGL:
+    """Stand-in for the gl*/glut* functions that counts calls and vertices."""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.calls = {}
+        self.vertices = 0
+        self.draw_calls = 0
+
+    def record(self, name, args):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if name == 'glDrawArrays':
+            self.vertices += args[2]
+            self.draw_calls += 1
+        elif name == 'glMultiDrawArrays':
+            self.vertices += int(np.sum(args[2]))
+            self.draw_calls += 1
+        elif name in ('glVertex2f', 'glVertex2fv'):
+            self.vertices += 1
+
+    def install(self, module):
+        """Replace every gl*/glut* function of module with a recorder."""
+        for name in dir(module):
+            if name.startswith('gl') and callable(getattr(module, name)):
+                setattr(module, name, self.recorder(name))
+
+    def recorder(self, name):
+        def call(*args):
+            self.record(name, args)
+        return call
+
+def random_scene(module, n_objects, seed=0, extent=20000.0):
+    """Fill the scene with random points, lines, squares and ellipses."""
+    rng = np.random.default_rng(seed)
+    kinds = rng.integers(0, 4, n_objects)
+    starts = rng.uniform(0, extent, (n_objects, 2))
+    offsets = rng.uniform(-80, 80, (n_objects, 2))
+    colors = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
+    for kind, start, offset in zip(kinds, starts, offsets):
+        p1 = tuple(start)
+        p2 = tuple(start + offset)
+        color = colors[int(kind) % 3]
+        if kind == 0:
+            module.add_object(('point', [p1], color, 2, 5))
+        elif kind == 1:
+            module.add_object(('line', [p1, p2], color, 2, 5))
+        elif kind == 2:
+            module.add_object(('square', [p1, p2], color, 2, 5))
+        else:
+            module.add_object(('ellipse', [p1], color, 2, 5))
+
+def timed(func, repeat):
+    """Run func repeat times, return the mean time in seconds and the last result."""
+    result = func()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+def bench_spatial_index(module, repeat):
+    """Compare SpatialGrid window queries against a linear scan over all objects."""
+    rect = [200, 150, 600, 450]
+    module.window_rect = rect
+
+    def linear_scan():
+        # Previous behaviour: every object is transformed and clipped each frame.
+        return module.build_batches(np.full(len(module.scene), module.PARTIAL))
+
+    def indexed():
+        return module.build_batches(module.classify_objects(rect))
+
+    def brute_force_query():
+        boxes = module.spatial_index.boxes[:module.spatial_index.count]
+        return np.nonzero((boxes[:, 0] <= rect[2]) & (boxes[:, 2] >= rect[0]) &
+                          (boxes[:, 1] <= rect[3]) & (boxes[:, 3] >= rect[1]))[0]
+
+    t_query, candidates = timed(lambda: module.spatial_index.query(rect), repeat)
+    t_brute, expected = timed(brute_force_query, repeat)
+    assert np.array_equal(candidates, expected)
+    t_linear, _ = timed(linear_scan, 1)
+    t_indexed, _ = timed(indexed, repeat)
+    codes = module.classify_objects(rect)
+
+    # Through display(): a window move rebuilds the batches, an unchanged
+    # redraw reuses them.
+    windows = [[200 + 5 * i, 150, 600 + 5 * i, 450] for i in range(1, repeat + 1)]
+    def move_window():
+        module.window_rect = windows.pop()
+        module.display()
+    t_move, _ = timed(move_window, repeat - 1)
+    t_redraw, _ = timed(module.display, repeat)
+
+    n = len(module.scene)
+    print(f"Objects              : {n}")
+    print(f"Window candidates    : {len(candidates)} "
+          f"(contained {np.count_nonzero(codes == module.CONTAINED)}, "
+          f"partial {np.count_nonzero(codes == module.PARTIAL)})")
+    print(f"Grid query           : {t_query * 1000:9.3f} ms")
+    print(f"Bounding-box scan    : {t_brute * 1000:9.3f} ms")
+    print(f"Frame, linear scan   : {t_linear * 1000:9.1f} ms")
+    print(f"Frame, spatial index : {t_indexed * 1000:9.1f} ms  ({t_linear / t_indexed:.1f}x)")
+    print(f"Window move          : {t_move * 1000:9.1f} ms")
+    print(f"Unchanged redraw     : {t_redraw * 1000:9.3f} ms")
+
+def reset_view(module):
+    """Put the transform, window and draw caches back to their start state."""
+    module.transform = module.Transform2D()
+    module.window_rect = []
+    module.invalidate_draw_cache()
+
+def set_window(module, frame):
+    module.window_rect = [200, 150, 600, 450]
+
+def move_window(module, frame):
+    dx = 3 * (frame % 50)
+    module.window_rect = [100 + dx, 150, 500 + dx, 450]
+
+def pan(module, frame):
+    module.transform.translate_by(2 if frame % 100 < 50 else -2, 1)
+
+def rotate_zoom(module, frame):
+    module.transform.rotate_by(3)
+    module.transform.set_scale(1.0 + 0.5 * np.sin(frame / 20))
+
+def append_object(module, frame):
+    x = 200 + (frame * 37) % 400
+    module.add_object(('line', [(x - 150, 300), (x + 150, 320)], (1, 0, 0), 2, 5))
+
+# name -> (setup, per-frame step); step None means nothing changes between frames
+SCENARIOS = [
+    ("static redraw", None, None),
+    ("pan", None, pan),
+    ("rotate + zoom", None, rotate_zoom),
+    ("window, static", set_window, None),
+    ("window move", None, move_window),
+    ("window + rotate/zoom", set_window, rotate_zoom),
+    ("window + append", set_window, append_object),
+]
+
+def percentile_ms(times, q):
+    return float(np.percentile(times, q)) * 1000
+
+def bench_pipeline(module, gl, frames):
+    """Run every scenario for a number of frames and print a latency report."""
+    print(f"Objects: {len(module.scene)}, frames per scenario: {frames}")
+    print(f"{'scenario':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+          f"{'verts/frame':>13}{'draws/frame':>13}{'clips/frame':>13}{'clipped/frame':>15}")
+    for name, setup, step in SCENARIOS:
+        reset_view(module)
+        if setup:
+            setup(module, 0)
+        module.display()  # first frame builds the caches
+        times = []
+        gl.reset()
+        calls = module.clip_stats['calls']
+        primitives = module.clip_stats['primitives']
+        for frame in range(frames):
+            if step:
+                step(module, frame)
+            start = time.perf_counter()
+            module.display()
+            times.append(time.perf_counter() - start)
+        print(f"{name:<22}{percentile_ms(times, 50):9.3f}{percentile_ms(times, 95):9.3f}"
+              f"{percentile_ms(times, 99):9.3f}{max(times) * 1000:9.3f}"
+              f"{gl.vertices / frames:13.0f}{gl.draw_calls / frames:13.1f}"
+              f"{(module.clip_stats['calls'] - calls) / frames:13.1f}"
+              f"{(module.clip_stats['primitives'] - primitives) / frames:15.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the MODUL A 2D pipeline")
+    parser.add_argument("mode", nargs="?", choices=("pipeline", "spatial"), default="pipeline",
+                        help="frame latency report, or spatial index vs linear scan")
+    parser.add_argument("--objects", type=int, default=None,
+                        help="number of random objects (default 20000 for pipeline, 100000 for spatial)")
+    parser.add_argument("--frames", type=int, default=200, help="frames per pipeline scenario")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per spatial measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    module = load_modul_a()
+    gl = RecordingGL()
+    gl.install(module)
+    if args.mode == "pipeline":
+        # Scatter the objects over the visible canvas so the window sees many
+        random_scene(module, args.objects or 20000, args.seed, extent=module.window_width)
+        bench_pipeline(module, gl, args.frames)
+    else:
+        random_scene(module, args.objects or 100000, args.seed)
+        bench_spatial_index(module, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Headless benchmarks for the 3D scene code in ModulB.py.
+
+Usage:
+    python benchmark_3d.py cull --objects 10000 --frames 100
+    python benchmark_3d.py raster --frames 10
+    python benchmark_3d.py instance --objects 10000
+    python benchmark_3d.py registry --objects 500
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+import ModulB
+
+def random_scene(n_objects, seed=0, extent=200.0):
+    """Scatter n_objects randomly rotated cubes and pyramids around the origin."""
+    rng = np.random.default_rng(seed)
+    cube, pyramid = ModulB.Cube(), ModulB.Pyramid()
+    objects = []
+    for i in range(n_objects):
+        obj = ModulB.Object3D()
+        obj.mesh = (cube if i % 2 else pyramid).mesh
+        obj.translation_x, obj.translation_y, obj.translation_z = rng.uniform(-extent, extent, 3)
+        obj.rotation_x, obj.rotation_y, obj.rotation_z = rng.uniform(0, 360, 3)
+        objects.append(obj)
+    return objects
+
+def orbit(camera, frame, radius=60.0):
+    """Move the camera around the origin, looking at it."""
+    angle = frame * 0.05
+    camera.eye_x, camera.eye_y, camera.eye_z = radius * np.sin(angle), 10.0, radius * np.cos(angle)
+
+def brute_force_visible(scene, camera, aspect):
+    """Bounding-sphere test of every object against the frustum."""
+    planes = camera.frustum_planes(aspect)
+    distance = scene.centers @ planes[:, :3].T + planes[:, 3]
+    return np.flatnonzero(np.all(distance >= -scene.radii[:, None], axis=1))
+
+def vertices_in_frustum(scene, camera, aspect):
+    """Objects with at least one mesh vertex inside the frustum (ground truth)."""
+    planes = camera.frustum_planes(aspect)
+    result = []
+    for i, obj in enumerate(scene.bvh_objects):
+        points = obj.mesh.data[:, 3:] @ obj.rotation_matrix().T + [
+            obj.translation_x, obj.translation_y, obj.translation_z]
+        if np.any(np.all(points @ planes[:, :3].T + planes[:, 3] >= 0, axis=1)):
+            result.append(i)
+    return np.array(result, dtype=np.int64)
+
+def uv_sphere_data(rings):
+    """obj_data of a UV sphere with about 4 * rings^2 triangles."""
+    theta = np.linspace(0, np.pi, rings + 1)
+    phi = np.linspace(0, 2 * np.pi, 2 * rings, endpoint=False)
+    theta, phi = np.meshgrid(theta, phi, indexing="ij")
+    vertices = np.stack([np.sin(theta) * np.cos(phi), np.cos(theta),
+                         np.sin(theta) * np.sin(phi)], -1).reshape(-1, 3).astype(np.float32)
+    ring, column = np.mgrid[0:rings, 0:2 * rings]
+    a = ring * 2 * rings + column
+    b = ring * 2 * rings + (column + 1) % (2 * rings)
+    quads = np.stack([a, a + 2 * rings, b + 2 * rings, b], -1).reshape(-1)
+    faces = ModulB.FaceList(quads, np.full(len(quads) // 4, 4))
+    no_normals = ModulB.FaceList(np.zeros(0, dtype=np.int32), np.zeros(len(faces), dtype=np.int32))
+    return {"vertices": vertices, "faces": faces, "normals": np.zeros((0, 3), dtype=np.float32),
+            "face_normals": no_normals}
+
+def uv_sphere(rings):
+    """Smooth UV sphere with about 4 * rings^2 triangles as an OBJObject."""
+    obj_data = uv_sphere_data(rings)
+    obj = ModulB.Object3D()
+    obj.mesh = ModulB.TriangleMesh.from_faces(obj_data["vertices"], obj_data["faces"], smooth=True)
+    return obj
+
+def bench_raster(frames, width=800, height=600):
+    renderer = ModulB.SoftwareRenderer(width, height)
+    camera = ModulB.Camera()
+    cube = ModulB.Cube()
+    cube.rotate(25, 35, 10)
+    cases = [("cube", cube)] + [(f"sphere {rings}", uv_sphere(rings)) for rings in (25, 50, 100, 200)]
+    print(f"{width}x{height}")
+    print(f"{'mesh':<12}{'triangles':>10}{'drawn':>8}{'pixels':>8}{'ms':>9}{'fps':>7}"
+          f"{'static ms':>11}")
+    for name, obj in cases:
+        obj.rotate(20, 30, 0)
+        renderer.render([obj], camera)
+        times = []
+        for _ in range(frames):
+            obj.rotate(0, 2, 0)
+            start = time.perf_counter()
+            renderer.render([obj], camera)
+            times.append(time.perf_counter() - start)
+        ms = np.median(times) * 1000
+        # Objek diam: warna vertex dari frame sebelumnya dipakai lagi
+        static = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            renderer.render([obj], camera)
+            static.append(time.perf_counter() - start)
+        assert renderer.stats['bakes'] == 0
+        print(f"{name:<12}{obj.mesh.triangle_count:10d}{renderer.stats['triangles']:8d}"
+              f"{renderer.stats['pixels']:8d}{ms:9.1f}{1000 / ms:7.1f}{np.median(static) * 1000:11.1f}")
+
+def bench_instance(n_objects, frames, seed):
+    """Every object moves every frame: per-object matrices against the packed
+    Scene.matrices array feeding one InstancedMesh per mesh."""
+    objects = random_scene(n_objects, seed)
+    for obj in objects[::2]:
+        obj.use_quaternion()
+    scene = ModulB.Scene(objects)
+    scene.update()
+    meshes = {id(obj.mesh): obj.mesh for obj in objects}
+    batches = {key: ModulB.InstancedMesh(mesh) for key, mesh in meshes.items()}
+    members = {key: np.array([i for i, obj in enumerate(scene.bvh_objects) if id(obj.mesh) == key])
+               for key in meshes}
+    t_object, t_packed, t_vertices = [], [], []
+    for frame in range(frames):
+        for obj in objects:
+            obj.rotate(0.5, 0.3, 0.0)
+        start = time.perf_counter()
+        for obj in objects:
+            obj.model_matrix()
+        t_object.append(time.perf_counter() - start)
+        for obj in objects:
+            obj.rotate(0.5, 0.3, 0.0)
+        start = time.perf_counter()
+        scene.update()
+        t_packed.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for key, batch in batches.items():
+            batch.update(scene.matrices[members[key]])
+        t_vertices.append(time.perf_counter() - start)
+    assert np.allclose(scene.matrices[0], scene.bvh_objects[0].model_matrix())
+    vertices = sum(len(batch.data) for batch in batches.values())
+    print(f"Objects            : {n_objects} (half with quaternion orientation), all moving")
+    print(f"Model matrices     : {np.median(t_object) * 1000:8.2f} ms total for one model_matrix() "
+          f"per object, {np.median(t_packed) * 1000:8.2f} ms packed "
+          f"(Scene.update, incl. bounds and BVH refit)")
+    print(f"Instance vertices  : {np.median(t_vertices) * 1000:8.2f} ms for {vertices} vertices "
+          f"in {len(batches)} draw calls")
+
+def bench_registry(n_objects, rings=50):
+    """Place one model n_objects times: a mesh per object against MESH_REGISTRY."""
+    obj_data = uv_sphere_data(rings)
+    start = time.perf_counter()
+    private = []
+    for _ in range(n_objects):
+        mesh = ModulB.TriangleMesh.from_faces(obj_data["vertices"], obj_data["faces"], smooth=True)
+        private.append(mesh.build_lods())
+    t_private = time.perf_counter() - start
+    private_bytes = sum(mesh.data.nbytes + mesh.indices.nbytes for lods in private for _, mesh in lods)
+    del private
+
+    registry = ModulB.MESH_REGISTRY
+    before = registry.nbytes
+    start = time.perf_counter()
+    first = ModulB.OBJObject(obj_data, smooth=True)
+    t_first = time.perf_counter() - start
+    start = time.perf_counter()
+    shared = [ModulB.OBJObject(obj_data, smooth=True) for _ in range(n_objects - 1)]
+    t_shared = time.perf_counter() - start
+    start = time.perf_counter()
+    copies = [first.instance() for _ in range(n_objects - 1)]
+    t_instance = time.perf_counter() - start
+    # A separately generated copy of the model shares the source arrays too
+    separate = ModulB.OBJObject(uv_sphere_data(rings), smooth=True)
+    assert all(obj.mesh is first.mesh and obj.lods is first.lods for obj in shared + copies)
+    assert all(obj.source is first.source for obj in shared + copies + [separate])
+    per_object = lambda seconds: seconds / max(n_objects - 1, 1) * 1000
+
+    print(f"Model              : {first.mesh.triangle_count} triangles, "
+          f"{len(first.lods)} LOD levels, placed {n_objects} times")
+    print(f"Mesh per object    : {t_private / n_objects * 1000:8.3f} ms per object, "
+          f"{private_bytes / 1e6:8.1f} MB")
+    print(f"MESH_REGISTRY      : {t_first * 1000:8.3f} ms first, "
+          f"{per_object(t_shared):.3f} ms per OBJObject (hash), "
+          f"{per_object(t_instance):.3f} ms per instance(), "
+          f"{(registry.nbytes - before) / 1e6:8.1f} MB")
+
+def bench_cull(n_objects, frames, seed):
+    scene = ModulB.Scene(random_scene(n_objects, seed))
+    camera = ModulB.Camera()
+    camera.far = 150.0
+    aspect = 800 / 600
+
+    start = time.perf_counter()
+    scene.update()
+    build = time.perf_counter() - start
+
+    totals = {key: 0 for key in scene.cull_stats}
+    t_bvh, t_update, t_brute = [], [], []
+    for frame in range(frames):
+        orbit(camera, frame)
+        start = time.perf_counter()
+        visible = scene.visible_objects(camera, aspect)
+        t_bvh.append(time.perf_counter() - start)
+        for key, value in scene.cull_stats.items():
+            totals[key] += value
+        start = time.perf_counter()
+        scene.update()  # nothing moved: only the transform version check
+        t_update.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        expected = brute_force_visible(scene, camera, aspect)
+        t_brute.append(time.perf_counter() - start)
+        if frame == 0:
+            index = {id(obj): i for i, obj in enumerate(scene.bvh_objects)}
+            found = {index[id(obj)] for obj in visible}
+            assert found <= set(expected.tolist()), "BVH kept an object the sphere test culls"
+            missing = set(vertices_in_frustum(scene, camera, aspect).tolist()) - found
+            assert not missing, f"visible objects culled: {sorted(missing)[:10]}"
+
+    # A moving object forces a refit before the next query
+    scene.objects[0].translate(1.0, 0.0, 0.0)
+    start = time.perf_counter()
+    scene.update()
+    refit = time.perf_counter() - start
+
+    print(f"Objects            : {n_objects}")
+    print(f"BVH nodes          : {len(scene.bvh.left)} (build {build * 1000:.1f} ms, "
+          f"refit {refit * 1000:.1f} ms)")
+    print(f"Per frame          : nodes {totals['nodes'] / frames:.0f}, "
+          f"tested {totals['tested'] / frames:.0f}, culled {totals['culled'] / frames:.0f}, "
+          f"drawn {totals['drawn'] / frames:.0f}")
+    print(f"Cull, BVH          : {np.median(t_bvh) * 1000:8.3f} ms (median, incl. bounds update)")
+    print(f"  of which update  : {np.median(t_update) * 1000:8.3f} ms")
+    print(f"Cull, sphere scan  : {np.median(t_brute) * 1000:8.3f} ms (median, bounds precomputed)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ModulB 3D scene code")
+    parser.add_argument("mode", nargs="?", choices=("cull", "raster", "instance", "registry"),
+                        default="cull",
+                        help="frustum culling with the object BVH, the software rasterizer, "
+                             "packed model matrices for instanced drawing, "
+                             "or shared meshes from MESH_REGISTRY")
+    parser.add_argument("--objects", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=None,
+                        help="frames per case (default 100 for cull, 10 otherwise)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.mode == "cull":
+        bench_cull(args.objects, args.frames or 100, args.seed)
+    elif args.mode == "raster":
+        bench_raster(args.frames or 10)
+    elif args.mode == "instance":
+        bench_instance(args.objects, args.frames or 10, args.seed)
+    elif args.mode == "registry":
+        bench_registry(args.objects)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Throughput benchmark for the OBJ loaders in ModulB.py.
+
+Writes a synthetic grid mesh in each face format (v, v/vt, v//vn, v/vt/vn),
+loads it with the NumPy bulk parser (OBJLoader.load_obj) and the line parser
+(OBJLoader.load_obj_lines), checks that both agree and reports MB/s. The
+"cache ms" column is a warm load of the same mesh from its MeshCache sidecar.
+With --stream it instead compares the peak traced memory of load_obj with
+OBJStreamReader in RAM and on a disk memmap, and checks that the streamed
+mesh matches. With --parallel it loads the
+meshes with ParallelOBJLoader and checks them against load_obj after the
+loader (and its process pool) is gone, then closes a second loader early
+and checks that no shared-memory block is left behind.
+
+Usage:
+    python benchmark_obj.py --faces 1000000
+    python benchmark_obj.py --file scan.obj
+    python benchmark_obj.py --stream --faces 1000000
+    python benchmark_obj.py --parallel --faces 100000
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from ModulB import MeshCache, OBJLoader, OBJObject, OBJStreamReader, ParallelOBJLoader
+
+FACE_FORMATS = {
+    "v": "{v}",
+    "v/vt": "{v}/{v}",
+    "v//vn": "{v}//{v}",
+    "v/vt/vn": "{v}/{v}/{v}",
+}
+
+def write_grid_obj(path, n_faces, face_format):
+    """Write a quad grid with about n_faces quads, using one face format."""
+    side = max(1, int(np.sqrt(n_faces)))
+    ys, xs = np.mgrid[0:side + 1, 0:side + 1]
+    rng = np.random.default_rng(0)
+    z = rng.uniform(-0.1, 0.1, xs.size)
+    corner = FACE_FORMATS[face_format]
+    with open(path, "w") as file:
+        file.write("# synthetic grid\n")
+        file.writelines(f"v {x:.6f} {y:.6f} {h:.6f}\n"
+                        for x, y, h in zip(xs.ravel() / side, ys.ravel() / side, z))
+        if "vt" in face_format:
+            file.writelines(f"vt {x:.6f} {y:.6f}\n"
+                            for x, y in zip(xs.ravel() / side, ys.ravel() / side))
+        if "vn" in face_format:
+            file.writelines("vn 0.000000 0.000000 1.000000\n" for _ in range(xs.size))
+        for row in range(side):
+            for col in range(side):
+                a = row * (side + 1) + col + 1
+                quad = (a, a + 1, a + side + 2, a + side + 1)
+                file.write("f " + " ".join(corner.format(v=v) for v in quad) + "\n")
+
+def timed_load(loader, path):
+    """Load path quietly, return (seconds, result)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = loader(path)
+        return time.perf_counter() - start, result
+
+def same_result(fast, slow):
+    """True if the bulk and line parsers produced the same mesh."""
+    return (np.allclose(fast["vertices"], np.asarray(slow["vertices"], dtype=np.float32).reshape(-1, 3))
+            and np.allclose(fast["normals"], np.asarray(slow["normals"], dtype=np.float32).reshape(-1, 3))
+            and len(fast["faces"]) == len(slow["faces"])
+            and np.array_equal(fast["faces"].indices, np.concatenate(slow["faces"]))
+            and all(list(a) == b for a, b in zip(fast["face_normals"], slow["face_normals"])))
+
+def report(name, path, skip_slow):
+    megabytes = os.path.getsize(path) / 1e6
+    t_fast, fast = timed_load(OBJLoader.load_obj, path)
+    cache = MeshCache()
+    cache.save(path, fast)
+    t_cache, _ = timed_load(cache.load, path)
+    os.remove(path + MeshCache.SUFFIX)
+    line = (f"{name:<10}{megabytes:9.1f}{len(fast['faces']):11d}{t_fast:10.3f}"
+            f"{megabytes / t_fast:10.1f}{t_cache * 1000:10.2f}")
+    if skip_slow:
+        print(line)
+        return
+    t_slow, slow = timed_load(OBJLoader.load_obj_lines, path)
+    status = "ok" if same_result(fast, slow) else "MISMATCH"
+    print(f"{line}{t_slow:10.3f}{megabytes / t_slow:10.1f}{t_slow / t_fast:9.1f}x  {status}")
+
+def mesh_bytes(obj_data):
+    return sum(a.nbytes for a in (obj_data["vertices"], obj_data["normals"],
+                                  obj_data["faces"].indices, obj_data["faces"].counts,
+                                  obj_data["face_normals"].indices, obj_data["face_normals"].counts))
+
+def peak_memory(loader):
+    """Run loader quietly, return (seconds, peak traced MB, result)."""
+    tracemalloc.start()
+    try:
+        seconds, result = timed_load(loader, None)
+        return seconds, tracemalloc.get_traced_memory()[1] / 1e6, result
+    finally:
+        tracemalloc.stop()
+
+def stream_report(name, path, chunk_size):
+    """Peak memory of the bulk parser against the streaming reader."""
+    megabytes = os.path.getsize(path) / 1e6
+    t_bulk, peak_bulk, bulk = peak_memory(lambda _: OBJLoader.load_obj(path))
+    t_stream, peak_stream, streamed = peak_memory(
+        lambda _: OBJStreamReader(path, chunk_size).read())
+    same = all(np.array_equal(bulk[key].indices, streamed[key].indices)
+               and np.array_equal(bulk[key].counts, streamed[key].counts)
+               for key in ("faces", "face_normals"))
+    same = same and np.array_equal(bulk["vertices"], streamed["vertices"])
+    with tempfile.TemporaryDirectory() as directory:
+        t_memmap, peak_memmap, mapped = peak_memory(
+            lambda _: OBJStreamReader(path, chunk_size, memmap_dir=directory).read())
+        del mapped
+    print(f"{name:<10}{megabytes:9.1f}{mesh_bytes(bulk) / 1e6:9.1f}"
+          f"{t_bulk:9.3f}{peak_bulk:10.1f}{t_stream:9.3f}{peak_stream:10.1f}"
+          f"{t_memmap:9.3f}{peak_memmap:10.1f}  {'ok' if same else 'MISMATCH'}")
+
+def parallel_check(directory, workers):
+    """Load every .obj in directory with ParallelOBJLoader, drop the loader,
+    then read the shared-memory arrays and compare them with load_obj."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = ParallelOBJLoader(directory, workers)
+        results = []
+        while not loader.finished:
+            results += loader.poll(block=True)
+    seconds = time.perf_counter() - start
+    objects = {filename: OBJObject(obj_data, mesh=mesh) for filename, obj_data, mesh in results}
+    del loader, results
+    gc.collect()
+    for filename, obj in sorted(objects.items()):
+        _, expected = timed_load(OBJLoader.load_obj, filename)
+        ok = (np.array_equal(obj.vertices, expected["vertices"])
+              and np.array_equal(obj.faces.indices, expected["faces"].indices)
+              and np.isfinite(obj.mesh.data).all())
+        with contextlib.redirect_stdout(io.StringIO()):
+            obj.set_smooth(True)  # hashes the source arrays again
+        print(f"{os.path.basename(filename):<16}{len(obj.vertices):10d}{obj.mesh.triangle_count:11d}"
+              f"  {'ok' if ok else 'MISMATCH'}")
+    print(f"{len(objects)} files in {seconds:.2f} s, arrays readable after the loader was released")
+
+def shared_blocks():
+    """Names of the POSIX shared-memory blocks, or None where /dev/shm is absent."""
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else None
+
+def early_close_check(directory, workers):
+    """Poll one model, close the loader and count the blocks left in /dev/shm."""
+    before = shared_blocks()
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = ParallelOBJLoader(directory, workers)
+        loader.poll(block=True)
+        pending = len(loader.pending)
+        loader.close()
+    if before is None:
+        print(f"closed early with {pending} files pending (no /dev/shm to check)")
+        return
+    leaked = len(shared_blocks() - before)
+    print(f"closed early with {pending} files pending, {leaked} blocks left"
+          f"  {'ok' if not leaked else 'LEAK'}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ModulB OBJ loaders")
+    parser.add_argument("--faces", type=int, default=250000, help="quads in the synthetic meshes")
+    parser.add_argument("--file", help="benchmark an existing .obj file instead")
+    parser.add_argument("--skip-slow", action="store_true", help="only time the bulk parser")
+    parser.add_argument("--stream", action="store_true",
+                        help="compare peak memory of load_obj and OBJStreamReader")
+    parser.add_argument("--chunk-mb", type=float, default=4, help="streaming chunk size in MB")
+    parser.add_argument("--parallel", action="store_true",
+                        help="load with ParallelOBJLoader and verify the arrays after it is released")
+    parser.add_argument("--workers", type=int, help="process pool size for --parallel")
+    args = parser.parse_args()
+
+    if args.parallel:
+        print(f"{'file':<16}{'vertices':>10}{'triangles':>11}")
+        with tempfile.TemporaryDirectory() as directory:
+            for face_format in FACE_FORMATS:
+                name = face_format.replace("/", "_") + ".obj"
+                write_grid_obj(os.path.join(directory, name), args.faces, face_format)
+            parallel_check(directory, args.workers)
+            early_close_check(directory, args.workers)
+        return
+
+    if args.stream:
+        chunk_size = int(args.chunk_mb * (1 << 20))
+        print(f"{'format':<10}{'MB':>9}{'mesh MB':>9}{'bulk s':>9}{'peak MB':>10}"
+              f"{'stream s':>9}{'peak MB':>10}{'memmap s':>9}{'peak MB':>10}")
+        if args.file:
+            stream_report(os.path.basename(args.file), args.file, chunk_size)
+            return
+        with tempfile.TemporaryDirectory() as directory:
+            for face_format in FACE_FORMATS:
+                path = os.path.join(directory, "grid.obj")
+                write_grid_obj(path, args.faces, face_format)
+                stream_report(face_format, path, chunk_size)
+        return
+
+    print(f"{'format':<10}{'MB':>9}{'faces':>11}{'bulk s':>10}{'bulk MB/s':>10}{'cache ms':>10}"
+          f"{'lines s':>10}{'line MB/s':>10}{'speedup':>9}")
+    if args.file:
+        report(os.path.basename(args.file), args.file, args.skip_slow)
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        for face_format in FACE_FORMATS:
+            path = os.path.join(directory, "grid.obj")
+            write_grid_obj(path, args.faces, face_format)
+            report(face_format, path, args.skip_slow)
+
+if __name__ == "__main__":
+    main()